@@ -0,0 +1,84 @@
+"""
+Benchmark: RandomForest training throughput under concurrent sessions
+
+Each simulated Streamlit session is a thread that fits train_model('rf')
+a few times on its own lag matrix. Three setups are compared:
+
+- 'single': every fit uses one core (the old hardcoded n_jobs=1)
+- 'budget': fits borrow SESSION_CORES from the shared compute budget
+- 'unbounded': every fit uses n_jobs=-1, ignoring the other sessions
+
+Throughput is fits per second across all sessions, and latency is the
+slowest single fit. 'unbounded' shows the oversubscription the budget
+prevents once sessions x cores exceeds the machine.
+
+Run with:
+    python -m benchmarks.bench_concurrent_sessions
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from utils import compute
+from utils.forecast_v2 import create_lag_features, train_model
+
+
+def _unbounded_fit(X, y):
+    RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42, n_jobs=-1,
+                          min_samples_split=5, min_samples_leaf=2).fit(X, y)
+
+
+def _session(seed, fits, fit_fn, n=1_500, nlags=10):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    X, y = create_lag_features(prices, nlags=nlags)
+    latencies = []
+    for _ in range(fits):
+        start = time.perf_counter()
+        fit_fn(X, y)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run(sessions_grid=(1, 2, 4, 8), fits=3, session_cores=None):
+    cores = os.cpu_count() or 1
+    session_cores = session_cores or max(1, cores // 2)
+    setups = {
+        'single': (1, lambda X, y: train_model(X, y, 'rf')),
+        'budget': (session_cores, lambda X, y: train_model(X, y, 'rf')),
+        'unbounded': (cores, _unbounded_fit),
+    }
+    defaults = compute.SESSION_CORES, compute.TRAINING_CORES
+    rows = []
+    for sessions in sessions_grid:
+        for setup, (per_session, fit_fn) in setups.items():
+            compute.configure(session_cores=per_session, training_cores=cores)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions) as pool:
+                futures = [pool.submit(_session, s, fits, fit_fn) for s in range(sessions)]
+                latencies = [t for f in futures for t in f.result()]
+            wall = time.perf_counter() - start
+            rows.append({
+                'sessions': sessions, 'setup': setup, 'session_cores': per_session,
+                'fits_per_s': len(latencies) / wall, 'max_fit_s': max(latencies),
+            })
+    compute.configure(*defaults)
+    return rows
+
+
+def main():
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'sessions':>9} {'setup':>10} {'cores/sess':>11} {'fits/s':>8} {'max fit (s)':>12}")
+    for r in run():
+        print(
+            f"{r['sessions']:>9} {r['setup']:>10} {r['session_cores']:>11} "
+            f"{r['fits_per_s']:>8.2f} {r['max_fit_s']:>12.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: tree-quantile forecast bands vs the plain point forecast
+
+'point' is forecast_prices / forecast_direct (model.predict per step);
+'bands' is forecast_with_bands, which returns the same point forecast plus
+10/50/90 quantile bands from every tree's own path. The forests are fitted
+once per cell; neither path refits anything.
+
+Run with:
+    python -m benchmarks.bench_forecast_bands
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.datasets import synthetic
+from utils.forecast_v2 import (create_lag_features, direct_lag_features, forecast_direct,
+                               forecast_prices, forecast_with_bands, walk_forward)
+
+
+def _best(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def run(length=1_500, nlags=10, days_grid=(7, 30, 90), repeats=3):
+    prices = synthetic('gbm', length).to_numpy()
+    last = prices[-nlags:]
+    rows = []
+    for mode in ('recursive', 'direct'):
+        for days in days_grid:
+            direct = mode == 'direct'
+            X, y = (direct_lag_features(prices, nlags=nlags, num_days=days) if direct
+                    else create_lag_features(prices, nlags=nlags))
+            model, _ = walk_forward(X, y, nlags=nlags)
+            point_fn = forecast_direct if direct else forecast_prices
+            point_s, point = _best(lambda: point_fn(model, last, days, nlags=nlags), repeats)
+            bands_s, (forecast, _) = _best(
+                lambda: forecast_with_bands(model, last, days, nlags=nlags, direct=direct), repeats
+            )
+            assert np.allclose(forecast, point), "band pass changed the point forecast"
+            rows.append({'mode': mode, 'days': days, 'point_ms': point_s * 1e3,
+                         'bands_ms': bands_s * 1e3})
+    return rows
+
+
+def main():
+    print(f"{'mode':>10} {'days':>5} {'point (ms)':>11} {'bands (ms)':>11} {'ratio':>7}")
+    for r in run():
+        print(f"{r['mode']:>10} {r['days']:>5} {r['point_ms']:>11.2f} {r['bands_ms']:>11.2f} "
+              f"{r['bands_ms'] / r['point_ms']:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: recursive vs direct multi-horizon forecasting latency
+
+The recursive path calls predict() once per forecast day; the direct path
+uses one multi-output model and a single predict() for all days. Fit time
+of the direct model is reported separately since it is paid once per
+cached model, not per request.
+
+Run with:
+    python -m benchmarks.bench_forecast_horizons
+"""
+
+import time
+
+import numpy as np
+
+from utils.forecast_v2 import (
+    create_lag_features, direct_lag_features, forecast_direct, forecast_prices, train_model
+)
+
+
+def _best_of(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(horizons=(1, 7, 30, 60, 90), length=1_000, nlags=10):
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    last_values = prices[-nlags:]
+    
+    X, y = create_lag_features(prices, nlags=nlags)
+    recursive_model = train_model(X, y)
+    
+    rows = []
+    for days in horizons:
+        X_d, Y_d = direct_lag_features(prices, nlags=nlags, num_days=days)
+        start = time.perf_counter()
+        direct_model = train_model(X_d, Y_d)
+        fit_s = time.perf_counter() - start
+        
+        rows.append({
+            'days': days,
+            'recursive_s': _best_of(lambda: forecast_prices(recursive_model, last_values, days, nlags=nlags)),
+            'direct_s': _best_of(lambda: forecast_direct(direct_model, last_values, days, nlags=nlags)),
+            'direct_fit_s': fit_s,
+        })
+    return rows
+
+
+def main():
+    print(f"{'days':>5} {'recursive (ms)':>15} {'direct (ms)':>12} {'speedup':>8} {'direct fit (s)':>15}")
+    for r in run():
+        print(
+            f"{r['days']:>5} {r['recursive_s']*1e3:>15.2f} {r['direct_s']*1e3:>12.2f} "
+            f"{r['recursive_s'] / r['direct_s']:>7.1f}x {r['direct_fit_s']:>15.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
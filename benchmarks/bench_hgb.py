@@ -0,0 +1,61 @@
+"""
+Benchmark: HistGradientBoosting vs RandomForest across lags and horizons
+
+For each (nlags, mode) cell the backtest model and the 'warm' refit are
+built with walk_forward on the same lag matrix. The table reports fit
+time, predict time over the test rows and backtest accuracy. 'recursive'
+uses the create_lag_features target; 'direct' fits one output per
+forecast day.
+
+Run with:
+    python -m benchmarks.bench_hgb
+"""
+
+import time
+
+from benchmarks.datasets import synthetic
+from utils.forecast_v2 import create_lag_features, direct_lag_features, walk_forward
+
+MODELS = ('rf', 'hgb')
+
+
+def run(kind='gbm', length=1_500, nlags_grid=(5, 10, 20), days_grid=(1, 7, 30)):
+    prices = synthetic(kind, length).to_numpy()
+    rows = []
+    for nlags in nlags_grid:
+        for days in days_grid:
+            mode = 'recursive' if days == 1 else 'direct'
+            if mode == 'recursive':
+                X, y = create_lag_features(prices, nlags=nlags)
+            else:
+                X, y = direct_lag_features(prices, nlags=nlags, num_days=days)
+            for model_type in MODELS:
+                start = time.perf_counter()
+                model, metrics = walk_forward(X, y, nlags=nlags, model_type=model_type)
+                fit_s = time.perf_counter() - start
+
+                test_rows = X[metrics['train_size']:]
+                start = time.perf_counter()
+                model.predict(test_rows)
+                predict_s = time.perf_counter() - start
+
+                rows.append({
+                    'nlags': nlags, 'mode': mode, 'days': days, 'model': model_type,
+                    'fit_s': fit_s, 'predict_ms': predict_s * 1e3,
+                    'rmse': metrics['rmse'], 'direction_accuracy': metrics['direction_accuracy'],
+                })
+    return rows
+
+
+def main():
+    print(f"{'nlags':>6} {'mode':>10} {'days':>5} {'model':>6} {'fit (s)':>8} "
+          f"{'predict (ms)':>13} {'rmse':>8} {'dir acc':>8}")
+    for r in run():
+        print(
+            f"{r['nlags']:>6} {r['mode']:>10} {r['days']:>5} {r['model']:>6} {r['fit_s']:>8.2f} "
+            f"{r['predict_ms']:>13.2f} {r['rmse']:>8.3f} {r['direction_accuracy']:>8.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
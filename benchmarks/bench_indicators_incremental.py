@@ -0,0 +1,53 @@
+"""
+Benchmark: full indicator recompute vs incremental engine updates
+
+Simulates a live-appending series: after an initial history, new bars
+arrive one at a time. The full path reruns add_technical_indicators on
+the whole frame per bar; the incremental path calls IndicatorEngine.update.
+
+Run with:
+    python -m benchmarks.bench_indicators_incremental
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.indicator_engine import IndicatorEngine
+from utils.indicators import add_technical_indicators
+
+
+def run(history_lengths=(1_000, 10_000, 100_000), new_bars=50):
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in history_lengths:
+        values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n + new_bars)))
+        close = pd.Series(values, index=pd.date_range('2000-01-01', periods=n + new_bars, freq='h'))
+        
+        start = time.perf_counter()
+        for k in range(new_bars):
+            add_technical_indicators(close.iloc[:n + k + 1].to_frame('Close'))
+        full_s = (time.perf_counter() - start) / new_bars
+        
+        engine, _ = IndicatorEngine.from_history(close.iloc[:n])
+        start = time.perf_counter()
+        for value in values[n:]:
+            engine.update(value)
+        incremental_s = (time.perf_counter() - start) / new_bars
+        
+        rows.append({'history': n, 'full_s': full_s, 'incremental_s': incremental_s})
+    return rows
+
+
+def main():
+    print(f"{'history':>9} {'full / bar (ms)':>16} {'update / bar (us)':>18} {'speedup':>9}")
+    for r in run():
+        print(
+            f"{r['history']:>9} {r['full_s']*1e3:>16.2f} {r['incremental_s']*1e6:>18.1f} "
+            f"{r['full_s'] / r['incremental_s']:>8.0f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
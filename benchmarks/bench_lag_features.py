@@ -0,0 +1,67 @@
+"""
+Benchmark: loop-built lag features vs the strided lag-matrix view
+
+Run with:
+    python -m benchmarks.bench_lag_features
+"""
+
+import time
+
+import numpy as np
+
+from utils.forecast_v2 import create_lag_features
+
+
+def _loop_create_lag_features(data, nlags=10):
+    """Previous list-append implementation, kept for comparison"""
+    X, y = [], []
+    prices = np.array(data).flatten()
+    for i in range(len(prices) - nlags - 1):
+        X.append(prices[i:i+nlags])
+        y.append(prices[i+nlags+1])
+    return np.array(X), np.array(y)
+
+
+def _best_of(fn, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(lengths=(1_000, 10_000, 100_000, 1_000_000), nlags=30):
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in lengths:
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        
+        X_old, y_old = _loop_create_lag_features(prices, nlags)
+        X_new, y_new = create_lag_features(prices, nlags)
+        assert np.array_equal(X_old, X_new) and np.array_equal(y_old, y_new)
+        
+        t_loop = _best_of(lambda: _loop_create_lag_features(prices, nlags), repeats=1 if n >= 1_000_000 else 3)
+        t_view = _best_of(lambda: create_lag_features(prices, nlags))
+        rows.append({
+            'length': n,
+            'nlags': nlags,
+            'loop_s': t_loop,
+            'view_s': t_view,
+            'speedup': t_loop / t_view if t_view > 0 else float('inf'),
+            'shares_memory': bool(np.shares_memory(X_new, prices)),
+        })
+    return rows
+
+
+def main():
+    print(f"{'length':>10} {'loop (ms)':>12} {'view (ms)':>12} {'speedup':>10} {'zero-copy':>10}")
+    for row in run():
+        print(
+            f"{row['length']:>10} {row['loop_s']*1e3:>12.2f} {row['view_s']*1e3:>12.4f} "
+            f"{row['speedup']:>10.0f}x {str(row['shares_memory']):>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
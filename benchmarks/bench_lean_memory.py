@@ -0,0 +1,86 @@
+"""
+Benchmark: per-session memory of the indicator/signal frames, full vs lean
+
+Runs the app's indicators -> signals step on a yfinance-shaped frame
+(Open/High/Low/Close/Adj Close/Volume with (Price, Ticker) MultiIndex
+columns) of 5 years of hourly bars:
+
+- 'previous': df.copy() at the call site, plus the copies inside
+  add_technical_indicators and generate_signals, string signals
+- 'standard': the app's default path now (one copy, no call-site copy)
+- 'lean': Close only, float32 indicators, categorical signals, columns
+  added in place
+
+'peak' is the tracemalloc peak while the step runs and 'retained' the
+size of the frame the session keeps (memory_usage(deep=True)).
+
+Run with:
+    python -m benchmarks.bench_lean_memory
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import LEAN_DTYPE, add_technical_indicators, lean_prices
+from utils.signals import generate_signals
+
+# 5 years x 252 sessions x 7 hourly bars
+HOURLY_5Y = 5 * 252 * 7
+
+
+def yfinance_frame(n=HOURLY_5Y, ticker='AAPL', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    columns = pd.MultiIndex.from_product(
+        [['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume'], [ticker]], names=['Price', 'Ticker']
+    )
+    values = np.column_stack([close * 0.999, close * 1.002, close * 0.998, close, close,
+                              rng.integers(1_000, 100_000, n).astype(float)])
+    return pd.DataFrame(values, index=pd.date_range('2020-01-01', periods=n, freq='h'), columns=columns)
+
+
+MODES = {
+    'previous': lambda df: generate_signals(add_technical_indicators(df.copy())),
+    'standard': lambda df: generate_signals(add_technical_indicators(df), copy=False),
+    'lean': lambda df: generate_signals(
+        add_technical_indicators(lean_prices(df), copy=False, dtype=LEAN_DTYPE), copy=False, categorical=True
+    ),
+}
+
+
+def run(n=HOURLY_5Y, repeats=5):
+    df = yfinance_frame(n)
+    rows = []
+    for mode, step in MODES.items():
+        step(df)  # warm up
+        seconds = min(_timed(step, df) for _ in range(repeats))
+        tracemalloc.start()
+        out = step(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({'mode': mode, 'seconds': seconds, 'peak': peak,
+                     'retained': int(out.memory_usage(deep=True).sum()), 'columns': out.shape[1]})
+    return rows
+
+
+def _timed(step, df):
+    start = time.perf_counter()
+    step(df)
+    return time.perf_counter() - start
+
+
+def main():
+    rows = run()
+    base = rows[0]
+    print(f"{HOURLY_5Y} hourly bars (5y), input frame {yfinance_frame().memory_usage(deep=True).sum() / 1e6:.2f} MB")
+    print(f"{'mode':>9} {'wall (ms)':>10} {'peak (MB)':>10} {'retained (MB)':>14} {'vs previous':>12} {'columns':>8}")
+    for r in rows:
+        print(f"{r['mode']:>9} {r['seconds'] * 1e3:>10.2f} {r['peak'] / 1e6:>10.2f} {r['retained'] / 1e6:>14.2f} "
+              f"{base['retained'] / r['retained']:>11.1f}x {r['columns']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: CPU training time and inference latency of the TCN vs RF
+
+Fits each model with walk_forward (backtest fit + the default 'warm'
+refit) on the synthetic benchmark datasets and reports training time,
+single-window latency (what the recursive forecast calls per day), batch
+throughput over every lag row, and backtest RMSE / direction accuracy.
+
+Run with:
+    python -m benchmarks.bench_sequence_model
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.datasets import GENERATORS, synthetic
+from utils.forecast_v2 import create_lag_features, walk_forward
+
+MODELS = ('rf', 'tcn')
+
+
+def _latency(model, rows, repeats):
+    start = time.perf_counter()
+    for i in range(repeats):
+        model.predict(rows[i % len(rows)][None, :])
+    return (time.perf_counter() - start) / repeats
+
+
+def run(datasets=tuple(GENERATORS), lengths=(1_000, 2_500), nlags=10, repeats=200):
+    rows = []
+    for kind in datasets:
+        for n in lengths:
+            X, y = create_lag_features(synthetic(kind, n).to_numpy(), nlags=nlags)
+            for model_type in MODELS:
+                start = time.perf_counter()
+                model, metrics = walk_forward(X, y, nlags=nlags, model_type=model_type)
+                train_s = time.perf_counter() - start
+
+                single_s = _latency(model, X, repeats)
+                start = time.perf_counter()
+                model.predict(X)
+                batch_s = time.perf_counter() - start
+
+                rows.append({
+                    'dataset': kind, 'length': n, 'model': model_type, 'train_s': train_s,
+                    'single_ms': single_s * 1e3, 'batch_rows_per_s': len(X) / batch_s,
+                    'rmse': metrics['rmse'], 'direction_accuracy': metrics['direction_accuracy'],
+                })
+    return rows
+
+
+def main():
+    print(f"{'dataset':>9} {'length':>7} {'model':>6} {'train (s)':>10} {'1 row (ms)':>11} "
+          f"{'rows/s':>10} {'rmse':>8} {'dir acc':>8}")
+    for r in run():
+        print(
+            f"{r['dataset']:>9} {r['length']:>7} {r['model']:>6} {r['train_s']:>10.2f} "
+            f"{r['single_ms']:>11.3f} {r['batch_rows_per_s']:>10.0f} {r['rmse']:>8.3f} "
+            f"{r['direction_accuracy']:>8.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: shared-memory price matrix against pickling DataFrames
+
+A universe of OHLCV frames (5 years of hourly bars by default) is sent to
+pool workers two ways:
+
+- 'pickle': every task receives DataFrames, which are pickled in the
+  parent, copied through the pipe and unpickled into fresh memory
+- 'shared': the frames are copied once into a SharedPrices segment and
+  every task receives the store, which pickles to its name and labels
+
+Two task shapes are timed: 'per ticker' (one task per ticker with its own
+frame, as the scanner runs) and 'broadcast' (one task per worker that
+needs the whole universe, as cross-sectional work would). The worker
+only sums the closes, so the timings isolate the transport. 'payload' is
+the pickled bytes sent to workers and 'copies' the price bytes the
+workers end up holding privately; the shared segment is allocated once
+('setup' includes building it).
+
+Run with:
+    python -m benchmarks.bench_shared_prices
+"""
+
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.scanner import get_pool
+from utils.shared_prices import SharedPrices
+
+# 5 years x 252 sessions x 7 hourly bars
+HOURLY_5Y = 5 * 252 * 7
+
+
+def universe(tickers=100, bars=HOURLY_5Y, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2020-01-01', periods=bars, freq='h')
+    frames = {}
+    for i in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, bars)))
+        frames[f'T{i:03d}'] = pd.DataFrame({
+            'Open': close, 'High': close * 1.002, 'Low': close * 0.998, 'Close': close,
+            'Volume': rng.integers(1_000, 100_000, bars).astype(float),
+        }, index=index)
+    return frames
+
+
+def _sum_frames(frames):
+    return float(sum(df['Close'].to_numpy().sum() for df in frames.values()))
+
+
+def _sum_frame(frame):
+    return float(frame['Close'].to_numpy().sum())
+
+
+def _sum_shared(shared, ticker=None):
+    try:
+        if ticker is None:
+            return float(np.nansum(shared.values('Close')))
+        return float(shared.frame(ticker)['Close'].to_numpy().sum())
+    finally:
+        shared.close()
+
+
+def run(tickers=100, bars=HOURLY_5Y, workers=None):
+    workers = workers or os.cpu_count() or 1
+    frames = universe(tickers, bars)
+    frame_bytes = sum(df.memory_usage(index=True).sum() for df in frames.values())
+    pool = get_pool(workers)
+    list(pool.map(abs, range(workers)))  # start the workers outside the timings
+
+    rows = []
+    # Pickled DataFrames
+    start = time.perf_counter()
+    futures = [pool.submit(_sum_frame, df) for df in frames.values()]
+    expected = sum(f.result() for f in futures)
+    rows.append({'tasks': 'per ticker', 'setup': 'pickle', 'seconds': time.perf_counter() - start,
+                 'payload': sum(len(pickle.dumps(df)) for df in frames.values()),
+                 'copies': frame_bytes})
+
+    start = time.perf_counter()
+    totals = [f.result() for f in [pool.submit(_sum_frames, frames) for _ in range(workers)]]
+    rows.append({'tasks': 'broadcast', 'setup': 'pickle', 'seconds': time.perf_counter() - start,
+                 'payload': workers * len(pickle.dumps(frames)), 'copies': workers * frame_bytes})
+    assert np.isclose(totals[0], expected)
+
+    # Shared segment (building it is part of the timing)
+    start = time.perf_counter()
+    with SharedPrices.from_frames(frames) as shared:
+        setup = time.perf_counter() - start
+        futures = [pool.submit(_sum_shared, shared, ticker) for ticker in frames]
+        total = sum(f.result() for f in futures)
+        rows.append({'tasks': 'per ticker', 'setup': 'shared', 'seconds': time.perf_counter() - start,
+                     'payload': len(frames) * len(pickle.dumps(shared)), 'copies': 0,
+                     'segment': shared.nbytes, 'build': setup})
+        assert np.isclose(total, expected)
+
+        start = time.perf_counter()
+        totals = [f.result() for f in [pool.submit(_sum_shared, shared) for _ in range(workers)]]
+        rows.append({'tasks': 'broadcast', 'setup': 'shared', 'seconds': time.perf_counter() - start + setup,
+                     'payload': workers * len(pickle.dumps(shared)), 'copies': 0,
+                     'segment': shared.nbytes, 'build': setup})
+        assert np.isclose(totals[0], expected)
+    return rows
+
+
+def main():
+    rows = run()
+    print(f"cores: {os.cpu_count()}, universe: 100 tickers x {HOURLY_5Y} hourly bars")
+    print(f"{'tasks':>11} {'setup':>7} {'wall (s)':>9} {'payload (MB)':>13} {'copies (MB)':>12} "
+          f"{'segment (MB)':>13} {'build (s)':>10}")
+    for r in rows:
+        segment = f"{r['segment'] / 1e6:.1f}" if 'segment' in r else '-'
+        build = f"{r['build']:.3f}" if 'build' in r else '-'
+        print(f"{r['tasks']:>11} {r['setup']:>7} {r['seconds']:>9.3f} {r['payload'] / 1e6:>13.2f} "
+              f"{r['copies'] / 1e6:>12.1f} {segment:>13} {build:>10}")
+
+
+if __name__ == '__main__':
+    main()
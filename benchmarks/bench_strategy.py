@@ -0,0 +1,64 @@
+"""
+Benchmark: vectorized signal backtests and parameter sweeps
+
+Backtests the RSI/SMA rules on a (tickers x bars) universe of GBM paths,
+once with the default parameters and then over the default sweep grid.
+25 years of daily bars for 500 tickers is ~3M bars per backtest.
+
+Run with:
+    python -m benchmarks.bench_strategy
+    python -m benchmarks.bench_strategy --workers 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from utils.strategy import backtest_strategy, summarize_sweep, sweep
+
+
+def universe(tickers, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (tickers, bars)), axis=1))
+
+
+def run(tickers_grid=(100, 500), years_grid=(10, 25), workers=None):
+    rows = []
+    for tickers in tickers_grid:
+        for years in years_grid:
+            close = universe(tickers, years * 252)
+
+            start = time.perf_counter()
+            backtest_strategy(close)
+            single_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = sweep(close, workers=workers)
+            sweep_s = time.perf_counter() - start
+            combos = len(results) // tickers
+
+            rows.append({
+                'tickers': tickers, 'years': years, 'bars': close.size,
+                'single_s': single_s, 'combos': combos, 'sweep_s': sweep_s,
+                'best': tuple(int(v) for v in summarize_sweep(results).index[0]),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signal backtest benchmark")
+    parser.add_argument('--workers', type=int, default=None, help="Sweep threads (default: budget)")
+    args = parser.parse_args()
+
+    print(f"{'tickers':>8} {'years':>6} {'Mbars':>6} {'single (s)':>11} {'combos':>7} "
+          f"{'sweep (s)':>10} {'s/combo':>8}  best (rsi_buy, rsi_sell, fast, slow)")
+    for r in run(workers=args.workers):
+        print(
+            f"{r['tickers']:>8} {r['years']:>6} {r['bars'] / 1e6:>6.2f} {r['single_s']:>11.2f} "
+            f"{r['combos']:>7} {r['sweep_s']:>10.2f} {r['sweep_s'] / r['combos']:>8.3f}  {r['best']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: refit policies of the walk-forward engine
+
+'full' is the previous train_and_forecast path (backtest fit + a second
+fit from scratch on all rows). Backtest metrics must be identical for
+every policy; only the wall time and the forecasting model differ.
+
+Run with:
+    python -m benchmarks.bench_walk_forward
+"""
+
+import time
+
+import numpy as np
+
+from utils.forecast_v2 import REFIT_POLICIES, create_lag_features, forecast_prices, walk_forward
+
+METRIC_KEYS = ('rmse', 'mae', 'direction_accuracy', 'test_periods', 'train_size')
+
+
+def run(lengths=(250, 1_000, 5_000), nlags=10, test_size=0.2, days=7):
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in lengths:
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        X, y = create_lag_features(prices, nlags=nlags)
+        
+        reference = None
+        for refit in REFIT_POLICIES:
+            start = time.perf_counter()
+            model, metrics = walk_forward(X, y, nlags=nlags, test_size=test_size, refit=refit)
+            elapsed = time.perf_counter() - start
+            forecast = forecast_prices(model, prices[-nlags:], days, nlags=nlags)
+            
+            summary = {k: metrics[k] for k in METRIC_KEYS}
+            if reference is None:
+                reference = summary
+            assert summary == reference, f"{refit} changed backtest metrics"
+            
+            rows.append({
+                'length': n,
+                'refit': refit,
+                'seconds': elapsed,
+                'forecast_last': float(forecast[-1]),
+            })
+    return rows
+
+
+def main():
+    rows = run()
+    baseline = {r['length']: r['seconds'] for r in rows if r['refit'] == 'full'}
+    print(f"{'length':>8} {'refit':>6} {'wall (s)':>10} {'vs full':>8} {'forecast[-1]':>13}")
+    for r in rows:
+        print(
+            f"{r['length']:>8} {r['refit']:>6} {r['seconds']:>10.3f} "
+            f"{baseline[r['length']] / r['seconds']:>7.2f}x {r['forecast_last']:>13.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Deterministic price paths for benchmarks
+
+Every generator is seeded, so the same (kind, length, seed) always gives
+the same series and timings compare like for like across runs. Real
+tickers are read from the local price store only; nothing here touches
+the network.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.price_store import get_store
+
+
+def _series(log_prices, start_price=100.0):
+    index = pd.bdate_range(end='2024-12-31', periods=len(log_prices))
+    return pd.Series(start_price * np.exp(log_prices), index=index, name='Close')
+
+
+def gbm(n, seed=0, mu=0.0003, sigma=0.012):
+    """Geometric Brownian motion with daily drift mu and volatility sigma"""
+    rng = np.random.default_rng(seed)
+    returns = (mu - 0.5 * sigma ** 2) + sigma * rng.standard_normal(n)
+    return _series(np.cumsum(returns))
+
+
+def regime_switching(n, seed=0, switch_prob=0.02):
+    """Two-state Markov chain alternating calm bull and volatile bear regimes"""
+    rng = np.random.default_rng(seed)
+    mus, sigmas = np.array([0.0008, -0.0012]), np.array([0.008, 0.022])
+    flips = rng.random(n) < switch_prob
+    state = np.cumsum(flips) % 2
+    returns = mus[state] + sigmas[state] * rng.standard_normal(n)
+    return _series(np.cumsum(returns))
+
+
+def trending(n, seed=0, drift=0.0006, cycle=120, amplitude=0.08):
+    """Linear trend plus a business cycle and AR(1) noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    noise = np.empty(n)
+    shocks = 0.006 * rng.standard_normal(n)
+    noise[0] = shocks[0]
+    for i in range(1, n):
+        noise[i] = 0.9 * noise[i - 1] + shocks[i]
+    return _series(drift * t + amplitude * np.sin(2 * np.pi * t / cycle) + noise)
+
+
+GENERATORS = {
+    'gbm': gbm,
+    'regime': regime_switching,
+    'trending': trending,
+}
+
+
+def synthetic(kind, n, seed=0):
+    """Close series of length n from one of GENERATORS"""
+    try:
+        return GENERATORS[kind](n, seed=seed)
+    except KeyError:
+        raise ValueError(f"Unknown dataset '{kind}'; expected one of {sorted(GENERATORS)}")
+
+
+def cached_real(ticker, interval='1d', store=None):
+    """
+    Close series for a ticker from the local price store, without refreshing
+
+    Returns:
+        Series of closes, or None if the ticker has not been cached
+    """
+    bars, _ = (store or get_store()).read(ticker, interval)
+    if bars is None or bars.empty or 'Close' not in bars.columns:
+        return None
+    return bars['Close'].dropna().rename('Close')
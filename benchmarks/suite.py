@@ -0,0 +1,224 @@
+"""
+Benchmark suite: per-stage timings and peak memory of the analysis pipeline
+
+Runs indicators -> signals -> lag features -> walk-forward backtest ->
+forecast -> scoring on deterministic synthetic paths (and optionally on
+tickers already in the local price store) for several lengths and lag
+counts. Each stage is timed over `repeats` runs (best time kept) and then
+run once more under tracemalloc for its peak allocation. Results are saved
+as JSON; passing a baseline file compares against it and exits non-zero
+when any stage regressed beyond the tolerance.
+
+Run with:
+    python -m benchmarks.suite --out bench.json
+    python -m benchmarks.suite --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import sklearn
+
+from benchmarks.datasets import GENERATORS, cached_real, synthetic
+from utils.forecast_v2 import create_lag_features, forecast_prices, walk_forward
+from utils.indicators import add_technical_indicators
+from utils.scoring import generate_complete_score
+from utils.signals import generate_signals
+
+STAGE_NAMES = ('indicators', 'signals', 'lag_features', 'walk_forward', 'forecast', 'score')
+
+# Differences below this many seconds are treated as timer noise
+NOISE_FLOOR_S = 0.002
+
+
+def _stages(close, nlags, days, test_size):
+    """(name, fn(ctx) -> value) pairs; each value is stored in ctx[name]"""
+    prices = close.to_numpy()
+    return [
+        ('indicators', lambda ctx: add_technical_indicators(close.to_frame())),
+        ('signals', lambda ctx: generate_signals(ctx['indicators'])),
+        ('lag_features', lambda ctx: create_lag_features(prices, nlags=nlags)),
+        ('walk_forward', lambda ctx: walk_forward(*ctx['lag_features'], nlags=nlags,
+                                                  test_size=test_size)),
+        ('forecast', lambda ctx: forecast_prices(ctx['walk_forward'][0], prices[-nlags:],
+                                                 days, nlags=nlags)),
+        ('score', lambda ctx: generate_complete_score(
+            ticker='BENCH', indicators_df=ctx['signals'], current_price=float(prices[-1]),
+            fundamentals={}, backtest_metrics=ctx['walk_forward'][1], sentiment_data={}
+        )),
+    ]
+
+
+def run_case(close, nlags=10, days=7, test_size=0.2, repeats=3):
+    """
+    Time and memory-profile every stage on one close series
+
+    Returns:
+        Dict of stage -> {'seconds': best wall time, 'peak_bytes': tracemalloc peak}
+    """
+    ctx, out = {}, {}
+    for name, fn in _stages(close, nlags, days, test_size):
+        best = float('inf')
+        for _ in range(max(1, repeats)):
+            start = time.perf_counter()
+            value = fn(ctx)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            fn(ctx)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        ctx[name] = value
+        out[name] = {'seconds': best, 'peak_bytes': int(peak)}
+    return out
+
+
+def run_suite(datasets=tuple(GENERATORS), lengths=(500, 2_000), nlags_list=(5, 10, 20),
+              real=(), repeats=3, seed=0, days=7, test_size=0.2):
+    """
+    Run every (dataset, length, nlags) case
+
+    Args:
+        datasets: Synthetic generator names from benchmarks.datasets
+        lengths: Series lengths for the synthetic datasets
+        nlags_list: Lag counts to benchmark
+        real: Tickers to read from the local price store (skipped if not cached)
+        repeats: Timed runs per stage (the best is kept)
+        seed: Seed for the synthetic generators
+
+    Returns:
+        JSON-serializable dict with 'meta' and a flat 'results' list
+    """
+    cases = [(kind, n, synthetic(kind, n, seed=seed)) for kind in datasets for n in lengths]
+    skipped = []
+    for ticker in real:
+        close = cached_real(ticker)
+        if close is None:
+            skipped.append(ticker)
+            continue
+        cases.append((f"real:{ticker}", len(close), close))
+
+    results = []
+    for dataset, n, close in cases:
+        for nlags in nlags_list:
+            stages = run_case(close, nlags=nlags, days=days, test_size=test_size, repeats=repeats)
+            for stage, metrics in stages.items():
+                results.append({'dataset': dataset, 'length': n, 'nlags': nlags, 'stage': stage,
+                                **metrics})
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'machine': platform.machine(),
+            'seed': seed,
+            'repeats': repeats,
+            'skipped_real': skipped,
+        },
+        'results': results,
+    }
+
+
+def _key(row):
+    return row['dataset'], row['length'], row['nlags'], row['stage']
+
+
+def compare(baseline, current, tolerance=0.25, noise_floor=NOISE_FLOOR_S, memory=True):
+    """
+    Stages that got slower (or hungrier) than the baseline
+
+    Args:
+        baseline: Earlier run_suite output
+        current: New run_suite output
+        tolerance: Allowed relative increase (0.25 = 25%)
+        noise_floor: Absolute seconds below which time changes are ignored
+        memory: Also flag peak-memory increases beyond the tolerance
+
+    Returns:
+        List of dicts describing each regression (empty if none)
+    """
+    reference = {_key(r): r for r in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        old = reference.get(_key(row))
+        if old is None:
+            continue
+        checks = [('seconds', noise_floor)]
+        if memory:
+            checks.append(('peak_bytes', 0))
+        for metric, floor in checks:
+            before, after = old[metric], row[metric]
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append({
+                    'case': dict(zip(('dataset', 'length', 'nlags', 'stage'), _key(row))),
+                    'metric': metric, 'baseline': before, 'current': after,
+                    'ratio': after / before if before else float('inf'),
+                })
+    return regressions
+
+
+def _print_results(report):
+    print(f"{'dataset':>12} {'length':>7} {'nlags':>6} {'stage':>13} {'ms':>10} {'peak KiB':>10}")
+    for r in report['results']:
+        print(
+            f"{r['dataset']:>12} {r['length']:>7} {r['nlags']:>6} {r['stage']:>13} "
+            f"{r['seconds']*1e3:>10.2f} {r['peak_bytes']/1024:>10.1f}"
+        )
+    if report['meta']['skipped_real']:
+        print(f"Not in the price store (skipped): {', '.join(report['meta']['skipped_real'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark suite")
+    parser.add_argument('--datasets', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument('--lengths', nargs='+', type=int, default=[500, 2_000])
+    parser.add_argument('--nlags', nargs='+', type=int, default=[5, 10, 20])
+    parser.add_argument('--real', nargs='*', default=[], help="Cached tickers to include")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Write results JSON here")
+    parser.add_argument('--baseline', help="Compare against a previous results JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--no-memory', action='store_true', help="Only compare timings")
+    args = parser.parse_args(argv)
+
+    report = run_suite(datasets=args.datasets, lengths=args.lengths, nlags_list=args.nlags,
+                       real=args.real, repeats=args.repeats, seed=args.seed)
+    _print_results(report)
+
+    if args.out:
+        with open(args.out, 'w') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Saved {len(report['results'])} results to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        regressions = compare(baseline, report, tolerance=args.tolerance,
+                              memory=not args.no_memory)
+        for r in regressions:
+            case = r['case']
+            print(
+                f"REGRESSION {case['dataset']} n={case['length']} nlags={case['nlags']} "
+                f"{case['stage']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+                f"({r['ratio']:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Headless watchlist scanner
+
+Examples:
+    python scan.py AAPL MSFT NVDA
+    python scan.py --file watchlist.txt --workers 8 --top 25
+"""
+
+import argparse
+import time
+
+from utils.scanner import rank_results, scan_tickers, summarize_timings
+
+
+def _read_tickers(args):
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as fh:
+            for line in fh:
+                tickers.extend(line.replace(',', ' ').split())
+    return tickers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a universe of tickers with the full analysis pipeline")
+    parser.add_argument('tickers', nargs='*', help="Ticker symbols")
+    parser.add_argument('--file', help="File with ticker symbols (whitespace or comma separated)")
+    parser.add_argument('--period', default='1y')
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--days', type=int, default=7, help="Forecast horizon")
+    parser.add_argument('--model', default='arima', help="Forecast model type (rf, arima, ...)")
+    parser.add_argument('--nlags', type=int, default=10)
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--fundamentals', action='store_true', help="Include yfinance fundamentals in the score")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores, 0: no pool)")
+    parser.add_argument('--top', type=int, default=20, help="Rows in the final ranking")
+    args = parser.parse_args(argv)
+
+    tickers = _read_tickers(args)
+    if not tickers:
+        parser.error("no tickers given")
+
+    results = []
+    start = time.perf_counter()
+    for result in scan_tickers(
+        tickers, workers=args.workers, period=args.period, interval=args.interval,
+        days=args.days, model_type=args.model, nlags=args.nlags, test_size=args.test_size,
+        with_fundamentals=args.fundamentals
+    ):
+        results.append(result)
+        ranked = rank_results(results)
+        position = ranked.index(result) + 1
+        elapsed = sum(result['timings'].values())
+        if result['error']:
+            status = f"error: {result['error']}"
+        else:
+            status = f"score {result['score']:.2f} {result['recommendation']:<11} (rank {position})"
+        print(f"[{len(results):>4}/{len(tickers)}] {result['ticker']:<8} {status} {elapsed:.2f}s", flush=True)
+
+    summary = summarize_timings(results, time.perf_counter() - start)
+
+    print(f"\nTop {args.top}:")
+    print(f"{'#':>4} {'ticker':<8} {'score':>6} {'recommendation':<12} {'signal':<6} {'forecast':>9}")
+    for i, r in enumerate(rank_results(results)[:args.top], 1):
+        if r['error']:
+            continue
+        fc = f"{r['forecast_return']*100:+.1f}%" if r.get('forecast_return') is not None else 'n/a'
+        print(f"{i:>4} {r['ticker']:<8} {r['score']:>6.2f} {r['recommendation']:<12} {r['signal']:<6} {fc:>9}")
+
+    print("\nStage timings (sum / mean per ticker):")
+    for stage, t in summary['stages'].items():
+        print(f"  {stage:<13} {t['total']:>8.2f}s {t['mean']*1e3:>9.1f}ms")
+    print(
+        f"\n{summary['tickers']} tickers ({summary['failed']} failed) in {summary['wall_time']:.1f}s "
+        f"-> {summary['tickers_per_second']:.2f} tickers/s"
+    )
+
+
+if __name__ == '__main__':
+    main()
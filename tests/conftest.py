@@ -0,0 +1,17 @@
+import pytest
+from utils import model_registry, scanner
+
+
+@pytest.fixture
+def model_cache_dir(tmp_path, monkeypatch):
+    """
+    Registry redirected to tmp_path, for this process and its pool workers
+
+    Workers forked before the patch would still write to the real cache,
+    so the pool is restarted around the test.
+    """
+    monkeypatch.setenv('MODEL_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(model_registry, 'MODEL_CACHE_DIR', str(tmp_path))
+    scanner.shutdown_pool()
+    yield tmp_path
+    scanner.shutdown_pool()
@@ -0,0 +1,44 @@
+import numpy as np
+from utils.arima import ArimaModel
+from utils.forecast_v2 import LAG_TARGET_HORIZON, create_lag_features, train_and_forecast
+
+
+def _arima_prices(n=2000, phi=0.5, theta=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    e = rng.normal(0, 0.01, n)
+    w = np.zeros(n)
+    for t in range(1, n):
+        w[t] = phi * w[t - 1] + e[t] + theta * e[t - 1]
+    return 100 * np.exp(np.cumsum(w))
+
+
+def test_recovers_coefficients_and_intervals_widen():
+    prices = _arima_prices()
+    model = ArimaModel(order=(1, 1, 1)).fit_series(prices)
+    assert abs(model.phi_[0] - 0.5) < 0.1 and abs(model.theta_[0] - 0.3) < 0.1
+    assert abs(np.sqrt(model.sigma2_) - 0.01) < 0.001
+
+    forecast, lower, upper = model.forecast_interval(prices, 20)
+    assert forecast.shape == lower.shape == upper.shape == (20,)
+    assert np.all(lower < forecast) and np.all(forecast < upper)
+    assert np.all(np.diff(upper - lower) > 0)
+
+
+def test_lag_row_predictions_match_series_forecasts():
+    prices = _arima_prices(600)
+    X, y = create_lag_features(prices, nlags=10)
+    model = ArimaModel(horizon=LAG_TARGET_HORIZON).fit(X, y)
+    assert model.order_[1] == 1
+    preds = model.predict(X[-5:])
+    for row, pred in zip(X[-5:], preds):
+        assert np.isclose(pred, model.forecast(row, LAG_TARGET_HORIZON)[-1])
+
+
+def test_train_and_forecast_arima_reports_bands():
+    prices = _arima_prices(500)
+    model, forecast, metrics = train_and_forecast(prices, days=10, model_type='arima')
+    assert isinstance(model, ArimaModel)
+    assert len(forecast) == 10
+    bands = metrics['forecast_bands']
+    assert np.all(bands['lower'] < forecast) and np.all(forecast < bands['upper'])
+    assert {'rmse', 'mae', 'direction_accuracy', 'test_periods'} <= set(metrics)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.batch_scoring import build_score_frame, explain, score_batch
+from utils.scoring import generate_complete_score
+
+
+def _universe(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:03d}" for i in range(n)]
+    indicators, fundamentals, backtests, sentiments = [], [], [], []
+    for i in range(n):
+        close = 100 * rng.uniform(0.7, 1.3)
+        indicators.append(pd.DataFrame({
+            'Close': [100.0, close], 'RSI': [50.0, rng.uniform(10, 90)],
+            'SMA_50': [100.0, 100.0], 'SMA_200': [100.0, rng.uniform(80, 120)],
+            'MACD': [0.0, rng.normal()], 'MACD_Signal': [0.0, rng.normal()],
+            'BB_High': [105.0, 110.0], 'BB_Low': [95.0, 90.0],
+        }))
+        fundamentals.append({} if i % 7 == 0 else {
+            'trailingPE': rng.choice([None, rng.uniform(5, 40)]),
+            'beta': rng.uniform(0.3, 2.0),
+            'dividendYield': rng.choice([None, 0.0, rng.uniform(0, 0.06)]),
+            'marketCap': 10 ** rng.uniform(8, 12),
+        })
+        backtests.append({} if i % 5 == 0 else {
+            'direction_accuracy': rng.uniform(0.4, 0.8), 'mae': rng.uniform(0.5, 2),
+            'rmse': rng.uniform(1, 3), 'test_periods': int(rng.integers(5, 80)),
+            'forecast_spread': rng.choice([None, rng.uniform(0.002, 0.05)]),
+        })
+        sentiments.append({} if i % 3 == 0 else {
+            'daily_sentiment': [rng.uniform(-0.5, 0.5)],
+            'recent_articles': [{'title': 't'}] * int(rng.integers(0, 8)),
+        })
+    return tickers, indicators, fundamentals, backtests, sentiments
+
+
+def test_score_batch_matches_per_ticker_scoring():
+    tickers, indicators, fundamentals, backtests, sentiments = _universe()
+    frame = build_score_frame(tickers, indicators, fundamentals, backtests, sentiments)
+    scores = score_batch(frame)
+
+    for i, ticker in enumerate(tickers):
+        expected = generate_complete_score(ticker, indicators[i], None, fundamentals[i],
+                                           backtests[i], sentiments[i])
+        row = scores.loc[ticker]
+        for part in ('technical', 'fundamental', 'forecast', 'sentiment'):
+            assert row[f'{part}_score'] == pytest.approx(expected[part]['score'])
+        assert row['overall_score'] == pytest.approx(expected['overall_score'])
+        assert row['recommendation'] == expected['summary']['recommendation']
+        assert row['risk_level'] == expected['summary']['risk_level']
+        assert row['confidence'] == expected['summary']['confidence']
+        assert row['sentiment'] == expected['sentiment']['sentiment']
+
+
+def test_explain_builds_reasoning_for_requested_rows_only():
+    tickers, indicators, fundamentals, backtests, sentiments = _universe(20)
+    frame = build_score_frame(tickers, indicators, fundamentals, backtests, sentiments)
+    scores = score_batch(frame)
+
+    top = list(scores['overall_score'].nlargest(3).index)
+    detail = explain(frame, top)
+    assert list(detail) == top
+    for ticker in top:
+        expected = generate_complete_score(ticker, indicators[tickers.index(ticker)], None,
+                                           fundamentals[tickers.index(ticker)],
+                                           backtests[tickers.index(ticker)],
+                                           sentiments[tickers.index(ticker)])
+        assert detail[ticker]['technical']['components'] == expected['technical']['components']
+        assert detail[ticker]['fundamental'] == expected['fundamental']
+        assert detail[ticker]['forecast'] == expected['forecast']
+        assert detail[ticker]['overall_score'] == pytest.approx(scores.loc[ticker, 'overall_score'])
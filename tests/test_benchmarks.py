@@ -0,0 +1,27 @@
+import numpy as np
+from benchmarks.datasets import GENERATORS, synthetic
+from benchmarks.suite import STAGE_NAMES, compare, run_suite
+
+
+def test_synthetic_datasets_are_deterministic():
+    for kind in GENERATORS:
+        a, b = synthetic(kind, 300, seed=1), synthetic(kind, 300, seed=1)
+        np.testing.assert_array_equal(a.to_numpy(), b.to_numpy())
+        assert len(a) == 300 and (a > 0).all()
+        assert not np.array_equal(a.to_numpy(), synthetic(kind, 300, seed=2).to_numpy())
+
+
+def test_suite_reports_every_stage_and_flags_regressions():
+    report = run_suite(datasets=('gbm',), lengths=(300,), nlags_list=(5,), repeats=1,
+                       real=('NOT_CACHED_TICKER',))
+    assert [r['stage'] for r in report['results']] == list(STAGE_NAMES)
+    assert all(r['seconds'] > 0 and r['peak_bytes'] >= 0 for r in report['results'])
+    assert report['meta']['skipped_real'] == ['NOT_CACHED_TICKER']
+
+    assert compare(report, report) == []
+    slower = {'meta': report['meta'], 'results': [
+        dict(r, seconds=r['seconds'] * 2 + 0.01) if r['stage'] == 'walk_forward' else r
+        for r in report['results']
+    ]}
+    regressions = compare(report, slower, tolerance=0.25)
+    assert [(r['case']['stage'], r['metric']) for r in regressions] == [('walk_forward', 'seconds')]
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from utils import compute
+from utils.forecast_v2 import create_lag_features, train_model
+
+
+def test_budget_caps_concurrent_cores():
+    defaults = compute.SESSION_CORES, compute.TRAINING_CORES
+    compute.configure(session_cores=3, training_cores=4)
+    try:
+        granted, peak = [], []
+
+        def session():
+            with compute.compute_slot() as cores:
+                granted.append(cores)
+                peak.append(compute.cores_in_use())
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=session) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(1 <= g <= 3 for g in granted)
+        assert max(peak) <= 4
+        assert compute.cores_in_use() == 0
+    finally:
+        compute.configure(*defaults)
+
+
+def test_budgeted_fit_restores_parallelism_for_predict():
+    defaults = compute.SESSION_CORES, compute.TRAINING_CORES
+    compute.configure(session_cores=2, training_cores=2)
+    try:
+        seen = []
+
+        class Probe(RandomForestRegressor):
+            def fit(self, X, y):
+                seen.append(self.n_jobs)
+                return super().fit(X, y)
+
+        X, y = create_lag_features(100 + np.arange(80.0), nlags=5)
+        model = compute.budgeted_fit(Probe(n_estimators=5, n_jobs=1), X, y)
+        assert seen == [2] and model.n_jobs == 1
+
+        rf = train_model(X, y, 'rf')
+        assert rf.n_jobs == 1 and compute.cores_in_use() == 0
+    finally:
+        compute.configure(*defaults)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from utils.cross_validation import cross_validate, fold_bounds, summarize_folds
+from utils.forecast_v2 import create_lag_features, regression_metrics, train_model
+
+
+def _prices(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def test_fold_bounds_expanding_and_rolling():
+    expanding = fold_bounds(100, n_splits=4, gap=1)
+    assert [b[2:] for b in expanding] == [(20, 40), (40, 60), (60, 80), (80, 100)]
+    assert all(start == 0 and end == test - 1 for start, end, test, _ in expanding)
+
+    rolling = fold_bounds(100, n_splits=4, mode='rolling', gap=1)
+    assert [b[2:] for b in rolling] == [b[2:] for b in expanding]
+    assert {end - start for start, end, _, _ in rolling} == {19}
+
+
+def test_folds_match_direct_fits_in_process_and_on_the_pool():
+    prices = _prices()
+    local = cross_validate(prices, nlags=5, model_type='arima', n_splits=3, workers=0)
+    pooled = cross_validate(prices, nlags=5, model_type='arima', n_splits=3, workers=1)
+
+    X, y = create_lag_features(prices, nlags=5)
+    fold = local['folds'][1]
+    model = train_model(X[fold['train_start']:fold['train_end']], y[fold['train_start']:fold['train_end']],
+                        'arima')
+    expected = regression_metrics(y[fold['test_start']:fold['test_end']],
+                                  model.predict(X[fold['test_start']:fold['test_end']]))
+    assert fold['rmse'] == expected['rmse']
+
+    for key in ('rmse', 'mae', 'direction_accuracy', 'test_periods', 'train_size'):
+        assert pooled[key] == local[key]
+    assert [f['fold'] for f in pooled['folds']] == [0, 1, 2]
+    low, high = local['rmse_ci']
+    assert low < local['rmse'] < high
+
+
+def test_summary_skips_failed_folds():
+    folds = [{'rmse': 1.0, 'mae': 1.0, 'direction_accuracy': 0.5, 'error': None},
+             {'rmse': 3.0, 'mae': 2.0, 'direction_accuracy': 0.7, 'error': None},
+             {'error': 'boom'}]
+    summary = summarize_folds(folds)
+    assert summary['rmse'] == 2.0 and summary['rmse_std'] == np.sqrt(2)
+    assert summarize_folds(folds[:1])['rmse_ci'] is None
+
+
+def test_short_series_get_fewer_folds():
+    result = cross_validate(_prices(20), nlags=10, model_type='arima', n_splits=10, workers=0)
+    assert 2 <= result['n_splits'] < 10 and len(result['folds']) == result['n_splits']
+    with pytest.raises(ValueError):
+        fold_bounds(4, n_splits=5)
@@ -1,10 +1,14 @@
+import numpy as np
 import pandas as pd
+from utils import model_registry
 from utils.forecast import train_and_forecast
 
 
-def test_forecast_short():
+def test_forecast_short(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, 'MODEL_CACHE_DIR', str(tmp_path))
     dates = pd.date_range(end=pd.Timestamp.today(), periods=200)
-    s = pd.Series(100 + (pd.np.sin(range(200))/10).cumsum(), index=dates)
+    s = pd.Series(100 + (np.sin(range(200))/10).cumsum(), index=dates)
     model, preds = train_and_forecast(s, days=5, retrain=True)
     assert preds is not None
     assert len(preds) == 5
+    assert any(tmp_path.glob('series_*'))
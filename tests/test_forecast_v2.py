@@ -0,0 +1,95 @@
+import numpy as np
+from utils.forecast_v2 import create_lag_features, lag_matrix, train_and_forecast
+
+
+def _prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def test_lag_matrix_is_readonly_view():
+    prices = _prices()
+    X, y = create_lag_features(prices, nlags=10)
+    assert np.shares_memory(X, prices) and np.shares_memory(y, prices)
+    assert not X.flags.writeable and not y.flags.writeable
+    assert X.shape == (len(prices) - 11, 10)
+    assert np.array_equal(X[5], prices[5:15])
+    assert y[5] == prices[16]
+
+
+def test_lag_matrix_horizons_and_exog():
+    prices = _prices(50)
+    exog = np.arange(50, dtype=float)
+    X, Y = lag_matrix(prices, nlags=5, horizons=(1, 3), exog=exog)
+    assert X.shape == (50 - 5 - 3 + 1, 6)
+    assert np.array_equal(X[0, :5], prices[:5]) and X[0, 5] == 4
+    assert Y[0, 0] == prices[5] and Y[0, 1] == prices[7]
+
+
+def test_train_and_forecast_shapes():
+    model, forecast, metrics = train_and_forecast(_prices(), days=5, nlags=10)
+    assert model is not None
+    assert len(forecast) == 5
+    assert {'rmse', 'mae', 'direction_accuracy'} <= set(metrics)
+
+
+def test_walk_forward_policies_share_backtest_metrics():
+    from utils.forecast_v2 import walk_forward
+    X, y = create_lag_features(_prices(), nlags=10)
+    keys = ('rmse', 'mae', 'direction_accuracy', 'test_periods', 'train_size')
+    results = {refit: walk_forward(X, y, refit=refit) for refit in ('full', 'warm', 'reuse')}
+    reference = {k: results['full'][1][k] for k in keys}
+    for model, metrics in results.values():
+        assert {k: metrics[k] for k in keys} == reference
+    assert len(results['warm'][0].estimators_) == 150
+    assert results['reuse'][0] is results['reuse'][1]['model']
+
+
+def test_default_refit_keeps_forests_on_recent_levels():
+    from utils.forecast_v2 import forecast_prices, walk_forward
+    # Steady uptrend: the last test_size share of rows lies above every
+    # price the backtest forest was fit on
+    prices = 100 * np.exp(np.cumsum(np.full(1000, 0.0015) + np.random.default_rng(1).normal(0, 0.005, 1000)))
+    X, y = create_lag_features(prices, nlags=10)
+    forecasts = {refit: forecast_prices(walk_forward(X, y, refit=refit)[0], prices[-10:], 5)
+                 for refit in ('auto', 'full', 'warm')}
+    for refit in ('auto', 'full'):
+        assert abs(forecasts[refit][0] / prices[-1] - 1) < 0.02
+    assert forecasts['warm'][0] < forecasts['full'][0] * 0.95
+
+
+def test_default_refit_fits_forests_once(monkeypatch):
+    from utils import forecast_v2
+    calls = []
+    train_model = forecast_v2.train_model
+    monkeypatch.setattr(forecast_v2, 'train_model', lambda *args: calls.append(args[2:]) or train_model(*args))
+    X, y = create_lag_features(_prices(), nlags=10)
+    model, _ = forecast_v2.walk_forward(X, y, model_type='rf')
+    assert calls == [('rf',)]
+    # Only trees grown on the full window are left
+    assert len(model.estimators_) == model.n_estimators == 50
+
+
+def test_direct_forecast_matches_horizon():
+    model, forecast, metrics = train_and_forecast(_prices(), days=12, nlags=10, forecast_mode='direct')
+    assert len(forecast) == 12
+    assert model.n_outputs_ == 12
+    assert 0.0 <= metrics['direction_accuracy'] <= 1.0
+
+
+def test_forest_bands_come_from_the_fitted_trees():
+    from utils.forecast_v2 import (direct_lag_features, forecast_direct, forecast_prices,
+                                   forecast_with_bands, walk_forward)
+    prices = _prices()
+    for direct in (False, True):
+        X, y = direct_lag_features(prices, 10, 6) if direct else create_lag_features(prices, 10)
+        model, _ = walk_forward(X, y, refit='full')
+        point = (forecast_direct if direct else forecast_prices)(model, prices[-10:], 6)
+        forecast, bands = forecast_with_bands(model, prices[-10:], 6, direct=direct)
+        np.testing.assert_allclose(forecast, point)
+        assert bands.shape == (3, 6)
+        assert np.all(bands[0] <= bands[1]) and np.all(bands[1] <= bands[2])
+
+    _, forecast, metrics = train_and_forecast(prices, days=6, nlags=10)
+    assert metrics['forecast_bands']['level'] == 0.8
+    assert metrics['forecast_spread'] > 0
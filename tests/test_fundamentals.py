@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pandas as pd
+from utils import fundamentals
+from utils.valuation import estimate_fair_price
+
+
+def _patch(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_fetch(ticker):
+        calls.append(ticker)
+        time.sleep(0.05)
+        return {'shortName': ticker, 'trailingPE': 20.0, 'freeCashflow': 1e9, 'sharesOutstanding': 1e8}
+
+    monkeypatch.setattr(fundamentals, '_fetch_info', fake_fetch)
+    monkeypatch.setattr(fundamentals, '_snapshots', {})
+    monkeypatch.setattr(fundamentals, 'FUNDAMENTALS_CACHE_DIR', str(tmp_path))
+    return calls
+
+
+def test_scoring_and_valuation_share_one_fetch(monkeypatch, tmp_path):
+    calls = _patch(monkeypatch, tmp_path)
+    funds = fundamentals.get_fundamentals('AAA')
+    result = estimate_fair_price(funds, pd.DataFrame({'Close': [100.0]}), ticker='AAA')
+    assert 'DCF (Simple)' in result['methods']
+    assert calls == ['AAA']
+
+
+def test_concurrent_requests_coalesce_and_persist(monkeypatch, tmp_path):
+    calls = _patch(monkeypatch, tmp_path)
+    threads = [threading.Thread(target=fundamentals.get_info, args=('BBB',)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ['BBB']
+
+    monkeypatch.setattr(fundamentals, '_snapshots', {})  # simulate a restart
+    assert fundamentals.get_info_batch(['BBB', 'CCC'])['BBB']['shortName'] == 'BBB'
+    assert sorted(calls) == ['BBB', 'CCC']
+
+
+def test_empty_payloads_are_not_cached(monkeypatch, tmp_path):
+    calls = _patch(monkeypatch, tmp_path)
+    fetch = fundamentals._fetch_info
+    monkeypatch.setattr(fundamentals, '_fetch_info', lambda ticker: calls.append(ticker) or {})
+    assert fundamentals.get_info('DDD') == {}
+    assert 'DDD' not in fundamentals._snapshots
+
+    # The next call fetches again instead of serving {} for the whole TTL
+    monkeypatch.setattr(fundamentals, '_fetch_info', fetch)
+    assert fundamentals.get_info('DDD')['shortName'] == 'DDD'
+    assert calls == ['DDD', 'DDD']
@@ -0,0 +1,40 @@
+import numpy as np
+from utils.forecast_v2 import create_lag_features, lag_matrix, train_and_forecast, walk_forward
+from utils.hgb import HGBRegressor
+from utils.model_registry import load_model, save_model
+
+
+def _prices(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n)))
+
+
+def test_hgb_relative_targets_and_stacked_horizons():
+    X, y = create_lag_features(_prices(), nlags=10)
+    model = HGBRegressor(max_iter=50).fit(X, y)
+    preds = model.predict(X)
+    assert preds.shape == y.shape
+    np.testing.assert_allclose(model.predict(X[-1]), preds[-1:])
+    assert np.mean(np.abs(preds / y - 1)) < 0.05
+
+    # Prices outside the training range are still forecast around the last lag
+    scaled = model.predict(X[-5:] * 3)
+    np.testing.assert_allclose(scaled, preds[-5:] * 3, rtol=1e-2)
+
+    X2, Y2 = lag_matrix(_prices(), nlags=10, horizons=(1, 2, 3))
+    stacked = HGBRegressor(max_iter=20).fit(X2, Y2)
+    assert stacked.predict(X2[:4]).shape == (4, 3)
+
+
+def test_hgb_warm_refit_and_registry_roundtrip(tmp_path):
+    X, y = create_lag_features(_prices(), nlags=10)
+    model, metrics = walk_forward(X, y, model_type='hgb', refit='warm')
+    assert isinstance(model, HGBRegressor) and metrics['rmse'] > 0
+    assert model.booster_.max_iter == int(model.max_iter * 1.5)
+
+    save_model('hgb-test', {'model': model}, cache_dir=str(tmp_path))
+    loaded = load_model('hgb-test', cache_dir=str(tmp_path))['model']
+    np.testing.assert_allclose(loaded.predict(X[-20:]), model.predict(X[-20:]))
+
+    _, forecast, _ = train_and_forecast(_prices(), days=5, model_type='hgb')
+    assert len(forecast) == 5 and np.all(forecast > 0)
@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pandas as pd
+from utils.indicator_engine import INDICATOR_COLUMNS, IndicatorEngine
+from utils.indicators import LEAN_DTYPE, add_technical_indicators, lean_prices
+from utils.signals import generate_signals
+
+
+def _close(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    return pd.Series(values, index=pd.date_range('2020-01-01', periods=n), name='Close')
+
+
+def test_engine_batch_matches_add_technical_indicators():
+    close = _close()
+    expected = add_technical_indicators(close.to_frame())
+    _, frame = IndicatorEngine.from_history(close)
+    pd.testing.assert_frame_equal(frame[INDICATOR_COLUMNS], expected[INDICATOR_COLUMNS],
+                                  check_exact=False, rtol=1e-9, check_freq=False)
+
+
+def test_engine_incremental_updates_match_batch_and_checkpoint():
+    close = _close()
+    _, expected = IndicatorEngine.from_history(close)
+
+    engine = IndicatorEngine()
+    rows = [engine.update(v) for v in close.iloc[:300]]
+    engine = IndicatorEngine.from_state(json.loads(json.dumps(engine.state_dict())))
+    rows += [engine.update(v) for v in close.iloc[300:]]
+    streamed = pd.DataFrame(rows, index=close.index)
+    pd.testing.assert_frame_equal(streamed[INDICATOR_COLUMNS], expected[INDICATOR_COLUMNS],
+                                  check_exact=False, rtol=1e-8, check_freq=False)
+
+    primed, _ = IndicatorEngine.from_history(close.iloc[:500])
+    for value in close.iloc[500:]:
+        last = primed.update(value)
+    assert np.allclose(list(last.values()), expected.iloc[-1][INDICATOR_COLUMNS].to_numpy(), rtol=1e-8)
+
+
+def test_kernels_match_ta_for_a_universe():
+    import ta
+    from utils.indicator_kernels import compute_indicators
+
+    closes = np.vstack([_close(400, seed).to_numpy() for seed in range(3)])
+    closes[1, :40] = np.nan  # listed later than the others
+    out = compute_indicators(closes)
+
+    for row in range(3):
+        close = pd.Series(closes[row]).dropna()
+        offset = 400 - len(close)
+        macd = ta.trend.MACD(close)
+        bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+        expected = {
+            'SMA_50': close.rolling(50, min_periods=1).mean(),
+            'SMA_200': close.rolling(200, min_periods=1).mean(),
+            'RSI_14': ta.momentum.RSIIndicator(close, window=14).rsi(),
+            'MACD': macd.macd(),
+            'MACD_Signal': macd.macd_signal(),
+            'BB_middle': bb.bollinger_mavg(),
+            'BB_upper': bb.bollinger_hband(),
+            'BB_lower': bb.bollinger_lband(),
+        }
+        for name, values in expected.items():
+            assert np.isnan(out[name][row, :offset]).all()
+            np.testing.assert_allclose(out[name][row, offset:], values.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    single = compute_indicators(closes[0], dtype=np.float32)
+    assert single['RSI_14'].dtype == np.float32
+    np.testing.assert_allclose(single['MACD'], out['MACD'][0], rtol=1e-5, atol=1e-5)
+
+
+def test_lean_pipeline_keeps_close_and_matches_full_frame():
+    close = _close()
+    columns = pd.MultiIndex.from_product([['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume'], ['AAA']])
+    raw = pd.DataFrame(np.repeat(close.to_numpy()[:, None], 6, axis=1), index=close.index, columns=columns)
+
+    full = generate_signals(add_technical_indicators(close.to_frame()))
+    lean = lean_prices(raw)
+    assert list(lean.columns) == ['Close'] and lean['Close'].dtype == np.float64
+
+    out = generate_signals(add_technical_indicators(lean, copy=False, dtype=LEAN_DTYPE), copy=False,
+                           categorical=True)
+    assert out is lean
+    assert out['RSI_14'].dtype == LEAN_DTYPE and isinstance(out['Signal'].dtype, pd.CategoricalDtype)
+    for name in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(out[name], full[name], rtol=1e-5)
+    # Ties at float32 precision may flip a handful of bars at most
+    assert (out['Signal'].astype(str) == full['Signal']).mean() > 0.99
+    standard = generate_signals(add_technical_indicators(raw))
+    assert out.memory_usage(deep=True).sum() < standard.memory_usage(deep=True).sum() / 2
+
+
+def test_interior_gap_does_not_blank_later_bars():
+    close = _close(400)
+    gappy = close.copy()
+    gappy.iloc[250] = np.nan
+    out = generate_signals(add_technical_indicators(gappy.to_frame()))
+    filled = add_technical_indicators(gappy.ffill().to_frame())
+    for name in INDICATOR_COLUMNS:
+        assert not out[name].iloc[250:].isna().any()
+        np.testing.assert_allclose(out[name], filled[name])
+    assert (out['Signal'].iloc[251:] == generate_signals(filled)['Signal'].iloc[251:]).all()
+
+
+def test_engine_history_with_gaps_matches_batch():
+    close = _close(400)
+    gappy = close.copy()
+    gappy.iloc[:30] = np.nan  # listed late
+    gappy.iloc[250] = np.nan
+    engine, frame = IndicatorEngine.from_history(gappy)
+    expected = add_technical_indicators(gappy.ffill().to_frame())
+    for batch in (frame, add_technical_indicators(gappy.to_frame())):
+        pd.testing.assert_frame_equal(batch[INDICATOR_COLUMNS], expected[INDICATOR_COLUMNS],
+                                      check_exact=False, rtol=1e-9, check_freq=False)
+    assert not frame.iloc[250:].isna().any().any()
+
+    # The primed state continues like a clean history
+    last = engine.update(close.iloc[-1] * 1.01)
+    assert not np.isnan(list(last.values())).any()
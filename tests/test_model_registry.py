@@ -0,0 +1,36 @@
+import os
+
+import numpy as np
+from utils.forecast_v2 import train_and_forecast
+from utils import model_registry
+from utils.model_registry import data_fingerprint, evict, load_model, model_key, save_model
+
+
+def test_save_load_roundtrip_memory_maps_arrays(tmp_path):
+    key = model_key('AAPL', '1y', '1d', 'rf', 10, data_fingerprint([1.0, 2.0]))
+    assert save_model(key, {'weights': np.arange(1000.0)}, cache_dir=str(tmp_path))
+    loaded = load_model(key, cache_dir=str(tmp_path))
+    assert isinstance(loaded['weights'], np.memmap)
+    assert not [p for p in os.listdir(tmp_path) if p.endswith('.tmp')]
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    for i, name in enumerate(['a', 'b', 'c']):
+        save_model(name, np.zeros(1000), cache_dir=str(tmp_path), max_bytes=10**9)
+        os.utime(tmp_path / f'{name}.joblib', (i, i))
+    load_model('a', cache_dir=str(tmp_path))  # touch: now most recent
+    size = os.path.getsize(tmp_path / 'a.joblib')
+    evict(str(tmp_path), max_bytes=2 * size)
+    assert sorted(os.listdir(tmp_path)) == ['a.joblib', 'c.joblib']
+
+
+def test_train_and_forecast_reuses_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, 'MODEL_CACHE_DIR', str(tmp_path))
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 200)))
+    model, first, metrics = train_and_forecast(prices, days=3, ticker='TEST', period='1y', interval='1d')
+    assert len(os.listdir(tmp_path)) == 1
+
+    cached, second, cached_metrics = train_and_forecast(prices, days=3, ticker='TEST', period='1y', interval='1d')
+    assert cached is not model
+    assert np.allclose(first, second)
+    assert cached_metrics['rmse'] == metrics['rmse']
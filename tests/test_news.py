@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from utils import news
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, articles):
+        self._articles = articles
+
+    def json(self):
+        return {'articles': self._articles}
+
+
+def _article(days_ago, title):
+    when = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%dT12:00:00Z')
+    return {'title': title, 'description': 'stock rally', 'url': 'u', 'source': {'name': 's'},
+            'publishedAt': when}
+
+
+def test_headlines_served_from_wider_sentiment_fetch(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(params['from'])
+        return _Response([_article(1, 'recent'), _article(3, 'this week'), _article(30, 'old')])
+
+    monkeypatch.setattr(news, '_news_cache', {})
+    monkeypatch.setattr(news._SESSION, 'get', fake_get)
+
+    wide = news.fetch_news_sentiment('AAA', days=60)
+    headlines = news.get_top_headlines('AAA', limit=5)
+    assert len(calls) == 1
+    assert len(wide) == 3
+    assert [h['title'] for h in headlines] == ['recent', 'this week']
+
+
+def test_failures_and_expired_entries(monkeypatch):
+    calls = []
+
+    class _Failed:
+        status_code = 429
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(params['from'])
+        return _Failed()
+
+    monkeypatch.setattr(news, '_news_cache', {})
+    monkeypatch.setattr(news._SESSION, 'get', fake_get)
+    assert news.fetch_news_sentiment('BBB', days=60) is None
+    assert news.get_top_headlines('BBB') == []
+    assert len(calls) == 1
+
+    news._news_cache['BBB']['fetched_at'] -= news.NEWS_FAILURE_TTL + 1
+    news.fetch_news_sentiment('BBB', days=7)
+    assert len(calls) == 2
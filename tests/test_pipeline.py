@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from utils import pipeline
+
+
+def test_sources_run_concurrently_and_degrade(monkeypatch):
+    def slow(seconds, value):
+        def fn(*args, **kwargs):
+            time.sleep(seconds)
+            return value
+        return fn
+
+    def broken(*args, **kwargs):
+        raise ConnectionError("api down")
+
+    monkeypatch.setattr(pipeline, 'get_fundamentals', slow(0.2, {'beta': 1.0}))
+    monkeypatch.setattr(pipeline, 'fetch_news_sentiment', broken)
+    prices = pd.DataFrame({'Close': [1.0, 2.0]})
+
+    start = time.perf_counter()
+    data = pipeline.fetch_page_data('AAA', '1y', '1d', loader=slow(0.2, prices))
+    assert time.perf_counter() - start < 0.35
+    assert data['prices'] is prices and data['fundamentals'] == {'beta': 1.0}
+    assert data['news'] is None and 'api down' in data['errors']['news']
+
+    data = pipeline.fetch_page_data('AAA', '1y', '1d', news_days=None,
+                                    loader=slow(0.5, prices), timeouts={'prices': 0.05})
+    assert data['prices'].empty and 'timed out' in data['errors']['prices']
+
+
+def test_prices_are_memoized_between_reruns(monkeypatch):
+    calls = []
+
+    def load(ticker, period, interval):
+        calls.append(ticker)
+        return pd.DataFrame({'Close': [1.0]}) if ticker != 'NONE' else pd.DataFrame()
+
+    monkeypatch.setattr(pipeline, 'load_data', load)
+    monkeypatch.setattr(pipeline, '_bars', OrderedDict())
+    first = pipeline.cached_prices('AAA', '1y', '1d')
+    assert pipeline.cached_prices('AAA', '1y', '1d') is first
+    pipeline.cached_prices('NONE', '1y', '1d')
+    pipeline.cached_prices('NONE', '1y', '1d')
+    assert calls == ['AAA', 'NONE', 'NONE']
+    assert pipeline.cached_prices('AAA', '1y', '1d', ttl=0) is not first
+
+
+def test_price_memory_is_bounded(monkeypatch):
+    monkeypatch.setattr(pipeline, 'load_data', lambda ticker, period, interval: pd.DataFrame({'Close': [1.0]}))
+    monkeypatch.setattr(pipeline, '_bars', OrderedDict())
+    monkeypatch.setattr(pipeline, 'PRICE_MEMORY_ENTRIES', 2)
+    for ticker in ('AAA', 'BBB', 'AAA', 'CCC'):
+        pipeline.cached_prices(ticker, '1y', '1d')
+    assert [key[0] for key in pipeline._bars] == ['AAA', 'CCC']
+
+    # Expired frames go on the next write
+    pipeline.cached_prices('DDD', '1y', '1d', ttl=-1)
+    assert [key[0] for key in pipeline._bars] == ['DDD']
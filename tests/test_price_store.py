@@ -0,0 +1,33 @@
+import pandas as pd
+from utils.price_store import FakeProvider, PriceStore
+
+
+def test_batched_download_then_incremental_append(tmp_path):
+    provider = FakeProvider(end='2024-06-28')
+    store = PriceStore(root=str(tmp_path), provider=provider, ttl=0)
+
+    first = store.get_many(['AAA', 'BBB'], '1y', '1d')
+    assert len(provider.calls) == 1 and provider.calls[0]['tickers'] == ['AAA', 'BBB']
+    assert first['AAA'].index[-1] == pd.Timestamp('2024-06-28')
+
+    provider.advance(3)
+    second = store.get_many(['AAA', 'BBB'], '1y', '1d')
+    assert len(provider.calls) == 2
+    assert provider.calls[1]['start'] == pd.Timestamp('2024-06-28')
+    assert second['AAA'].index[-1] == pd.Timestamp('2024-07-03')
+    pd.testing.assert_frame_equal(second['AAA'].iloc[:-3], first['AAA'].iloc[3:], check_freq=False)
+
+
+def test_fresh_cache_skips_provider_and_serves_offline(tmp_path):
+    provider = FakeProvider(end='2024-06-28')
+    PriceStore(root=str(tmp_path), provider=provider).get('AAA', '6mo', '1d')
+
+    class Offline:
+        def fetch(self, *args, **kwargs):
+            raise ConnectionError("no network")
+
+    fresh = PriceStore(root=str(tmp_path), provider=provider, ttl=3600).get('AAA', '1mo', '1d')
+    assert len(provider.calls) == 1 and 15 < len(fresh) < 25
+
+    offline = PriceStore(root=str(tmp_path), provider=Offline(), ttl=0).get('AAA', '6mo', '1d')
+    assert offline.index[-1] == pd.Timestamp('2024-06-28')
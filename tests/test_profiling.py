@@ -0,0 +1,42 @@
+import json
+
+from utils import profiling
+from utils.pipeline import fetch_page_data
+
+
+def test_disabled_profiling_records_nothing(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILING_ENABLED', False)
+    profiling.reset_totals()
+
+    @profiling.timed('work')
+    def work():
+        return 42
+
+    with profiling.timer('block'):
+        assert work() == 42
+    profiling.count('hits')
+    assert profiling.totals() == {'timers': {}, 'counters': {}}
+
+
+def test_trace_records_nested_spans_counters_and_workers(tmp_path, monkeypatch):
+    import utils.pipeline as pipeline
+    monkeypatch.setattr(profiling, 'PROFILING_ENABLED', False)
+    monkeypatch.setattr(pipeline, 'get_fundamentals', lambda t: {'beta': 1.0})
+    monkeypatch.setattr(pipeline, 'fetch_news_sentiment', lambda t, days: None)
+    log = tmp_path / 'traces.jsonl'
+
+    with profiling.trace('page', log_path=str(log), ticker='AAA') as active:
+        with profiling.timer('outer'):
+            with profiling.timer('inner'):
+                profiling.count('cache_hit', 2)
+        fetch_page_data('AAA', '1y', '1d', loader=lambda *a: None)
+    assert profiling.current_trace() is None
+
+    spans = {s['name']: s for s in active.to_dict()['spans']}
+    assert spans['inner']['depth'] == 1 and spans['outer']['depth'] == 0
+    assert {'page_data.prices', 'page_data.news', 'page_data.fundamentals'} <= set(spans)
+    assert active.counters['cache_hit'] == 2
+
+    record = json.loads(log.read_text().strip())
+    assert record['label'] == 'page' and record['meta'] == {'ticker': 'AAA'}
+    assert record['counters'] == {'cache_hit': 2}
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from utils import scanner
+from utils.scanner import analyze_ticker, rank_results, scan_tickers, summarize_timings
+
+
+def fake_loader(ticker, period, interval):
+    if ticker == 'MISSING':
+        return pd.DataFrame()
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 260)))
+    return pd.DataFrame({'Close': close}, index=pd.date_range('2024-01-01', periods=260))
+
+
+def test_scan_ranks_and_times(model_cache_dir):
+    results = list(scan_tickers(['aapl', 'MSFT', 'MISSING'], workers=1, loader=fake_loader))
+    assert sorted(r['ticker'] for r in results) == ['AAPL', 'MISSING', 'MSFT']
+    # The workers' models land in the test's registry, not the real one
+    assert any(model_cache_dir.glob('AAPL_*'))
+
+    ranked = rank_results(results)
+    assert ranked[-1]['ticker'] == 'MISSING' and ranked[-1]['error'] == 'no data'
+    assert ranked[0]['score'] >= ranked[1]['score']
+
+    summary = summarize_timings(results, wall_time=1.0)
+    assert summary['tickers'] == 3 and summary['failed'] == 1
+    assert set(summary['stages']) == {'load', 'indicators', 'signals', 'forecast', 'score'}
+
+
+def test_missing_score_is_reported_as_an_error(model_cache_dir, monkeypatch):
+    monkeypatch.setattr(scanner, 'generate_complete_score', lambda **kwargs: None)
+    result = analyze_ticker('AAPL', model_type='arima', loader=fake_loader)
+    assert result['error'] == 'no score' and result['score'] is None
+    assert rank_results([result])[0] is result
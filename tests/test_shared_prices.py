@@ -0,0 +1,54 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+from utils import scanner
+from utils.forecast_v2 import create_lag_features
+from utils.scanner import scan_tickers
+from utils.shared_prices import SharedPrices
+
+
+def _frame(seed, n=260, start='2024-01-01'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.date_range(start, periods=n, freq='D', tz='America/New_York')
+    return pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                         'Volume': rng.integers(1_000, 2_000, n).astype(float)}, index=index)
+
+
+def test_frames_are_aligned_views_of_the_segment():
+    full, late = _frame(0), _frame(1, n=200, start='2024-03-01')
+    gappy = full.drop(full.index[10])
+    with SharedPrices.from_frames({'FULL': full, 'LATE': late, 'GAPPY': gappy}) as shared:
+        assert shared.values('Close').shape == (3, 260)
+        assert shared.index.equals(full.index)
+
+        frame = shared.frame('LATE')
+        pd.testing.assert_frame_equal(frame, late, check_freq=False)
+        assert np.shares_memory(frame.to_numpy(), shared.values())
+        assert not frame.to_numpy().flags.writeable
+        pd.testing.assert_frame_equal(shared.frame('GAPPY'), gappy, check_freq=False)
+
+        # Lag matrices over the shared series copy nothing
+        X, _ = create_lag_features(shared.prices('FULL'), nlags=5)
+        assert np.shares_memory(X, shared.values())
+
+        attached = pickle.loads(pickle.dumps(shared))
+        assert len(pickle.dumps(shared)) < 1_000
+        np.testing.assert_array_equal(attached.prices('LATE'), late['Close'].to_numpy())
+        assert attached.load('UNKNOWN').empty
+        attached.close()
+        del frame, X
+
+
+def test_scan_workers_read_the_shared_bars(model_cache_dir, monkeypatch):
+    frames = {'AAA': _frame(2), 'BBB': _frame(3)}
+    monkeypatch.setattr(scanner, 'load_many', lambda tickers, period, interval: frames)
+
+    results = list(scan_tickers(['AAA', 'BBB'], workers=1, model_type='arima'))
+    assert all(r['error'] is None for r in results)
+    local = {r['ticker']: r for r in scan_tickers(['AAA', 'BBB'], workers=0, model_type='arima',
+                                                  loader=lambda t, p, i: frames[t])}
+    for r in results:
+        assert r['price'] == local[r['ticker']]['price']
+        assert r['score'] == local[r['ticker']]['score']
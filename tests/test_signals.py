@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from utils.indicators import add_technical_indicators
+from utils.signals import (
+    BUY, HOLD, SELL, generate_signals, get_latest_signal, signal_categorical, universe_signals,
+)
+
+
+def _closes(tickers=4, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (tickers, n)), axis=1))
+
+
+def test_generate_signals_matches_rules():
+    close = pd.Series(_closes(1)[0], index=pd.date_range('2020-01-01', periods=400), name='Close')
+    df = add_technical_indicators(close.to_frame())
+    out = generate_signals(df)
+
+    expected = pd.Series('HOLD', index=df.index)
+    expected[(df['RSI_14'] < 30) & (df['Close'] > df['SMA_50'])] = 'BUY'
+    expected[(df['RSI_14'] > 70) | (df['Close'] < df['SMA_200'])] = 'SELL'
+    assert (out['Signal'] == expected).all()
+    assert get_latest_signal(out) == expected.iloc[-1]
+    assert 'Signal' not in df.columns
+
+
+def test_universe_signals_history_and_latest():
+    closes = _closes()
+    codes = universe_signals(closes)
+    assert codes.dtype == np.int8 and codes.shape == closes.shape
+    assert set(np.unique(codes)) <= {BUY, HOLD, SELL}
+
+    for row in range(len(closes)):
+        frame = pd.Series(closes[row], name='Close').to_frame()
+        labels = generate_signals(add_technical_indicators(frame))['Signal']
+        assert list(signal_categorical(codes[row])) == list(labels)
+
+    np.testing.assert_array_equal(universe_signals(closes, latest_only=True), codes[:, -1])
+    # Looser thresholds can only add signals
+    loose = universe_signals(closes, rsi_buy=45, rsi_sell=55)
+    assert (loose != HOLD).sum() >= (codes != HOLD).sum()
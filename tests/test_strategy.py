@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from utils import compute
+from utils.indicators import add_technical_indicators
+from utils.signals import generate_signals
+from utils.strategy import backtest_signals, backtest_strategy, positions_from_signals, sweep
+
+
+def _closes(n_tickers=6, n=800, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (n_tickers, n)), axis=1))
+
+
+def _loop_backtest(prices, codes, cost):
+    """Bar-by-bar reference: trade at the next close, pay cost on changes"""
+    equity, position, held, previous = [1.0], 0, 0, 0
+    for t in range(1, len(prices)):
+        held = position
+        step = held * (prices[t] / prices[t - 1] - 1) - cost * abs(held - previous)
+        equity.append(equity[-1] * (1 + step))
+        previous = held
+        if codes[t] == 1:
+            position = 1
+        elif codes[t] == -1:
+            position = 0
+    return np.array(equity)
+
+
+def test_positions_carry_the_last_signal():
+    codes = np.array([0, 1, 0, 0, -1, 0, 1, -1, 0], dtype=np.int8)
+    assert positions_from_signals(codes).tolist() == [0, 1, 1, 1, 0, 0, 1, 0, 0]
+    assert positions_from_signals(codes, allow_short=True).tolist() == [0, 1, 1, 1, -1, -1, 1, -1, -1]
+
+
+def test_backtest_matches_bar_by_bar_loop():
+    prices = pd.Series(_closes(1)[0], name='TEST')
+    df = generate_signals(add_technical_indicators(prices.to_frame('Close')), rsi_buy=50)
+    codes = np.select([df['Signal'] == 'BUY', df['Signal'] == 'SELL'], [1, -1], 0)
+
+    result = backtest_signals(prices, codes, cost_bps=5, slippage_bps=5)
+    np.testing.assert_allclose(result['equity'][0], _loop_backtest(prices.to_numpy(), codes, 0.001))
+    # Signals rebuilt from closes follow the same rules as generate_signals
+    rebuilt = backtest_strategy(prices, rsi_buy=50)
+    np.testing.assert_array_equal(rebuilt['positions'], result['positions'])
+
+    metrics = result['metrics'].loc['TEST']
+    assert metrics['trades'] > 0 and 0 <= metrics['hit_rate'] <= 1
+    assert -1 < metrics['max_drawdown'] <= 0
+
+
+def test_sweep_rows_match_single_backtests_and_skip_unlisted_bars():
+    closes = _closes()
+    closes[0, :300] = np.nan  # listed later than the others
+    frame = pd.DataFrame(closes.T, columns=[f"T{i}" for i in range(len(closes))])
+    results = sweep(frame, rsi_buy=(40, 50), rsi_sell=(70,), sma_fast=(20,), sma_slow=(100, 200))
+    assert len(results) == 4 * len(closes)
+
+    single = backtest_strategy(frame, rsi_buy=50, rsi_sell=70, sma_fast=20, sma_slow=200)
+    assert not single['positions'][0, :300].any()
+    row = results[(results.rsi_buy == 50) & (results.sma_slow == 200)].set_index('ticker')
+    pd.testing.assert_frame_equal(row[single['metrics'].columns], single['metrics'],
+                                  check_names=False)
+
+
+def test_late_listing_stats_start_at_the_first_price():
+    closes = _closes(1)[0]
+    codes = np.select([np.arange(len(closes)) % 40 == 5, np.arange(len(closes)) % 40 == 25], [1, -1], 0)
+    late, late_codes = closes.copy(), codes.copy()
+    late[:300], late_codes[:300] = np.nan, 0
+
+    listed = backtest_signals(closes[300:], codes[300:])['metrics'].iloc[0]
+    padded = backtest_signals(late, late_codes)['metrics'].iloc[0]
+    for metric in ('total_return', 'cagr', 'sharpe', 'exposure'):
+        assert np.isclose(padded[metric], listed[metric])
+
+
+def test_sweep_borrows_only_the_threads_it_uses(monkeypatch):
+    granted = []
+    real_slot = compute.compute_slot
+
+    def spy_slot(cores=None):
+        granted.append(cores)
+        return real_slot(cores)
+
+    monkeypatch.setattr(compute, 'TRAINING_CORES', 4)
+    monkeypatch.setattr('utils.strategy.compute_slot', spy_slot)
+    closes = _closes(2, n=300)
+    sweep(closes, rsi_buy=(30, 40, 50), rsi_sell=(70,), sma_fast=(20,), sma_slow=(100, 200))
+    sweep(closes, rsi_buy=(40,), rsi_sell=(70,), sma_fast=(20,), sma_slow=(100, 200))
+    assert granted == [4, 2]
@@ -0,0 +1,36 @@
+import numpy as np
+from utils.forecast_v2 import create_lag_features, lag_matrix, train_and_forecast, walk_forward
+from utils.model_registry import load_model, save_model
+from utils.tcn import TCNRegressor
+
+
+def _prices(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n)))
+
+
+def test_tcn_trains_with_early_stopping_and_batched_predict():
+    X, y = create_lag_features(_prices(), nlags=10)
+    model = TCNRegressor(epochs=300, patience=5).fit(X, y)
+    assert 0 < model.epochs_run_ < 300
+    preds = model.predict(X)
+    assert preds.shape == y.shape
+    np.testing.assert_allclose(model.predict(X[-1]), preds[-1:])
+    # Relative-price targets: errors stay on the scale of daily moves
+    assert np.mean(np.abs(preds / y - 1)) < 0.05
+
+    X2, Y2 = lag_matrix(_prices(), nlags=10, horizons=(1, 2, 3))
+    assert TCNRegressor(epochs=5).fit(X2, Y2).predict(X2[:4]).shape == (4, 3)
+
+
+def test_tcn_warm_refit_and_registry_roundtrip(tmp_path):
+    X, y = create_lag_features(_prices(), nlags=10)
+    model, metrics = walk_forward(X, y, model_type='tcn', refit='warm')
+    assert isinstance(model, TCNRegressor) and metrics['rmse'] > 0
+
+    save_model('tcn-test', {'model': model}, cache_dir=str(tmp_path))
+    loaded = load_model('tcn-test', cache_dir=str(tmp_path))['model']
+    np.testing.assert_allclose(loaded.predict(X[-20:]), model.predict(X[-20:]))
+
+    _, forecast, _ = train_and_forecast(_prices(), days=5, model_type='lstm')
+    assert len(forecast) == 5 and np.all(forecast > 0)
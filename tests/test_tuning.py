@@ -0,0 +1,42 @@
+import numpy as np
+from utils.forecast_v2 import backtest_model, create_lag_features
+from utils.tuning import best_configs, config_grid, leaderboard, random_configs, tune, write_leaderboard
+
+
+def _prices(seed, n=300):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def test_configs_share_rows_of_the_widest_lag_matrix(tmp_path):
+    prices = {'AAA': _prices(0), 'BBB': _prices(1)}
+    configs = config_grid(model_type=('arima', 'rf'), nlags=(5, 12), test_size=(0.2,))
+    results = tune(prices, configs, workers=0, cache_dir=str(tmp_path))
+    assert len(results) == 8 and results['error'].isna().all()
+    # Every config is scored on the same rows
+    assert results['train_size'].nunique() == 1
+
+    X, y = create_lag_features(prices['AAA'], nlags=12)
+    expected = backtest_model(X[:, 7:], y, nlags=5, test_size=0.2, model_type='arima')
+    row = results[(results.ticker == 'AAA') & (results.model_type == 'arima') & (results.nlags == 5)]
+    assert row['rmse'].item() == expected['rmse']
+
+
+def test_results_are_cached_and_ranked(tmp_path):
+    prices = {'AAA': _prices(0)}
+    configs = random_configs(4, model_type=('arima',), nlags=(5, 15), test_size=(0.1, 0.3), seed=1)
+    assert len({tuple(c.values()) for c in configs}) == 4
+
+    first = tune(prices, configs, workers=0, cache_dir=str(tmp_path))
+    again = tune(prices, configs, workers=0, cache_dir=str(tmp_path))
+    assert not first['cached'].any() and again['cached'].all()
+    assert sorted(again['rmse']) == sorted(first['rmse'])
+
+    board = leaderboard(again, 'direction_accuracy')
+    assert board['rank'].tolist() == [1, 2, 3, 4]
+    assert board['direction_accuracy'].is_monotonic_decreasing
+    best = best_configs(again)['AAA']
+    assert best['rmse'] == again['rmse'].min()
+
+    write_leaderboard(again, str(tmp_path / 'board.csv'))
+    assert (tmp_path / 'board.csv').exists() and (tmp_path / 'board.best.json').exists()
@@ -0,0 +1,90 @@
+"""
+Headless forecast-settings search
+
+Examples:
+    python tune.py AAPL MSFT --models rf hgb arima --nlags 5 10 20 30
+    python tune.py --file watchlist.txt --random 40 --out leaderboard.csv
+"""
+
+import argparse
+import time
+
+from utils.data import load_many
+from utils.tuning import HIGHER_IS_BETTER, config_grid, random_configs, tune, write_leaderboard
+
+
+def _read_tickers(args):
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as fh:
+            for line in fh:
+                tickers.extend(line.replace(',', ' ').split())
+    return list(dict.fromkeys(t.upper().strip() for t in tickers if t.strip()))
+
+
+def _closes(frames):
+    closes = {}
+    for ticker, df in frames.items():
+        if df is None or df.empty:
+            continue
+        close = df['Close'].squeeze()
+        if hasattr(close, 'columns'):
+            close = close.iloc[:, 0]
+        closes[ticker] = close.ffill().dropna().to_numpy()
+    return closes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search nlags / test_size / model_type per ticker")
+    parser.add_argument('tickers', nargs='*', help="Ticker symbols")
+    parser.add_argument('--file', help="File with ticker symbols (whitespace or comma separated)")
+    parser.add_argument('--period', default='1y')
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--models', nargs='+', default=['rf', 'hgb', 'arima'])
+    parser.add_argument('--nlags', nargs='+', type=int, default=[5, 10, 20, 30])
+    parser.add_argument('--test-sizes', nargs='+', type=float, default=[0.1, 0.2, 0.3])
+    parser.add_argument('--random', type=int, default=0,
+                        help="Sample this many configs instead of the full grid (ranges from --nlags/--test-sizes)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--metric', default='rmse', choices=sorted(HIGHER_IS_BETTER))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores, 0: no pool)")
+    parser.add_argument('--refresh', action='store_true', help="Ignore cached results")
+    parser.add_argument('--out', default='leaderboard.csv', help="Leaderboard CSV (best configs go next to it)")
+    args = parser.parse_args(argv)
+
+    tickers = _read_tickers(args)
+    if not tickers:
+        parser.error("no tickers given")
+
+    if args.random:
+        configs = random_configs(
+            args.random, model_type=args.models, nlags=(min(args.nlags), max(args.nlags)),
+            test_size=(min(args.test_sizes), max(args.test_sizes)), seed=args.seed
+        )
+    else:
+        configs = config_grid(model_type=args.models, nlags=args.nlags, test_size=args.test_sizes)
+
+    closes = _closes(load_many(tickers, args.period, args.interval))
+    missing = sorted(set(tickers) - set(closes))
+    if missing:
+        print(f"No data (skipped): {', '.join(missing)}")
+
+    start = time.perf_counter()
+    results = tune(closes, configs, workers=args.workers, period=args.period, interval=args.interval,
+                   refresh=args.refresh)
+    wall = time.perf_counter() - start
+
+    board = write_leaderboard(results, args.out, metric=args.metric)
+    print(f"\n{'ticker':<8} {'model':<6} {'nlags':>5} {'test':>5} {args.metric:>10}")
+    for _, row in board[board['rank'] == 1].iterrows():
+        print(f"{row['ticker']:<8} {row['model_type']:<6} {row['nlags']:>5} {row['test_size']:>5.2f} "
+              f"{row[args.metric]:>10.4f}")
+
+    failed = results['error'].notna().sum()
+    cached = int(results['cached'].sum())
+    print(f"\n{len(results)} results ({cached} cached, {failed} failed) for {len(closes)} tickers x "
+          f"{len(configs)} configs in {wall:.1f}s -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+NumPy ARIMA(p, d, q) engine
+
+Fits on log prices with the Hannan-Rissanen two-stage least-squares
+method: a long autoregression estimates the innovations, then one
+regression of the differenced series on its own lags and the lagged
+innovations gives the AR/MA coefficients. The order is picked by AIC from
+a small grid unless given. Fitting is a handful of lstsq calls, so a
+model takes milliseconds instead of the seconds an iterative likelihood
+optimiser needs.
+
+Forecasts and prediction intervals are closed-form: the mean follows the
+ARMA recursion with future shocks set to zero, and the variance comes from
+the psi-weights of the integrated process.
+
+ArimaModel also implements fit/predict on lag-feature rows, so it drops
+into the same backtest and registry paths as the sklearn models.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+from scipy.stats import norm
+
+# Orders searched when none is given (d is fixed by the model)
+AR_ORDERS = (0, 1, 2, 3)
+MA_ORDERS = (0, 1, 2)
+
+
+def _difference(z, d):
+    """Differenced series plus the last value of every intermediate level"""
+    tails = []
+    for _ in range(d):
+        tails.append(z[..., -1:])
+        z = np.diff(z, axis=-1)
+    return z, tails
+
+
+def _integrate(w_hat, tails):
+    """Undo _difference on forecasts of the differenced series"""
+    for tail in reversed(tails):
+        w_hat = tail + np.cumsum(w_hat, axis=-1)
+    return w_hat
+
+
+def _lagged(w, lags):
+    """Rows [w[t-1], ..., w[t-lags]] for t = lags .. len(w)-1"""
+    windows = np.lib.stride_tricks.sliding_window_view(w, lags)[:-1]
+    return windows[:, ::-1]
+
+
+def _residuals(w, const, phi, theta):
+    """Innovations of an ARMA model along the last axis (zero before the first p values)"""
+    p, T = len(phi), w.shape[-1]
+    u = w - const
+    for i in range(1, p + 1):
+        u[..., p:] -= phi[i - 1] * w[..., p - i:T - i]
+    u[..., :p] = 0.0
+    if len(theta):
+        return lfilter([1.0], np.r_[1.0, theta], u, axis=-1)
+    return u
+
+
+def _hannan_rissanen(w, p, q):
+    """
+    Two-stage least-squares ARMA(p, q) estimate
+
+    Returns:
+        Tuple: (const, phi, theta, sigma2, aic), or None if w is too short
+    """
+    n = len(w)
+    long_ar = max(p + q, min(20, n // 10)) if q else 0
+    start = max(p, q) + long_ar
+    if n - start < max(10, 2 * (p + q + 1)):
+        return None
+
+    columns = [np.ones(n - start)]
+    if p:
+        columns.append(_lagged(w, p)[start - p:])
+    if q:
+        # Stage 1: innovations from a long autoregression
+        A = np.column_stack([np.ones(n - long_ar), _lagged(w, long_ar)])
+        coef, *_ = np.linalg.lstsq(A, w[long_ar:], rcond=None)
+        e = np.zeros(n)
+        e[long_ar:] = w[long_ar:] - A @ coef
+        columns.append(_lagged(e, q)[start - q:])
+
+    # Stage 2: regress on own lags and lagged innovations
+    design = np.column_stack(columns)
+    coef, *_ = np.linalg.lstsq(design, w[start:], rcond=None)
+    const, phi, theta = coef[0], coef[1:1 + p], coef[1 + p:]
+
+    # Keep the MA part invertible so the residual filter is stable
+    if q and np.any(np.abs(np.roots(np.r_[1.0, theta])) >= 1.0):
+        return None
+
+    resid = _residuals(w, const, phi, theta)[start:]
+    sigma2 = float(np.mean(resid ** 2))
+    aic = len(resid) * np.log(max(sigma2, 1e-300)) + 2 * (p + q + 1)
+    return const, phi, theta, sigma2, aic
+
+
+def psi_weights(phi, theta, steps, d=0):
+    """MA(infinity) weights of an ARIMA process, integrated d times"""
+    psi = np.zeros(steps)
+    psi[0] = 1.0
+    for j in range(1, steps):
+        value = theta[j - 1] if j <= len(theta) else 0.0
+        for i in range(1, min(j, len(phi)) + 1):
+            value += phi[i - 1] * psi[j - i]
+        psi[j] = value
+    for _ in range(d):
+        psi = np.cumsum(psi)
+    return psi
+
+
+class ArimaModel:
+    """
+    ARIMA(p, d, q) on log prices
+
+    Args:
+        order: (p, d, q), or None to select p and q by AIC
+        d: Differencing order used when order is None
+        horizon: Steps ahead predicted by predict() for 1-D targets
+            (lag rows built by create_lag_features use LAG_TARGET_HORIZON)
+        log: Model log prices (falls back to levels if any price <= 0)
+    """
+
+    def __init__(self, order=None, d=1, horizon=1, log=True):
+        self.order = order
+        self.d = order[1] if order is not None else d
+        self.horizon = horizon
+        self.log = log
+
+    # ------------------------------------------------------------------
+    # Fitting
+
+    def fit_series(self, prices):
+        """Fit on a 1-D price history"""
+        prices = np.asarray(prices, dtype=np.float64).reshape(-1)
+        self.log_ = bool(self.log and np.all(prices > 0))
+        z = np.log(prices) if self.log_ else prices
+        w, _ = _difference(z, self.d)
+
+        if self.order is not None:
+            candidates = [(self.order[0], self.order[2])]
+        else:
+            candidates = [(p, q) for p in AR_ORDERS for q in MA_ORDERS]
+
+        best = None
+        for p, q in candidates:
+            fitted = _hannan_rissanen(w, p, q)
+            if fitted is not None and (best is None or fitted[4] < best[1][4]):
+                best = ((p, q), fitted)
+        if best is None:
+            # Too little data for any ARMA term: random walk with drift
+            best = ((0, 0), (float(np.mean(w)) if len(w) else 0.0, np.zeros(0), np.zeros(0),
+                             float(np.var(w)) if len(w) else 0.0, np.nan))
+
+        (p, q), (const, phi, theta, sigma2, aic) = best
+        self.order_ = (p, self.d, q)
+        self.const_, self.phi_, self.theta_ = float(const), phi, theta
+        self.sigma2_, self.aic_ = sigma2, aic
+        return self
+
+    def fit(self, X, y):
+        """
+        Fit on lag-feature rows (consecutive windows of one series)
+
+        Args:
+            X: (n_rows, nlags) lag matrix, row i = prices[i:i+nlags]
+            y: Targets `horizon` bars after each row's last lag, or a
+               (n_rows, H) matrix of horizons 1..H
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(X) > 1 and not np.array_equal(X[1:, :-1], X[:-1, 1:]):
+            raise ValueError("ArimaModel.fit expects consecutive lag windows of one series")
+
+        if y.ndim == 2:
+            self.horizons_ = np.arange(1, y.shape[1] + 1)
+            tail = y[-1]
+        else:
+            self.horizons_ = None
+            tail = y[-self.horizon:]
+        return self.fit_series(np.concatenate([X[0], X[1:, -1], tail]))
+
+    # ------------------------------------------------------------------
+    # Forecasting
+
+    def _transform(self, values):
+        return np.log(values) if self.log_ else values
+
+    def _inverse(self, values):
+        return np.exp(values) if self.log_ else values
+
+    def _forecast_diff(self, w, steps):
+        """Mean forecasts of the differenced rows w (n, T) for 1..steps"""
+        p, q = len(self.phi_), len(self.theta_)
+        n, T = w.shape
+
+        # Innovations over each window, starting from zero shocks
+        e = np.zeros((n, T + steps))
+        e[:, :T] = _residuals(w, self.const_, self.phi_, self.theta_)
+
+        path = np.concatenate([w, np.zeros((n, steps))], axis=1)
+        for h in range(steps):
+            t = T + h
+            value = np.full(n, self.const_)
+            for i in range(1, p + 1):
+                if t - i >= 0:
+                    value += self.phi_[i - 1] * path[:, t - i]
+            for j in range(h + 1, q + 1):
+                if t - j >= 0:
+                    value += self.theta_[j - 1] * e[:, t - j]
+            path[:, t] = value
+        return path[:, T:]
+
+    def _forecast_rows(self, rows, steps):
+        z = self._transform(np.asarray(rows, dtype=np.float64))
+        w, tails = _difference(z, self.d)
+        return _integrate(self._forecast_diff(w, steps), tails)
+
+    def predict(self, X):
+        """Forecast from each lag row: `horizon` steps ahead, or 1..H for 2-D fits"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if self.horizons_ is not None:
+            return self._inverse(self._forecast_rows(X, len(self.horizons_)))
+        return self._inverse(self._forecast_rows(X, self.horizon)[:, -1])
+
+    def forecast(self, history, steps):
+        """Mean path for the next `steps` bars, conditioned on the whole history"""
+        return self.forecast_interval(history, steps)[0]
+
+    def forecast_interval(self, history, steps, level=0.95):
+        """
+        Closed-form forecasts with prediction intervals
+
+        Args:
+            history: 1-D price history (the more, the better the innovations)
+            steps: Number of bars to forecast
+            level: Coverage of the interval
+
+        Returns:
+            Tuple of arrays: (forecast, lower, upper)
+        """
+        history = np.asarray(history, dtype=np.float64).reshape(1, -1)
+        mean = self._forecast_rows(history, steps)[0]
+        psi = psi_weights(self.phi_, self.theta_, steps, d=self.d)
+        spread = norm.ppf(0.5 + level / 2) * np.sqrt(self.sigma2_ * np.cumsum(psi ** 2))
+        return self._inverse(mean), self._inverse(mean - spread), self._inverse(mean + spread)
@@ -0,0 +1,339 @@
+"""
+Columnar batch scoring for whole universes
+
+Scores many tickers at once from a DataFrame of inputs (one row per
+ticker) with vectorized thresholds, instead of building the nested dicts
+of utils.scoring for every ticker. Component scores, the overall score and
+the recommendation match generate_complete_score; the human-readable
+reasoning is only built on demand by explain() for the rows being shown.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.scoring import generate_complete_score
+
+# Latest-bar indicator fields read by calculate_technical_score
+TECHNICAL_FIELDS = ['Close', 'RSI', 'SMA_50', 'SMA_200', 'MACD', 'MACD_Signal', 'BB_High', 'BB_Low']
+FUNDAMENTAL_FIELDS = ['trailingPE', 'beta', 'dividendYield', 'marketCap']
+FORECAST_FIELDS = ['direction_accuracy', 'mae', 'rmse', 'test_periods', 'forecast_spread']
+SENTIMENT_FIELDS = ['daily_sentiment', 'article_count']
+
+# Presence flags; a False row scores like an empty input to utils.scoring
+PRESENCE_FLAGS = {
+    'technical': 'has_indicators',
+    'fundamental': 'has_fundamentals',
+    'forecast': 'has_backtest',
+    'sentiment': 'has_sentiment',
+}
+
+TECHNICAL_WEIGHTS = {'RSI': 0.30, 'SMA50': 0.25, 'SMA200': 0.25, 'MACD': 0.15, 'Bollinger': 0.05}
+FUNDAMENTAL_WEIGHTS = {'P/E': 0.35, 'Beta': 0.25, 'Dividend': 0.20, 'Market Cap': 0.20}
+FORECAST_WEIGHTS = {'Direction Accuracy': 0.40, 'Prediction Accuracy': 0.30, 'Sample Size': 0.10,
+                    'Forecast Spread': 0.20}
+SENTIMENT_WEIGHTS = {'Overall': 0.50, 'Articles': 0.25, 'Trend': 0.25}
+OVERALL_WEIGHTS = {'technical': 0.30, 'fundamental': 0.25, 'forecast': 0.25, 'sentiment': 0.20}
+
+RECOMMENDATIONS = ['STRONG SELL', 'SELL', 'HOLD', 'BUY', 'STRONG BUY']
+LEVELS = ['LOW', 'MEDIUM', 'HIGH']
+SENTIMENT_LABELS = ['NEGATIVE', 'NEUTRAL', 'POSITIVE']
+
+
+def _tiers(conditions, scores, default):
+    """First matching tier wins, like the if/elif chains in utils.scoring"""
+    return np.select(conditions, scores, default=default).astype(float)
+
+
+def _field(frame, name):
+    """Float column, or None when the frame does not carry the field"""
+    if name not in frame.columns:
+        return None
+    return pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=float)
+
+
+def _present(values):
+    """Truthy like `if fundamentals[key]`: missing, NaN and 0 count as absent"""
+    return ~np.isnan(values) & (values != 0)
+
+
+def _flag(frame, component):
+    name = PRESENCE_FLAGS[component]
+    if name not in frame.columns:
+        return np.ones(len(frame), dtype=bool)
+    return frame[name].fillna(False).to_numpy(dtype=bool)
+
+
+def _technical_components(frame):
+    n = len(frame)
+    close = _field(frame, 'Close')
+    comps = {}
+
+    rsi = _field(frame, 'RSI')
+    if rsi is None:
+        comps['RSI'] = np.full(n, 5.0)
+    else:
+        comps['RSI'] = _tiers([rsi < 30, rsi > 70, rsi < 50], [8.0, 2.0, 6.0], 5.0)
+
+    for label, column, band, (high, low) in (('SMA50', 'SMA_50', 5, (7.0, 3.0)),
+                                             ('SMA200', 'SMA_200', 10, (7.5, 2.5))):
+        sma = _field(frame, column)
+        if sma is None or close is None:
+            comps[label] = np.full(n, 5.0)
+            continue
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = (close - sma) / sma * 100
+        comps[label] = np.where(sma > 0, _tiers([pct > band, pct < -band], [high, low], 5.0), 5.0)
+
+    macd, signal = _field(frame, 'MACD'), _field(frame, 'MACD_Signal')
+    if macd is None or signal is None:
+        comps['MACD'] = np.full(n, 5.0)
+    else:
+        comps['MACD'] = np.where(macd > signal, 6.5, 3.5)
+
+    high, low = _field(frame, 'BB_High'), _field(frame, 'BB_Low')
+    if high is None or low is None or close is None:
+        comps['Bollinger'] = np.full(n, 5.0)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = (close - low) / (high - low)
+        comps['Bollinger'] = np.where(
+            high > low, _tiers([position > 0.8, position < 0.2], [3.0, 7.0], 5.0), 5.0
+        )
+    return comps
+
+
+def _fundamental_components(frame):
+    n = len(frame)
+    comps = {}
+    tiers = {
+        'P/E': ('trailingPE', lambda v: [v < 15, v < 20, v < 30], [8.0, 7.0, 5.0], 3.0, 5.0),
+        'Beta': ('beta', lambda v: [v < 0.8, v < 1.2, v < 1.5], [8.0, 7.0, 5.0], 3.0, 5.0),
+        'Dividend': ('dividendYield', lambda v: [v * 100 > 4, v * 100 > 2, v * 100 > 0],
+                     [8.0, 7.0, 5.0], 4.0, 4.0),
+        'Market Cap': ('marketCap', lambda v: [v > 1e11, v > 1e10, v > 1e9],
+                       [8.0, 7.0, 5.0], 3.0, 5.0),
+    }
+    for label, (column, conditions, scores, fallthrough, missing) in tiers.items():
+        values = _field(frame, column)
+        if values is None:
+            comps[label] = np.full(n, missing)
+            continue
+        scored = _tiers(conditions(values), scores, fallthrough)
+        comps[label] = np.where(_present(values), scored, missing)
+    return comps
+
+
+def _forecast_components(frame):
+    n = len(frame)
+    comps = {}
+
+    acc = _field(frame, 'direction_accuracy')
+    if acc is None:
+        comps['Direction Accuracy'] = np.full(n, 4.0)
+    else:
+        scored = _tiers([acc > 0.65, acc > 0.55, acc > 0.50], [8.0, 6.0, 4.0], 2.0)
+        comps['Direction Accuracy'] = np.where(np.isnan(acc), 4.0, scored)
+
+    mae, rmse = _field(frame, 'mae'), _field(frame, 'rmse')
+    if mae is None or rmse is None:
+        comps['Prediction Accuracy'] = np.full(n, 5.0)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mae_pct = mae / rmse * 100
+        scored = _tiers([mae_pct < 2, mae_pct < 5, mae_pct < 10], [8.0, 6.5, 5.0], 3.0)
+        comps['Prediction Accuracy'] = np.where(rmse > 0, scored, 5.0)
+
+    periods = _field(frame, 'test_periods')
+    if periods is None:
+        comps['Sample Size'] = np.full(n, 5.0)
+    else:
+        periods_int = np.trunc(periods)
+        scored = _tiers([periods_int > 50, periods_int > 20, periods_int > 10], [8.0, 7.0, 5.0], 3.0)
+        comps['Sample Size'] = np.where(np.isnan(periods), 5.0, scored)
+
+    spread = _field(frame, 'forecast_spread')
+    if spread is None:
+        comps['Forecast Spread'] = np.full(n, 5.0)
+    else:
+        scored = _tiers([spread < 0.01, spread < 0.02, spread < 0.035], [8.0, 6.5, 5.0], 3.0)
+        comps['Forecast Spread'] = np.where(np.isnan(spread), 5.0, scored)
+    return comps
+
+
+def _sentiment_components(frame):
+    n = len(frame)
+    daily = _field(frame, 'daily_sentiment')
+    daily = np.zeros(n) if daily is None else np.nan_to_num(daily)
+    articles = _field(frame, 'article_count')
+    articles = np.zeros(n) if articles is None else np.nan_to_num(articles)
+    return {
+        'Overall': _tiers([daily > 0.3, daily > 0.1, daily > -0.1, daily > -0.3],
+                          [8.0, 6.5, 5.0, 3.5], 2.0),
+        'Articles': _tiers([articles > 5, articles > 2, articles > 0], [6.0, 5.0, 4.0], 3.0),
+        'Trend': np.full(n, 5.0),
+    }
+
+
+def _weighted(components, weights):
+    return sum(components[name] * weight for name, weight in weights.items())
+
+
+def score_batch(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score every row of a universe in one vectorized pass
+
+    Args:
+        frame: One row per ticker (index = ticker) with any of
+            TECHNICAL_FIELDS (latest bar), FUNDAMENTAL_FIELDS,
+            FORECAST_FIELDS and SENTIMENT_FIELDS, plus optional
+            PRESENCE_FLAGS columns. Fields that are absent score like
+            the per-ticker functions do when the input lacks them.
+
+    Returns:
+        DataFrame with component scores, overall_score, recommendation,
+        risk_level, confidence and sentiment (categoricals), same index
+    """
+    parts = {
+        'technical': (_technical_components(frame), TECHNICAL_WEIGHTS),
+        'fundamental': (_fundamental_components(frame), FUNDAMENTAL_WEIGHTS),
+        'forecast': (_forecast_components(frame), FORECAST_WEIGHTS),
+        'sentiment': (_sentiment_components(frame), SENTIMENT_WEIGHTS),
+    }
+
+    out = {}
+    for component, (comps, weights) in parts.items():
+        out[f'{component}_score'] = np.where(_flag(frame, component), _weighted(comps, weights), 5.0)
+
+    overall = sum(out[f'{c}_score'] * w for c, w in OVERALL_WEIGHTS.items())
+    out['overall_score'] = overall
+
+    rec = np.select([overall >= 7.5, overall >= 6.5, overall >= 5.5, overall >= 4.5],
+                    [4, 3, 2, 1], default=0)
+    out['recommendation'] = pd.Categorical.from_codes(rec, categories=RECOMMENDATIONS)
+    risk = np.select([overall > 7, overall > 5], [0, 1], default=2)
+    out['risk_level'] = pd.Categorical.from_codes(risk, categories=LEVELS)
+
+    forecast = out['forecast_score']
+    confidence = np.select([forecast >= 7, forecast >= 5], [2, 1], default=0)
+    confidence = np.where(_flag(frame, 'forecast'), confidence, 1)
+    out['confidence'] = pd.Categorical.from_codes(confidence, categories=LEVELS)
+
+    daily = parts['sentiment'][0]['Overall']
+    sentiment = np.where(daily >= 6.5, 2, np.where(daily >= 5.0, 1, 0))
+    sentiment = np.where(_flag(frame, 'sentiment'), sentiment, 1)
+    out['sentiment'] = pd.Categorical.from_codes(sentiment, categories=SENTIMENT_LABELS)
+
+    return pd.DataFrame(out, index=frame.index)
+
+
+def build_score_frame(tickers, indicators=None, fundamentals=None, backtests=None, sentiments=None):
+    """
+    Assemble the score_batch input from per-ticker objects
+
+    Args:
+        tickers: Ticker symbols (becomes the index)
+        indicators: Per ticker, an indicators DataFrame (last row is used)
+            or a dict of latest values
+        fundamentals: Per ticker, a get_fundamentals() dict
+        backtests: Per ticker, a backtest metrics dict
+        sentiments: Per ticker, an aggregate_sentiment_features() dict
+
+    Returns:
+        DataFrame ready for score_batch
+    """
+    tickers = list(tickers)
+    n = len(tickers)
+    indicators = indicators if indicators is not None else [None] * n
+    fundamentals = fundamentals if fundamentals is not None else [None] * n
+    backtests = backtests if backtests is not None else [None] * n
+    sentiments = sentiments if sentiments is not None else [None] * n
+
+    rows = []
+    for ind, fund, bt, sent in zip(indicators, fundamentals, backtests, sentiments):
+        row = {}
+        if isinstance(ind, pd.DataFrame):
+            row['has_indicators'] = not ind.empty
+            if not ind.empty:
+                for name in TECHNICAL_FIELDS:
+                    if name in ind.columns:
+                        value = ind[name].iloc[-1]
+                        row[name] = value.iloc[0] if isinstance(value, pd.Series) else value
+        else:
+            row['has_indicators'] = bool(ind)
+            row.update({k: v for k, v in (ind or {}).items() if k in TECHNICAL_FIELDS})
+
+        row['has_fundamentals'] = bool(fund)
+        row.update({k: (fund or {}).get(k) for k in FUNDAMENTAL_FIELDS})
+
+        row['has_backtest'] = bool(bt)
+        row.update({k: v for k, v in (bt or {}).items() if k in FORECAST_FIELDS})
+
+        row['has_sentiment'] = bool(sent)
+        if sent:
+            daily = sent.get('daily_sentiment', 0)
+            if isinstance(daily, (list, np.ndarray)):
+                daily = daily[0] if len(daily) > 0 else 0
+            row['daily_sentiment'] = daily
+            row['article_count'] = len(sent.get('recent_articles') or [])
+        rows.append(row)
+
+    frame = pd.DataFrame(rows, index=pd.Index(tickers, name='ticker'))
+    for name in TECHNICAL_FIELDS + FUNDAMENTAL_FIELDS + FORECAST_FIELDS + SENTIMENT_FIELDS:
+        if name in frame.columns:
+            frame[name] = pd.to_numeric(frame[name], errors='coerce')
+    return frame
+
+
+def _row_inputs(row):
+    """Rebuild per-ticker scoring inputs from one score_batch input row"""
+    def value(name):
+        v = row.get(name)
+        return None if v is None or pd.isna(v) else v
+
+    def flag(component):
+        v = row.get(PRESENCE_FLAGS[component], True)
+        return True if pd.isna(v) else bool(v)
+
+    technical = {k: [row[k]] for k in TECHNICAL_FIELDS if k in row.index}
+    indicators_df = pd.DataFrame(technical if flag('technical') else {})
+    if flag('technical') and indicators_df.empty:
+        indicators_df = pd.DataFrame({'_': [np.nan]})
+
+    fundamentals = {k: value(k) for k in FUNDAMENTAL_FIELDS} if flag('fundamental') else {}
+    backtest = {k: value(k) for k in FORECAST_FIELDS if value(k) is not None} if flag('forecast') else {}
+    sentiment = {}
+    if flag('sentiment'):
+        sentiment = {
+            'daily_sentiment': value('daily_sentiment') or 0,
+            'recent_articles': [None] * int(value('article_count') or 0),
+        }
+    return indicators_df, fundamentals, backtest, sentiment
+
+
+def explain(frame: pd.DataFrame, tickers=None, sentiments=None) -> dict:
+    """
+    Full per-ticker score breakdowns, built only for the requested rows
+
+    Args:
+        frame: score_batch input frame
+        tickers: Rows to explain (defaults to all of them)
+        sentiments: Optional ticker -> sentiment dict, so the breakdown
+            carries the actual articles rather than just their count
+
+    Returns:
+        Dict of ticker -> generate_complete_score() result
+    """
+    tickers = list(frame.index if tickers is None else tickers)
+    explained = {}
+    for ticker in tickers:
+        row = frame.loc[ticker]
+        indicators_df, fundamentals, backtest, sentiment = _row_inputs(row)
+        if sentiments and ticker in sentiments:
+            sentiment = sentiments[ticker]
+        close = row.get('Close')
+        explained[ticker] = generate_complete_score(
+            ticker=ticker, indicators_df=indicators_df,
+            current_price=None if close is None or pd.isna(close) else float(close),
+            fundamentals=fundamentals, backtest_metrics=backtest, sentiment_data=sentiment
+        )
+    return explained
@@ -0,0 +1,148 @@
+"""
+Process-wide core budget for model training
+
+Every Streamlit session runs in a thread of the same process, so letting
+each RandomForest fit use n_jobs=-1 would start cores x sessions threads.
+Instead fits borrow cores from one shared budget:
+
+    with compute_slot() as cores:      # blocks only while no core is free
+        model.set_params(n_jobs=cores)
+        model.fit(X, y)
+
+A session asks for SESSION_CORES and gets as many as are free (at least
+one), and the budget never hands out more than TRAINING_CORES in total.
+Inside the slot the calling thread's OpenMP pool is capped to the granted
+count as well, so boosters cannot oversubscribe either. OpenMP limits are
+per thread, so concurrent sessions do not override each other's caps;
+BLAS limits are process-wide and are left alone for that reason (the tree
+models here make almost no BLAS calls).
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from threadpoolctl import ThreadpoolController
+
+from utils.profiling import count
+
+# Cores one session may use for a fit
+SESSION_CORES = max(1, int(os.getenv('SESSION_CORES', '1')))
+# Cores shared by all sessions of this process
+TRAINING_CORES = max(1, int(os.getenv('TRAINING_CORES', str(os.cpu_count() or 1))))
+
+# Estimator attributes that set a fit's parallelism (sklearn, HGBRegressor)
+PARALLEL_PARAMS = ('n_jobs', 'threads')
+
+_budget = threading.Condition()
+_in_use = 0
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def configure(session_cores=None, training_cores=None):
+    """
+    Override the per-session and process-wide core counts
+
+    Used by scanner worker processes, which are already one per core and
+    train single-threaded.
+    """
+    global SESSION_CORES, TRAINING_CORES
+    with _budget:
+        if session_cores is not None:
+            SESSION_CORES = max(1, int(session_cores))
+        if training_cores is not None:
+            TRAINING_CORES = max(1, int(training_cores))
+        _budget.notify_all()
+
+
+def cores_in_use():
+    """Cores currently lent out to running fits"""
+    with _budget:
+        return _in_use
+
+
+def _thread_controller():
+    # Inspecting the loaded libraries takes ~10 ms, so do it once; by the
+    # first fit sklearn has loaded its OpenMP runtime
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = ThreadpoolController()
+        return _controller
+
+
+def limit_threads(n, user_api=None):
+    """Cap native thread pools ('openmp', 'blas' or all) to n threads"""
+    return _thread_controller().limit(limits=n, user_api=user_api)
+
+
+def _acquire(wanted):
+    global _in_use
+    with _budget:
+        while TRAINING_CORES - _in_use < 1:
+            count('compute.wait')
+            _budget.wait()
+        granted = min(wanted, TRAINING_CORES - _in_use)
+        _in_use += granted
+        return granted
+
+
+def _release(granted):
+    global _in_use
+    with _budget:
+        _in_use -= granted
+        _budget.notify_all()
+
+
+@contextmanager
+def compute_slot(cores=None):
+    """
+    Borrow cores from the process budget for one fit
+
+    Args:
+        cores: Cores wanted (defaults to SESSION_CORES)
+
+    Yields:
+        Number of cores granted (1 <= granted <= wanted)
+    """
+    granted = _acquire(max(1, cores or SESSION_CORES))
+    count('compute.cores', granted)
+    try:
+        with limit_threads(granted, user_api='openmp'):
+            yield granted
+    finally:
+        _release(granted)
+
+
+def budgeted_fit(model, X, y, cores=None, fit=None):
+    """
+    Fit model inside a compute slot using the granted cores
+
+    The model's parallelism attribute (n_jobs or threads) is raised for the
+    fit and restored afterwards, so later predict calls, which are small
+    and frequent, stay single-threaded.
+
+    Args:
+        model: Estimator with fit(X, y)
+        X: Training features
+        y: Training targets
+        cores: Cores wanted (defaults to SESSION_CORES)
+        fit: Callable (X, y) to run instead of model.fit (e.g. continue_fit)
+
+    Returns:
+        The fitted model
+    """
+    attr = next((name for name in PARALLEL_PARAMS if hasattr(model, name)), None)
+    with compute_slot(cores) as granted:
+        if attr is None:
+            (fit or model.fit)(X, y)
+            return model
+        previous = getattr(model, attr)
+        setattr(model, attr, granted)
+        try:
+            (fit or model.fit)(X, y)
+        finally:
+            setattr(model, attr, previous)
+    return model
@@ -0,0 +1,197 @@
+"""
+Multi-fold time-series backtests
+
+backtest_model scores a single trailing split, so one unlucky test window
+moves every metric the score reports. cross_validate splits the lag
+matrix into k consecutive test windows (sklearn's TimeSeriesSplit) with
+either an expanding or a fixed-length rolling training window, fits the
+folds in parallel on the scanner's process pool, and reports per-fold
+metrics plus their mean and a t confidence interval.
+
+The prices are placed in a SharedPrices segment once; every worker
+rebuilds the (strided, copy-free) lag matrix over the shared series, so a
+task only carries the segment handle and its fold bounds instead of a
+pickled copy of X and y.
+"""
+
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+from scipy.stats import t as student_t
+from sklearn.model_selection import TimeSeriesSplit
+
+from utils.forecast_v2 import LAG_TARGET_HORIZON, create_lag_features, regression_metrics, train_model
+from utils.model_registry import data_fingerprint, load_model, model_key, save_model
+from utils.profiling import timed
+from utils.scanner import get_pool
+from utils.shared_prices import SharedPrices
+
+CV_MODES = ('expanding', 'rolling')
+CV_METRICS = ('rmse', 'mae', 'direction_accuracy')
+CV_CI_LEVEL = 0.95
+
+# Rows between a training window and its test window. A target lies
+# LAG_TARGET_HORIZON bars after its last lag, so without the gap the last
+# training targets are prices the first test rows are meant to predict.
+DEFAULT_GAP = LAG_TARGET_HORIZON - 1
+# Fewest rows in a test window (direction accuracy needs two)
+MIN_TEST_ROWS = 2
+
+
+def fold_bounds(n_rows, n_splits=5, mode='expanding', test_size=None, gap=DEFAULT_GAP):
+    """
+    Row ranges of each fold
+
+    Args:
+        n_rows: Rows of the lag matrix
+        n_splits: Number of folds
+        mode: 'expanding' (train on everything before the test window) or
+            'rolling' (train on the same number of rows every fold)
+        test_size: Rows per test window (defaults to n_rows // (n_splits + 1))
+        gap: Rows dropped between training and test windows
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end) tuples;
+        fewer than n_splits when short series cannot fill them all
+
+    Raises:
+        ValueError: If not even two folds fit
+    """
+    if mode not in CV_MODES:
+        raise ValueError(f"mode must be one of {CV_MODES}, got {mode!r}")
+    # Drop folds until every window has MIN_TEST_ROWS test rows and a training row
+    while n_splits >= 2 and (
+        (test_size or n_rows // (n_splits + 1)) < MIN_TEST_ROWS
+        or n_rows - gap - n_splits * (test_size or n_rows // (n_splits + 1)) < 1
+    ):
+        n_splits -= 1
+    if n_splits < 2:
+        raise ValueError(f"{n_rows} lag rows are too few for two folds")
+    test_size = test_size or n_rows // (n_splits + 1)
+    max_train = n_rows - n_splits * test_size - gap if mode == 'rolling' else None
+    splitter = TimeSeriesSplit(n_splits=n_splits, test_size=test_size, gap=gap, max_train_size=max_train)
+    return [
+        (int(train[0]), int(train[-1]) + 1, int(test[0]), int(test[-1]) + 1)
+        for train, test in splitter.split(np.empty((n_rows, 0)))
+    ]
+
+
+def _fit_fold(prices, nlags, model_type, bounds):
+    """Fit and score one fold on lag views of prices; errors are returned, not raised"""
+    train_start, train_end, test_start, test_end = bounds
+    result = {'train_start': train_start, 'train_end': train_end, 'test_start': test_start,
+              'test_end': test_end, 'error': None}
+    start = time.perf_counter()
+    try:
+        X, y = create_lag_features(prices, nlags=nlags)
+        model = train_model(X[train_start:train_end], y[train_start:train_end], model_type)
+        result.update(regression_metrics(y[test_start:test_end], model.predict(X[test_start:test_end])))
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _fit_shared_fold(shared, nlags, model_type, bounds):
+    """Pool task: fit one fold on the series in a SharedPrices store"""
+    try:
+        return _fit_fold(shared.values()[0], nlags, model_type, bounds)
+    finally:
+        shared.close()
+
+
+def summarize_folds(folds, level=CV_CI_LEVEL):
+    """
+    Mean, standard deviation and t confidence interval of each metric
+
+    Args:
+        folds: Per-fold result dicts (failed folds are ignored)
+        level: Confidence level of the intervals
+
+    Returns:
+        Dictionary with '<metric>' (mean), '<metric>_std' and
+        '<metric>_ci' ((low, high), or None with fewer than two folds)
+    """
+    ok = [fold for fold in folds if fold['error'] is None]
+    summary = {}
+    for metric in CV_METRICS:
+        values = np.array([fold[metric] for fold in ok], dtype=np.float64)
+        if len(values) == 0:
+            continue
+        mean = float(values.mean())
+        std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+        summary[metric] = mean
+        summary[f'{metric}_std'] = std
+        if len(values) > 1:
+            half = float(student_t.ppf((1 + level) / 2, len(values) - 1)) * std / np.sqrt(len(values))
+            summary[f'{metric}_ci'] = (float(mean - half), float(mean + half))
+        else:
+            summary[f'{metric}_ci'] = None
+    return summary
+
+
+@timed('forecast.cross_validate')
+def cross_validate(close_prices, nlags=10, model_type="rf", n_splits=5, mode='expanding', test_size=None,
+                   gap=DEFAULT_GAP, workers=None, level=CV_CI_LEVEL, ticker=None, period=None, interval=None,
+                   retrain=False):
+    """
+    k-fold walk-forward backtest
+
+    Args:
+        close_prices: Series/array of close prices
+        nlags: Number of lag features
+        model_type: Type of model (as in train_model)
+        n_splits: Number of folds (reduced for short series; see fold_bounds)
+        mode: One of CV_MODES
+        test_size: Rows per test window (defaults to n_rows // (n_splits + 1))
+        gap: Rows dropped between training and test windows
+        workers: Worker processes (None = all cores, 0 = run in this process)
+        level: Confidence level of the intervals
+        ticker: Stock ticker; caches the results in the model registry when given
+        period: Download period, part of the registry key
+        interval: Bar interval, part of the registry key
+        retrain: Ignore cached results
+
+    Returns:
+        Dictionary with the summarize_folds metrics, 'folds' (per-fold
+        bounds, metrics, seconds and error), 'n_splits' (folds run), 'mode',
+        'test_periods' (total test rows of the successful folds) and
+        'train_size' (mean training rows)
+    """
+    prices = np.ascontiguousarray(np.asarray(close_prices, dtype=np.float64).reshape(-1))
+    n_rows = len(prices) - nlags - LAG_TARGET_HORIZON + 1
+    bounds = fold_bounds(max(n_rows, 0), n_splits=n_splits, mode=mode, test_size=test_size, gap=gap)
+    n_splits = len(bounds)
+
+    key = None
+    if ticker:
+        key = model_key(ticker, period, interval, model_type, nlags, data_fingerprint(prices),
+                        cv=n_splits, mode=mode, test=test_size, gap=gap, level=level)
+        cached = None if retrain else load_model(key)
+        if cached is not None:
+            return cached
+
+    if workers == 0:
+        folds = [_fit_fold(prices, nlags, model_type, b) for b in bounds]
+    else:
+        with SharedPrices.from_arrays(prices[None], [ticker or 'series'], None, fields=('Close',)) as shared:
+            pool = get_pool(workers)
+            futures = [pool.submit(_fit_shared_fold, shared, nlags, model_type, b) for b in bounds]
+            folds = [future.result() for future in as_completed(futures)]
+        folds.sort(key=lambda fold: fold['test_start'])
+
+    for i, fold in enumerate(folds):
+        fold['fold'] = i
+    ok = [fold for fold in folds if fold['error'] is None]
+    results = summarize_folds(folds, level=level)
+    results.update({
+        'folds': folds,
+        'n_splits': n_splits,
+        'mode': mode,
+        'test_periods': int(sum(fold['test_end'] - fold['test_start'] for fold in ok)),
+        'train_size': int(np.mean([fold['train_end'] - fold['train_start'] for fold in ok])) if ok else 0,
+    })
+    if key is not None:
+        save_model(key, results)
+    return results
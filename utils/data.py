@@ -0,0 +1,35 @@
+"""
+Price data loading shared by the app and headless tools
+"""
+
+from utils.price_store import get_store
+
+
+def load_data(ticker, period, interval):
+    """
+    OHLCV bars for a ticker, served from the local price store
+    
+    Args:
+        ticker: Stock ticker symbol
+        period: Download period (e.g. '1y')
+        interval: Bar interval (e.g. '1d')
+    
+    Returns:
+        DataFrame indexed by timestamp (empty if nothing was found)
+    """
+    return get_store().get(ticker, period, interval)
+
+
+def load_many(tickers, period, interval):
+    """
+    OHLCV bars for many tickers, downloading stale ones in one batch
+    
+    Args:
+        tickers: List of ticker symbols
+        period: Download period (e.g. '1y')
+        interval: Bar interval (e.g. '1d')
+    
+    Returns:
+        Dict of ticker -> DataFrame
+    """
+    return get_store().get_many(tickers, period, interval)
@@ -1,13 +1,10 @@
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import mean_squared_error
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import joblib
-import os
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), 'rf_model.joblib')
+from utils.model_registry import data_fingerprint, load_model, model_key, save_model
 
 
 def _make_lag_features(s: pd.Series, nlags=10):
@@ -38,31 +35,22 @@ def train_and_forecast(series: pd.Series, days=7, retrain=False):
     X = df[[f'lag_{i}' for i in range(1, nlags+1)]].values
     y = df['y'].values
 
-    model = None
-    if os.path.exists(MODEL_PATH) and not retrain:
-        try:
-            model = joblib.load(MODEL_PATH)
-        except Exception:
-            model = None
+    # Keyed by series name and data hash, so different tickers (or a new
+    # bar) never pick up each other's model
+    key = model_key(s.name or 'series', None, None, 'rf_legacy', nlags, data_fingerprint(s.values))
+    model = None if retrain else load_model(key)
 
     if model is None:
         model = RandomForestRegressor(n_estimators=200, random_state=42)
-        tscv = TimeSeriesSplit(n_splits=3)
         # quick training
         model.fit(X, y)
-        try:
-            joblib.dump(model, MODEL_PATH)
-        except Exception:
-            pass
+        save_model(key, model)
 
-    # iterative forecasting
-    last_window = s.values[-nlags:]
-    preds = []
-    for _ in range(days):
-        x = last_window[::-1]  # lag_1 is most recent
-        x = x.reshape(1, -1)
-        p = model.predict(x)[0]
-        preds.append(p)
-        last_window = np.append(last_window[1:], p)
+    # iterative forecasting over a preallocated history+forecast buffer
+    buffer = np.empty(nlags + days)
+    buffer[:nlags] = s.values[-nlags:]
+    for step in range(days):
+        x = buffer[step:step + nlags][::-1]  # lag_1 is most recent
+        buffer[nlags + step] = model.predict(x[None, :])[0]
 
-    return model, np.array(preds)
+    return model, buffer[nlags:].copy()
@@ -4,12 +4,82 @@ ML-based price forecasting with multiple models and backtesting
 
 import numpy as np
 import pandas as pd
+from scipy.stats import norm
 from sklearn.ensemble import RandomForestRegressor
 import warnings
 
+from utils.arima import ArimaModel
+from utils.compute import budgeted_fit
+from utils.hgb import HGBRegressor
+from utils.model_registry import data_fingerprint, load_model, model_key, save_model
+from utils.profiling import timed
+from utils.tcn import TCNRegressor
+
 warnings.filterwarnings('ignore')
 
 
+# Offset between the last lag in a row and its target. Rows built by
+# create_lag_features skip one bar (target is prices[i+nlags+1]); kept so
+# backtest metrics stay comparable with earlier runs.
+LAG_TARGET_HORIZON = 2
+
+
+def lag_matrix(data, nlags=10, horizons=(1,), exog=None):
+    """
+    Build a lag matrix as a strided view over the price buffer
+    
+    Row i holds prices[i:i+nlags]; target column k holds
+    prices[i+nlags-1+horizons[k]]. No data is copied when the input is
+    already a float64 array and no exogenous columns are requested.
+    
+    Args:
+        data: Series/array of price data
+        nlags: Number of lags per row
+        horizons: Steps ahead of the last lag for each target column
+        exog: Optional (len(data),) or (len(data), k) array of extra
+              columns, aligned with the prices; the value at the last
+              lag of each row is appended to that row
+    
+    Returns:
+        X: Read-only (n_rows, nlags) view, or (n_rows, nlags + k) array
+           when exog is given
+        Y: Read-only (n_rows,) view for a single horizon, otherwise a
+           (n_rows, len(horizons)) array
+    """
+    prices = np.asarray(data, dtype=np.float64).reshape(-1)
+    horizons = np.atleast_1d(np.asarray(horizons, dtype=np.intp))
+    if horizons.size == 0 or horizons.min() < 1:
+        raise ValueError("horizons must be positive integers")
+    
+    max_h = int(horizons.max())
+    n_rows = len(prices) - nlags - max_h + 1
+    if nlags < 1 or n_rows <= 0:
+        return np.empty((0, nlags)), np.empty((0,) if horizons.size == 1 else (0, horizons.size))
+    
+    X = np.lib.stride_tricks.sliding_window_view(prices, nlags)[:n_rows]
+    
+    if horizons.size == 1:
+        start = nlags - 1 + max_h
+        Y = prices[start:start + n_rows]
+        Y.flags.writeable = False
+    elif np.array_equal(horizons, np.arange(1, max_h + 1)):
+        # Contiguous horizons are themselves a sliding window
+        Y = np.lib.stride_tricks.sliding_window_view(prices[nlags:], max_h)[:n_rows]
+    else:
+        Y = np.lib.stride_tricks.sliding_window_view(prices[nlags:], max_h)[:n_rows]
+        Y = Y[:, horizons - 1]
+    
+    if exog is not None:
+        exog = np.asarray(exog, dtype=np.float64)
+        if exog.ndim == 1:
+            exog = exog[:, None]
+        if len(exog) != len(prices):
+            raise ValueError("exog must be aligned with the price series")
+        X = np.hstack([X, exog[nlags - 1:nlags - 1 + n_rows]])
+    
+    return X, Y
+
+
 def create_lag_features(data, nlags=10):
     """
     Create lag features from time series data
@@ -19,23 +89,10 @@ def create_lag_features(data, nlags=10):
         nlags: Number of lags to create
     
     Returns:
-        X: Feature matrix with lag values
-        y: Target variable (next day's price)
+        X: Feature matrix with lag values (read-only view)
+        y: Target variable (LAG_TARGET_HORIZON bars after the last lag)
     """
-    X, y = [], []
-    
-    # Ensure we have a numpy array
-    prices = np.array(data).flatten()
-    
-    for i in range(len(prices) - nlags - 1):
-        # Create lag features
-        lags = prices[i:i+nlags]
-        next_price = prices[i+nlags+1]
-        
-        X.append(lags)
-        y.append(next_price)
-    
-    return np.array(X), np.array(y)
+    return lag_matrix(data, nlags=nlags, horizons=(LAG_TARGET_HORIZON,))
 
 
 def add_sentiment_feature(X, sentiment_series=None):
@@ -78,7 +135,7 @@ def train_model(X_train, y_train, model_type="rf"):
     Args:
         X_train: Training features
         y_train: Training targets
-        model_type: Type of model ("rf", "arima", "lstm")
+        model_type: Type of model ("rf", "hgb", "arima", "tcn"/"lstm")
     
     Returns:
         Trained model object
@@ -88,30 +145,44 @@ def train_model(X_train, y_train, model_type="rf"):
             n_estimators=100,
             max_depth=15,
             random_state=42,
-            n_jobs=1,  # Single-threaded to avoid joblib issues
+            n_jobs=1,  # Raised to the granted cores by budgeted_fit
             min_samples_split=5,
             min_samples_leaf=2
         )
-        model.fit(X_train, y_train)
-        return model
+        return budgeted_fit(model, X_train, y_train)
+    
+    if model_type == "arima":
+        # Lag rows are consecutive windows, so the series is recovered from
+        # them; predict() forecasts LAG_TARGET_HORIZON bars past each row
+        model = ArimaModel(horizon=LAG_TARGET_HORIZON)
+        return budgeted_fit(model, X_train, y_train)
     
-    # For ARIMA and LSTM, use simplified RandomForest as fallback
-    # (Full implementations would require statsmodels and keras)
+    if model_type == "hgb":
+        # Histogram gradient boosting, OpenMP threads capped by HGB_THREADS
+        model = HGBRegressor(random_state=42)
+        return budgeted_fit(model, X_train, y_train)
+    
+    if model_type in ("tcn", "lstm"):
+        # Sequence model over the lag windows ("lstm" kept as the app's name)
+        model = TCNRegressor(random_state=42)
+        return budgeted_fit(model, X_train, y_train)
+    
+    # Unknown types fall back to RandomForest
     model = RandomForestRegressor(
         n_estimators=100,
         max_depth=15,
         random_state=42,
-        n_jobs=1,  # Single-threaded to avoid joblib issues
+        n_jobs=1,  # Raised to the granted cores by budgeted_fit
         min_samples_split=5,
         min_samples_leaf=2
     )
-    model.fit(X_train, y_train)
-    return model
+    return budgeted_fit(model, X_train, y_train)
 
 
+@timed('forecast.predict')
 def forecast_prices(model, last_values, num_days, nlags=10, use_sentiment=False):
     """
-    Generate future price forecasts
+    Generate future price forecasts recursively, one step at a time
     
     Args:
         model: Trained model
@@ -123,25 +194,187 @@ def forecast_prices(model, last_values, num_days, nlags=10, use_sentiment=False)
     Returns:
         Array of forecasted prices
     """
-    predictions = []
-    current_lags = np.array(last_values[-nlags:]).flatten()
+    # Preallocated window buffer: history followed by the predictions, so
+    # each step reads a view instead of rebuilding the lag array
+    buffer = np.empty(nlags + num_days)
+    buffer[:nlags] = np.asarray(last_values, dtype=np.float64).reshape(-1)[-nlags:]
     
-    for _ in range(num_days):
-        # Prepare input for next prediction
-        X_next = current_lags.reshape(1, -1)
-        
-        next_price = model.predict(X_next)[0]
+    for step in range(num_days):
+        window = buffer[step:step + nlags]
+        next_price = model.predict(window[None, :])[0]
         
         # Ensure price is positive and reasonable
-        next_price = max(next_price, current_lags[-1] * 0.5)  # Can't drop more than 50%
-        next_price = min(next_price, current_lags[-1] * 1.5)  # Can't jump more than 50%
-        
-        predictions.append(next_price)
+        next_price = max(next_price, window[-1] * 0.5)  # Can't drop more than 50%
+        next_price = min(next_price, window[-1] * 1.5)  # Can't jump more than 50%
         
-        # Update lags with new prediction
-        current_lags = np.append(current_lags[1:], next_price)
+        buffer[nlags + step] = next_price
+    
+    return buffer[nlags:].copy()
+
+
+def direct_lag_features(data, nlags=10, num_days=7):
+    """
+    Lag matrix with one target column per forecast day
+    
+    Args:
+        data: Series of price data
+        nlags: Number of lags to create
+        num_days: Number of days the model must forecast
+    
+    Returns:
+        X: Feature matrix with lag values (read-only view)
+        Y: (n_rows, horizon) targets for steps 1..horizon, where the horizon
+           also covers LAG_TARGET_HORIZON so backtests stay comparable
+    """
+    horizon = max(num_days, LAG_TARGET_HORIZON)
+    return lag_matrix(data, nlags=nlags, horizons=np.arange(1, horizon + 1))
+
+
+@timed('forecast.predict')
+def forecast_direct(model, last_values, num_days, nlags=10):
+    """
+    Forecast every day in one predict() call with a multi-output model
+    
+    Args:
+        model: Model trained on direct_lag_features targets
+        last_values: Last nlags price values from historical data
+        num_days: Number of days to forecast
+        nlags: Number of lag features used in training
+    
+    Returns:
+        Array of forecasted prices
+    """
+    window = np.asarray(last_values, dtype=np.float64).reshape(-1)[-nlags:]
+    predictions = np.asarray(model.predict(window[None, :])).reshape(-1)[:num_days].copy()
+    
+    # Same ±50% per-step guard as the recursive path
+    previous = window[-1]
+    for step in range(len(predictions)):
+        predictions[step] = min(max(predictions[step], previous * 0.5), previous * 1.5)
+        previous = predictions[step]
+    
+    return predictions
+
+
+FORECAST_MODES = ('recursive', 'direct')
+
+# Coverage of the prediction intervals reported as 'forecast_bands'
+FORECAST_BAND_LEVEL = 0.95
+
+# Lower, middle and upper quantiles of the tree-ensemble bands
+FORECAST_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def _forest_trees(model):
+    """Fitted trees of a bagged forest (RandomForest, ExtraTrees), or None"""
+    trees = getattr(model, 'estimators_', None)
+    if not isinstance(trees, list) or not trees or not hasattr(trees[0], 'tree_'):
+        return None
+    return trees
+
+
+def tree_predictions(trees, X):
+    """
+    Predictions of every tree in one pass over the low-level tree arrays
+    
+    Returns:
+        (n_trees, n_rows) array, or (n_trees, n_rows, n_outputs) for
+        multi-output forests
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    outputs = trees[0].n_outputs_
+    values = np.stack([tree.tree_.predict(X).reshape(len(X), outputs) for tree in trees])
+    return values[..., 0] if outputs == 1 else values
+
+
+def _forest_paths(trees, window, num_days):
+    """
+    Recursive ensemble forecast plus every tree's own recursive path
+    
+    Row 0 of the buffer follows the ensemble mean (what forecast_prices
+    computes with model.predict); row i+1 follows tree i's predictions.
+    Each step makes one two-row call per tree, which is cheaper than the
+    joblib dispatch inside the forest's predict().
+    """
+    nlags, n_trees = len(window), len(trees)
+    buffer = np.empty((n_trees + 1, nlags + num_days))
+    buffer[:, :nlags] = window
+    for step in range(num_days):
+        # float32 only for the trees' input; the clamp bounds stay float64,
+        # as in forecast_prices
+        windows = buffer[:, step:step + nlags].astype(np.float32)
+        previous = buffer[:, nlags + step - 1]
+        preds = np.empty(n_trees + 1)
+        total = 0.0
+        for i, tree in enumerate(trees):
+            ensemble, own = tree.tree_.predict(windows[[0, i + 1]]).reshape(2)
+            total += ensemble
+            preds[i + 1] = own
+        preds[0] = total / n_trees
+        buffer[:, nlags + step] = np.clip(preds, previous * 0.5, previous * 1.5)
+    return buffer[0, nlags:].copy(), buffer[1:, nlags:]
+
+
+@timed('forecast.forest')
+def forecast_with_bands(model, last_values, num_days, nlags=10, quantiles=FORECAST_QUANTILES,
+                        direct=False):
+    """
+    Forecast plus quantile bands from the individual trees of a forest
+    
+    Each tree rolls out its own path (direct models predict every day at
+    once) and the quantiles are taken across trees per day, so the bands
+    widen as the trees disagree. The point forecast is the same ensemble
+    mean forecast_prices / forecast_direct return, computed in the same
+    pass. Nothing is refit.
+    
+    Args:
+        model: Fitted forest from train_model
+        last_values: Last nlags price values from historical data
+        num_days: Number of days to forecast
+        nlags: Number of lag features used in training
+        quantiles: Quantiles to report
+        direct: Model was trained on direct_lag_features targets
     
-    return np.array(predictions)
+    Returns:
+        Tuple: (forecast, (len(quantiles), num_days) bands), or None if the
+        model has no trees
+    """
+    trees = _forest_trees(model)
+    if trees is None:
+        return None
+    
+    window = np.asarray(last_values, dtype=np.float64).reshape(-1)[-nlags:]
+    if direct:
+        per_tree = tree_predictions(trees, window[None, :])[:, 0, :num_days]
+        paths = np.vstack([per_tree.mean(axis=0), per_tree])
+        previous = np.full(len(paths), window[-1])
+        for step in range(paths.shape[1]):
+            paths[:, step] = np.clip(paths[:, step], previous * 0.5, previous * 1.5)
+            previous = paths[:, step]
+        forecast, per_tree = paths[0].copy(), paths[1:]
+    else:
+        forecast, per_tree = _forest_paths(trees, window, num_days)
+    
+    return forecast, np.quantile(per_tree, quantiles, axis=0)
+
+
+def band_spread(bands):
+    """
+    Relative one-step volatility implied by a 'forecast_bands' dict
+    
+    The last day's band width is converted to a normal standard deviation
+    for the band's coverage, divided by the middle forecast and scaled back
+    to one step by sqrt(days), so 80% tree bands and 95% ARIMA intervals
+    are comparable.
+    """
+    lower = np.asarray(bands['lower'], dtype=np.float64).reshape(-1)
+    upper = np.asarray(bands['upper'], dtype=np.float64).reshape(-1)
+    middle = np.asarray(bands.get('median', (lower + upper) / 2), dtype=np.float64).reshape(-1)
+    if not len(middle) or middle[-1] <= 0:
+        return None
+    z = norm.ppf(0.5 + bands['level'] / 2)
+    sigma = (upper[-1] - lower[-1]) / (2 * z) / middle[-1]
+    return float(sigma / np.sqrt(len(middle)))
 
 
 def backtest_model(X, y, nlags=10, test_size=0.2, model_type="rf"):
@@ -150,7 +383,8 @@ def backtest_model(X, y, nlags=10, test_size=0.2, model_type="rf"):
     
     Args:
         X: Feature matrix
-        y: Target values
+        y: Target values; for 2-D direct targets the metrics use the
+           LAG_TARGET_HORIZON column
         nlags: Number of lag features
         test_size: Proportion for test set
         model_type: Type of model
@@ -161,6 +395,7 @@ def backtest_model(X, y, nlags=10, test_size=0.2, model_type="rf"):
     test_periods = max(1, int(len(X) * test_size))
     train_size = len(X) - test_periods
     
+    # Slices of the lag-matrix views; nothing is copied here
     X_train = X[:train_size]
     y_train = y[:train_size]
     X_test = X[train_size:]
@@ -172,7 +407,34 @@ def backtest_model(X, y, nlags=10, test_size=0.2, model_type="rf"):
     # Make predictions
     y_pred = model.predict(X_test)
     
-    # Calculate metrics
+    if np.ndim(y_test) == 2:
+        # Multi-horizon targets: score the column create_lag_features predicts
+        y_test = y_test[:, LAG_TARGET_HORIZON - 1]
+        y_pred = y_pred[:, LAG_TARGET_HORIZON - 1]
+    
+    results = regression_metrics(y_test, y_pred)
+    results.update({
+        'test_periods': int(test_periods),
+        'train_size': int(train_size),
+        'model': model
+    })
+    return results
+
+
+def regression_metrics(y_test, y_pred):
+    """
+    Backtest metrics shared by every evaluation path
+    
+    Args:
+        y_test: Actual target values
+        y_pred: Predicted target values
+    
+    Returns:
+        Dictionary with rmse, mae and direction_accuracy
+    """
+    y_test = np.asarray(y_test)
+    y_pred = np.asarray(y_pred)
+    
     mae = np.mean(np.abs(y_pred - y_test))
     rmse = np.sqrt(np.mean((y_pred - y_test) ** 2))
     
@@ -184,15 +446,100 @@ def backtest_model(X, y, nlags=10, test_size=0.2, model_type="rf"):
     return {
         'rmse': float(rmse),
         'mae': float(mae),
-        'direction_accuracy': float(direction_accuracy),
-        'test_periods': int(test_periods),
-        'train_size': int(train_size),
-        'model': model
+        'direction_accuracy': float(direction_accuracy)
     }
 
 
+# How the forecasting model is derived from the backtest fit:
+#   'auto'  - 'warm' for models with continue_fit; forests grow fresh trees
+#             on all rows and drop the backtest trees; 'full' otherwise
+#   'full'  - fit a fresh model on all rows (two full fits per request)
+#   'warm'  - keep the backtest trees and grow extra ones on all rows
+#   'reuse' - forecast with the backtest model as-is (one fit)
+# Forests cannot predict outside the targets they were fit on, and most of
+# a warm or reused forest never saw the test rows, so on a trending series
+# their forecasts fall back toward older price levels. Under 'auto' every
+# remaining tree has seen the full window, at warm_fraction of a refit's cost.
+REFIT_POLICIES = ('auto', 'full', 'warm', 'reuse')
+
+
+@timed('forecast.walk_forward')
+def walk_forward(X, y, nlags=10, test_size=0.2, model_type="rf", refit="auto", warm_fraction=0.5):
+    """
+    Backtest on the trailing split and derive the forecasting model from it
+    
+    Args:
+        X: Feature matrix
+        y: Target values
+        nlags: Number of lag features
+        test_size: Proportion for test set
+        model_type: Type of model
+        refit: One of REFIT_POLICIES
+        warm_fraction: Trees grown on the full window for 'warm' (and for
+            forests under 'auto'), relative to the forest size
+    
+    Returns:
+        Tuple: (model, backtest_metrics); the metrics dict is the one
+        backtest_model returns
+    """
+    if refit not in REFIT_POLICIES:
+        raise ValueError(f"refit must be one of {REFIT_POLICIES}, got {refit!r}")
+    
+    backtest_results = backtest_model(X, y, nlags=nlags, test_size=test_size, model_type=model_type)
+    model = backtest_results['model']
+    
+    if refit == 'auto':
+        if hasattr(model, 'continue_fit'):
+            refit = 'warm'
+        elif _grow_on_full_window(model, X, y, warm_fraction, replace=True):
+            return model, backtest_results
+        else:
+            refit = 'full'
+    
+    if refit == 'reuse':
+        return model, backtest_results
+    
+    if refit == 'warm' and _grow_on_full_window(model, X, y, warm_fraction):
+        return model, backtest_results
+    
+    return train_model(X, y, model_type), backtest_results
+
+
+def _grow_on_full_window(model, X, y, warm_fraction, replace=False):
+    """
+    Warm-start extra trees on the full window; False if the model can't
+    
+    The backtest trees have not seen the test rows, so the added trees are
+    what lets the forecast reach the most recent price levels. With replace
+    the backtest trees are dropped afterwards, which only bagged forests
+    (independent trees in a list) allow. Models with continue_fit
+    (boosters, sequence models) train further from the backtest fit instead.
+    """
+    if hasattr(model, 'continue_fit'):
+        if replace:
+            return False
+        budgeted_fit(model, X, y, fit=lambda X, y: model.continue_fit(X, y, warm_fraction))
+        return True
+    
+    params = model.get_params() if hasattr(model, 'get_params') else {}
+    if 'warm_start' not in params or 'n_estimators' not in params:
+        return False
+    if replace and not isinstance(getattr(model, 'estimators_', None), list):
+        return False
+    
+    extra = max(1, int(round(params['n_estimators'] * warm_fraction)))
+    model.set_params(warm_start=True, n_estimators=params['n_estimators'] + extra)
+    budgeted_fit(model, X, y)
+    model.set_params(warm_start=False)
+    if replace:
+        model.estimators_ = model.estimators_[-extra:]
+        model.set_params(n_estimators=extra)
+    return True
+
+
 def train_and_forecast(close_prices, days=7, retrain=False, model_type="rf", 
-                      sentiment=None, nlags=10, test_size=0.2):
+                      sentiment=None, nlags=10, test_size=0.2, refit="auto",
+                      ticker=None, period=None, interval=None, forecast_mode="recursive"):
     """
     Main function: Train model and produce forecast
     
@@ -204,36 +551,84 @@ def train_and_forecast(close_prices, days=7, retrain=False, model_type="rf",
         sentiment: Optional sentiment series (currently not used to avoid feature mismatch)
         nlags: Number of lag features
         test_size: Backtest test set proportion
+        refit: How the forecasting model reuses the backtest fit (see REFIT_POLICIES)
+        ticker: Stock ticker; enables the on-disk model registry when given
+        period: Download period, part of the registry key
+        interval: Bar interval, part of the registry key
+        forecast_mode: 'recursive' (one predict per day) or 'direct'
+                       (multi-output model, all days in one predict)
     
     Returns:
-        Tuple: (model, forecast_prices, backtest_metrics)
+        Tuple: (model, forecast_prices, backtest_metrics); for ARIMA and
+        forest models the metrics also hold 'forecast_bands' (level, lower,
+        median, upper per day) and 'forecast_spread' (see band_spread)
     """
     try:
-        # Ensure close_prices is a numpy array
-        prices = np.array(close_prices).flatten()
+        # Contiguous float64 buffer that the lag matrix views into
+        prices = np.ascontiguousarray(np.asarray(close_prices, dtype=np.float64).reshape(-1))
         
         if len(prices) < nlags + 10:
             # Not enough data
             return None, None, {}
         
-        # Create features and targets from price lags only
-        # (sentiment causes feature mismatch issues in forecasting)
-        X, y = create_lag_features(prices, nlags=nlags)
+        if forecast_mode not in FORECAST_MODES:
+            raise ValueError(f"forecast_mode must be one of {FORECAST_MODES}, got {forecast_mode!r}")
+        direct = forecast_mode == 'direct'
+        
+        def _forecast(model, results):
+            if isinstance(model, ArimaModel):
+                # Closed form from the full history, with prediction intervals
+                forecast, lower, upper = model.forecast_interval(prices, days, level=FORECAST_BAND_LEVEL)
+                results['forecast_bands'] = {'level': FORECAST_BAND_LEVEL, 'lower': lower,
+                                             'median': forecast, 'upper': upper}
+            elif _forest_trees(model) is not None:
+                # Forests: point forecast and quantile bands from their trees
+                forecast, bands = forecast_with_bands(model, prices[-nlags:], days, nlags=nlags,
+                                                      direct=direct)
+                results['forecast_bands'] = {
+                    'level': FORECAST_QUANTILES[-1] - FORECAST_QUANTILES[0],
+                    'lower': bands[0], 'median': bands[len(bands) // 2], 'upper': bands[-1],
+                }
+            elif direct:
+                forecast = forecast_direct(model, prices[-nlags:], days, nlags=nlags)
+            else:
+                forecast = forecast_prices(model, prices[-nlags:], days, nlags=nlags)
+            if 'forecast_bands' in results:
+                results['forecast_spread'] = band_spread(results['forecast_bands'])
+            return forecast
         
-        # Backtest to get metrics
-        backtest_results = backtest_model(X, y, nlags=nlags, test_size=test_size, model_type=model_type)
-        model = backtest_results['model']
+        key = None
+        if ticker:
+            mode_params = {'days': days} if direct else {}
+            key = model_key(
+                ticker, period, interval, model_type, nlags, data_fingerprint(prices),
+                test=test_size, refit=refit, mode=forecast_mode, **mode_params
+            )
+            cached = None if retrain else load_model(key)
+            if cached is not None:
+                model = cached['model']
+                backtest_results = dict(cached['metrics'], model=model)
+                return model, _forecast(model, backtest_results), backtest_results
         
-        # Generate forecast using all available data
-        X_all, y_all = create_lag_features(prices, nlags=nlags)
+        # Create features and targets from price lags only
+        # (sentiment causes feature mismatch issues in forecasting).
+        # X and y are views over `prices`, shared by backtest and final fit.
+        if direct:
+            X, y = direct_lag_features(prices, nlags=nlags, num_days=days)
+        else:
+            X, y = create_lag_features(prices, nlags=nlags)
+        
+        # Backtest, then reuse that fit for the forecasting model
+        model, backtest_results = walk_forward(
+            X, y, nlags=nlags, test_size=test_size, model_type=model_type, refit=refit
+        )
         
-        model = train_model(X_all, y_all, model_type)
+        if key is not None:
+            metrics = {k: v for k, v in backtest_results.items() if k != 'model'}
+            save_model(key, {'model': model, 'metrics': metrics})
         
         # Forecast future prices
-        last_values = prices[-nlags:]
-        forecast = forecast_prices(model, last_values, days, nlags=nlags)
-        
-        return model, forecast, backtest_results
+        return model, _forecast(model, backtest_results), backtest_results
     
     except Exception as e:
         print(f"Error in forecast: {e}")
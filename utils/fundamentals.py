@@ -1,9 +1,141 @@
+"""
+Fundamentals snapshot layer
+
+yfinance's `.info` is the slowest call we make, so the full payload is
+fetched once per ticker per TTL and shared by scoring and valuation.
+Snapshots live in memory and on disk, and concurrent requests for the same
+ticker wait for a single fetch instead of each issuing their own.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import yfinance as yf
 
+from utils.profiling import count, timed
 
-def get_fundamentals(ticker: str) -> dict:
+FUNDAMENTALS_CACHE_DIR = os.getenv(
+    'FUNDAMENTALS_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'fundamentals_cache')
+)
+# Seconds a snapshot stays fresh (default 6 hours)
+FUNDAMENTALS_TTL = float(os.getenv('FUNDAMENTALS_TTL', str(6 * 3600)))
+
+_snapshots = {}  # ticker -> (fetched_at, info)
+_ticker_locks = {}
+_locks_guard = threading.Lock()
+
+
+@timed('fundamentals.fetch')
+def _fetch_info(ticker: str) -> dict:
     t = yf.Ticker(ticker)
-    info = t.info if hasattr(t, 'info') else {}
+    return t.info if hasattr(t, 'info') else {}
+
+
+def _lock_for(ticker):
+    with _locks_guard:
+        return _ticker_locks.setdefault(ticker, threading.Lock())
+
+
+def _snapshot_path(ticker):
+    safe = ''.join(c if c.isalnum() or c in '.-^=' else '_' for c in ticker)
+    return os.path.join(FUNDAMENTALS_CACHE_DIR, f"{safe}.json")
+
+
+def _read_snapshot(ticker):
+    try:
+        with open(_snapshot_path(ticker)) as fh:
+            record = json.load(fh)
+        return record['fetched_at'], record['info']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_snapshot(ticker, fetched_at, info):
+    try:
+        os.makedirs(FUNDAMENTALS_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=FUNDAMENTALS_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump({'fetched_at': fetched_at, 'info': info}, fh, default=str)
+        os.replace(tmp_path, _snapshot_path(ticker))
+    except OSError as e:
+        print(f"Could not cache fundamentals for {ticker}: {e}")
+
+
+def get_info(ticker: str, ttl: float = None) -> dict:
+    """
+    Full yfinance info payload for a ticker, fetched at most once per TTL
+
+    Args:
+        ticker: Stock ticker symbol
+        ttl: Freshness window in seconds (defaults to FUNDAMENTALS_TTL)
+
+    Returns:
+        Info dictionary ({} if it could not be fetched and nothing is cached)
+    """
+    ttl = FUNDAMENTALS_TTL if ttl is None else ttl
+
+    cached = _snapshots.get(ticker)
+    if cached and time.time() - cached[0] <= ttl:
+        count('fundamentals.memory_hit')
+        return cached[1]
+
+    # Concurrent callers for the same ticker queue here; the first one
+    # fetches and the rest find the fresh snapshot when they get the lock
+    with _lock_for(ticker):
+        in_memory = _snapshots.get(ticker)
+        cached = in_memory or _read_snapshot(ticker)
+        if cached and time.time() - cached[0] <= ttl:
+            # Another caller fetched it while we waited, or it was on disk
+            count('fundamentals.memory_hit' if in_memory else 'fundamentals.disk_hit')
+            _snapshots[ticker] = cached
+            return cached[1]
+
+        count('fundamentals.miss')
+
+        try:
+            info = _fetch_info(ticker) or {}
+        except Exception as e:
+            print(f"Error fetching fundamentals for {ticker}: {e}")
+            # Serve a stale snapshot rather than nothing
+            return cached[1] if cached else {}
+
+        if not info:
+            # An empty payload is a failed fetch too: keep it out of the
+            # cache so the next call retries instead of waiting out the TTL
+            return cached[1] if cached else {}
+
+        fetched_at = time.time()
+        _snapshots[ticker] = (fetched_at, info)
+        _write_snapshot(ticker, fetched_at, info)
+        return info
+
+
+def get_info_batch(tickers, max_workers: int = 8, ttl: float = None) -> dict:
+    """
+    Info payloads for many tickers, fetching the stale ones concurrently
+
+    Args:
+        tickers: Iterable of ticker symbols
+        max_workers: Concurrent fetches
+        ttl: Freshness window in seconds (defaults to FUNDAMENTALS_TTL)
+
+    Returns:
+        Dict of ticker -> info dictionary
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        infos = pool.map(lambda t: get_info(t, ttl=ttl), tickers)
+        return dict(zip(tickers, infos))
+
+
+def get_fundamentals(ticker: str) -> dict:
+    info = get_info(ticker)
 
     fundamentals = {
         'shortName': info.get('shortName'),
@@ -0,0 +1,254 @@
+"""
+Incremental technical-indicator engine
+
+Holds running sums, EMA states and Wilder RSI averages so each new bar is
+folded in with O(1) work instead of recomputing the whole history. The
+batch path (IndicatorEngine.from_history) computes the same columns as
+utils.indicators.add_technical_indicators and leaves the engine primed to
+continue from the last bar. State can be checkpointed to a plain dict and
+restored later.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.indicator_kernels import (
+    BB_DEV, BB_WINDOW, INDICATOR_COLUMNS, MACD_FAST, MACD_SIGNAL, MACD_SLOW, RSI_WINDOW,
+    SMA_WINDOWS, _fill_gaps, _fused,
+)
+
+_BUFFER = max(max(SMA_WINDOWS), BB_WINDOW)
+# Running sums are rebuilt from the ring buffer this often to cap drift
+_RESUM_EVERY = 4096
+
+
+def _alpha_span(span):
+    return 2.0 / (span + 1.0)
+
+
+class IndicatorEngine:
+    """
+    Stateful SMA/RSI/MACD/Bollinger calculator with O(1) updates
+
+    Matches the conventions of add_technical_indicators: SMAs use
+    min_periods=1, RSI is Wilder's (ewm alpha=1/14, adjust=False), MACD
+    uses adjust=False EMAs, Bollinger bands use the population std.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = None
+        self.buffer = np.zeros(_BUFFER)  # ring buffer of recent closes
+        self.pos = 0                     # next write slot
+        self.sums = {w: 0.0 for w in SMA_WINDOWS}
+        self.bb_sum = 0.0
+        self.bb_sumsq = 0.0
+        self.bb_ref = None               # offset that keeps sumsq well-conditioned
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.ema_fast = None
+        self.ema_slow = None
+        self.signal = None
+        self.signal_count = 0
+
+    # ------------------------------------------------------------------
+    # Incremental path
+
+    def _value_leaving(self, window):
+        """Close that drops out of a `window`-bar window on this update"""
+        if self.count < window:
+            return None
+        return self.buffer[(self.pos - window) % _BUFFER]
+
+    def update(self, close):
+        """
+        Fold in one new bar
+
+        Args:
+            close: Close price of the new bar
+
+        Returns:
+            Dict of INDICATOR_COLUMNS values for that bar (NaN while warming up)
+        """
+        close = float(close)
+
+        if self.bb_ref is None:
+            self.bb_ref = close
+
+        for window in SMA_WINDOWS:
+            leaving = self._value_leaving(window)
+            self.sums[window] += close - (leaving if leaving is not None else 0.0)
+
+        leaving = self._value_leaving(BB_WINDOW)
+        shifted = close - self.bb_ref
+        self.bb_sum += shifted
+        self.bb_sumsq += shifted * shifted
+        if leaving is not None:
+            old = leaving - self.bb_ref
+            self.bb_sum -= old
+            self.bb_sumsq -= old * old
+
+        self.buffer[self.pos] = close
+        self.pos = (self.pos + 1) % _BUFFER
+
+        # Wilder averages; the first bar has no diff and counts as 0 gain/loss
+        alpha = 1.0 / RSI_WINDOW
+        diff = 0.0 if self.prev_close is None else close - self.prev_close
+        gain, loss = max(diff, 0.0), max(-diff, 0.0)
+        if self.count == 0:
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            self.avg_gain += alpha * (gain - self.avg_gain)
+            self.avg_loss += alpha * (loss - self.avg_loss)
+
+        if self.ema_fast is None:
+            self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_fast += _alpha_span(MACD_FAST) * (close - self.ema_fast)
+            self.ema_slow += _alpha_span(MACD_SLOW) * (close - self.ema_slow)
+
+        self.count += 1
+        self.prev_close = close
+
+        macd = np.nan
+        if self.count >= MACD_SLOW:
+            macd = self.ema_fast - self.ema_slow
+            # Signal EMA starts at the first defined MACD value
+            if self.signal is None:
+                self.signal = macd
+            else:
+                self.signal += _alpha_span(MACD_SIGNAL) * (macd - self.signal)
+            self.signal_count += 1
+
+        if self.count % _RESUM_EVERY == 0:
+            self._resum()
+
+        return self._current(macd)
+
+    def _resum(self):
+        """Rebuild running sums exactly from the ring buffer"""
+        recent = self._recent(_BUFFER)
+        for window in SMA_WINDOWS:
+            self.sums[window] = float(recent[-window:].sum())
+        shifted = recent[-BB_WINDOW:] - self.bb_ref
+        self.bb_sum = float(shifted.sum())
+        self.bb_sumsq = float((shifted * shifted).sum())
+
+    def _recent(self, n):
+        """Last min(n, count) closes in time order"""
+        n = min(n, self.count, _BUFFER)
+        idx = (self.pos - n + np.arange(n)) % _BUFFER
+        return self.buffer[idx]
+
+    def _current(self, macd=None):
+        n = self.count
+        out = {}
+        for window in SMA_WINDOWS:
+            out[f'SMA_{window}'] = self.sums[window] / min(n, window) if n else np.nan
+
+        if n >= RSI_WINDOW:
+            if self.avg_loss == 0:
+                out['RSI_14'] = 100.0
+            else:
+                out['RSI_14'] = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        else:
+            out['RSI_14'] = np.nan
+
+        if macd is None:
+            macd = self.ema_fast - self.ema_slow if n >= MACD_SLOW else np.nan
+        out['MACD'] = macd
+        out['MACD_Signal'] = self.signal if self.signal_count >= MACD_SIGNAL else np.nan
+
+        if n >= BB_WINDOW:
+            mean = self.bb_sum / BB_WINDOW
+            var = max(self.bb_sumsq / BB_WINDOW - mean * mean, 0.0)
+            std = np.sqrt(var)
+            middle = mean + self.bb_ref
+            out['BB_middle'] = middle
+            out['BB_upper'] = middle + BB_DEV * std
+            out['BB_lower'] = middle - BB_DEV * std
+        else:
+            out['BB_middle'] = out['BB_upper'] = out['BB_lower'] = np.nan
+        return out
+
+    def latest(self):
+        """Indicator values for the most recent bar"""
+        return self._current()
+
+    # ------------------------------------------------------------------
+    # Batch path
+
+    @classmethod
+    def from_history(cls, close):
+        """
+        Compute indicators for a full history and prime an engine from it
+
+        Args:
+            close: Series or array of close prices
+
+        Returns:
+            Tuple: (engine, DataFrame of INDICATOR_COLUMNS aligned with close)
+        """
+        series = close if isinstance(close, pd.Series) else pd.Series(np.asarray(close, dtype=float))
+        values = np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+        valid = ~np.isnan(values)
+        lead = int(valid.argmax()) if valid.any() else len(values)
+        
+        engine = cls()
+        if lead == len(values):
+            return engine, pd.DataFrame({name: np.full(lead, np.nan) for name in INDICATOR_COLUMNS},
+                                        index=series.index)
+        
+        # As in compute_indicators: start at the first price (a late listing)
+        # and carry the last close over interior gaps
+        values = _fill_gaps(values[lead:].reshape(1, -1))[0]
+        n = len(values)
+        out, states = _fused(values.reshape(1, -1))
+        frame = pd.DataFrame({name: np.concatenate([np.full(lead, np.nan), out[name][0]])
+                              for name in INDICATOR_COLUMNS}, index=series.index)
+        
+        engine.count = n
+        engine.prev_close = float(values[-1])
+        recent = values[-_BUFFER:]
+        engine.buffer[:len(recent)] = recent
+        engine.pos = len(recent) % _BUFFER
+        engine.bb_ref = float(values[0])
+        for key in ('avg_gain', 'avg_loss', 'ema_fast', 'ema_slow'):
+            setattr(engine, key, float(states[key][0]))
+        engine.signal_count = max(0, n - MACD_SLOW + 1)
+        engine.signal = float(states['signal'][0]) if engine.signal_count else None
+        engine._resum()
+        
+        return engine, frame
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+
+    def state_dict(self):
+        """JSON-serializable snapshot of the engine state"""
+        return {
+            'count': self.count,
+            'prev_close': self.prev_close,
+            'recent': self._recent(_BUFFER).tolist(),
+            'bb_ref': self.bb_ref,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'signal': self.signal,
+            'signal_count': self.signal_count,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore an engine saved with state_dict()"""
+        engine = cls()
+        recent = np.asarray(state['recent'], dtype=float)
+        engine.buffer[:len(recent)] = recent
+        engine.pos = len(recent) % _BUFFER
+        for key in ('count', 'prev_close', 'bb_ref', 'avg_gain', 'avg_loss',
+                    'ema_fast', 'ema_slow', 'signal', 'signal_count'):
+            setattr(engine, key, state[key])
+        if engine.count:
+            engine._resum()
+        return engine
@@ -0,0 +1,177 @@
+"""
+Fused NumPy indicator kernels
+
+Computes SMA_50, SMA_200, RSI_14, MACD/MACD_Signal and Bollinger Bands
+together from one contiguous float64 buffer, sharing the diff and running
+sums between indicators. Accepts a single series or a 2-D (tickers x time)
+matrix, so a whole universe is computed in one call. Results match the
+`ta` library conventions used by add_technical_indicators.
+
+Rows may start with NaNs (e.g. tickers listed later than others); gaps
+inside a row should be forward-filled before calling.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+SMA_WINDOWS = (50, 200)
+RSI_WINDOW = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_WINDOW, BB_DEV = 20, 2
+
+INDICATOR_COLUMNS = [
+    'SMA_50', 'SMA_200', 'RSI_14', 'MACD', 'MACD_Signal', 'BB_middle', 'BB_upper', 'BB_lower'
+]
+
+
+def _ema(x, alpha):
+    """adjust=False EMA along the last axis, seeded with the first value"""
+    zi = (1.0 - alpha) * x[..., :1]
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)
+    return y
+
+
+def _sma_min1(centered, window):
+    """Trailing mean with min_periods=1 from a cumulative sum"""
+    T = centered.shape[-1]
+    csum = np.cumsum(centered, axis=-1)
+    out = csum.copy()
+    out[..., window:] -= csum[..., :-window]
+    out /= np.minimum(np.arange(1, T + 1), window)
+    return out
+
+
+def _rolling_mean_std(x, window):
+    """Trailing mean and population std (NaN before a full window)"""
+    T = x.shape[-1]
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    if T < window:
+        return mean, std
+
+    n = T - window + 1
+    # Shifted-slice sums keep the precision of a direct window sum without
+    # materialising a (..., n, window) array
+    total = np.zeros(x.shape[:-1] + (n,))
+    for j in range(window):
+        total += x[..., j:j + n]
+    m = total / window
+    sq = np.zeros_like(total)
+    for j in range(window):
+        d = x[..., j:j + n] - m
+        sq += d * d
+    mean[..., window - 1:] = m
+    std[..., window - 1:] = np.sqrt(sq / window)
+    return mean, std
+
+
+def _rsi(x):
+    """Wilder RSI along the last axis, plus the final average gain/loss"""
+    diff = np.zeros_like(x)
+    diff[..., 1:] = np.diff(x, axis=-1)
+    alpha = 1.0 / RSI_WINDOW
+    avg_gain = _ema(np.maximum(diff, 0.0), alpha)
+    avg_loss = _ema(np.maximum(-diff, 0.0), alpha)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    rsi[..., :RSI_WINDOW - 1] = np.nan
+    return rsi, avg_gain[..., -1], avg_loss[..., -1]
+
+
+def _fused(x):
+    """
+    Core kernel on a finite (rows x time) float64 array
+
+    Returns:
+        Tuple: (dict of indicator arrays, dict of final recursive states)
+    """
+    rows, T = x.shape
+    out = {}
+    idx = np.arange(T)
+
+    centered = x - x[:, :1]
+    for window in SMA_WINDOWS:
+        out[f'SMA_{window}'] = _sma_min1(centered, window) + x[:, :1]
+
+    out['RSI_14'], last_gain, last_loss = _rsi(x)
+
+    ema_fast = _ema(x, 2.0 / (MACD_FAST + 1))
+    ema_slow = _ema(x, 2.0 / (MACD_SLOW + 1))
+    macd = ema_fast - ema_slow
+    signal = np.full_like(x, np.nan)
+    first = MACD_SLOW - 1
+    if T > first:
+        signal[:, first:] = _ema(macd[:, first:], 2.0 / (MACD_SIGNAL + 1))
+    macd[:, idx < first] = np.nan
+    states = {
+        'avg_gain': last_gain, 'avg_loss': last_loss,
+        'ema_fast': ema_fast[:, -1], 'ema_slow': ema_slow[:, -1],
+        'signal': signal[:, -1].copy(),
+    }
+    signal[:, idx < MACD_SLOW + MACD_SIGNAL - 2] = np.nan
+    out['MACD'] = macd
+    out['MACD_Signal'] = signal
+
+    middle, std = _rolling_mean_std(x, BB_WINDOW)
+    out['BB_middle'] = middle
+    out['BB_upper'] = middle + BB_DEV * std
+    out['BB_lower'] = middle - BB_DEV * std
+    return out, states
+
+
+def _fill_gaps(x2):
+    """
+    Forward-fill interior NaNs of a (rows x time) matrix whose rows start
+    with a price; one NaN would otherwise run through the filters and
+    cumulative sums and blank every later bar
+    """
+    gaps = np.isnan(x2)
+    if not gaps.any():
+        return x2
+    last = np.where(gaps, 0, np.arange(x2.shape[1]))
+    np.maximum.accumulate(last, axis=1, out=last)
+    return np.take_along_axis(x2, last, axis=1)
+
+
+def compute_indicators(close, dtype=np.float64):
+    """
+    All indicator families in one call
+
+    Args:
+        close: 1-D array of closes, or 2-D (tickers x time) matrix
+        dtype: Output dtype (np.float64 or np.float32)
+
+    Returns:
+        Dict of INDICATOR_COLUMNS -> arrays shaped like close
+    """
+    x = np.ascontiguousarray(close, dtype=np.float64)
+    squeeze = x.ndim == 1
+    x2 = x.reshape(1, -1) if squeeze else x
+    rows, T = x2.shape
+    if T == 0:
+        return {name: np.empty(x.shape, dtype=dtype) for name in INDICATOR_COLUMNS}
+
+    # Left-align rows with leading NaNs so every row starts at column 0
+    valid = ~np.isnan(x2)
+    lead = np.where(valid.any(axis=1), valid.argmax(axis=1), T)
+    shifted = bool(lead.any())
+    if shifted:
+        src = np.minimum(np.arange(T) + lead[:, None], T - 1)
+        x2 = np.take_along_axis(x2, src, axis=1)
+
+    x2 = _fill_gaps(x2)
+    if shifted:
+        x2 = np.where(np.isnan(x2), 0.0, x2)  # all-NaN rows; masked below
+
+    out, _ = _fused(x2)
+
+    result = {}
+    for name in INDICATOR_COLUMNS:
+        values = out[name]
+        if shifted:
+            back = np.arange(T) - lead[:, None]
+            values = np.take_along_axis(values, np.maximum(back, 0), axis=1)
+            values[back < 0] = np.nan
+        values = values.astype(dtype, copy=False)
+        result[name] = values.reshape(x.shape) if squeeze else values
+    return result
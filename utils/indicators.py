@@ -1,55 +1,60 @@
+import os
+
 import pandas as pd
 import numpy as np
-import ta
 
+from utils.indicator_kernels import INDICATOR_COLUMNS, compute_indicators
+from utils.profiling import timed
+
+# Lean mode: only the price columns downstream code reads, float32
+# indicators and categorical signals (default for the app toggle)
+LEAN_MODE = os.getenv('STOCK_LEAN', '').lower() in ('1', 'true', 'yes')
+LEAN_COLUMNS = ('Close',)
+LEAN_DTYPE = np.float32
+
+
+def lean_prices(df: pd.DataFrame, columns=LEAN_COLUMNS) -> pd.DataFrame:
+    """
+    Just the given price columns, flattened to one float64 column each
+
+    yfinance (Price, Ticker) MultiIndex columns are reduced to their
+    first ticker. Closes stay float64: they feed the forecast models and
+    the valuation, where float32 rounding would change results.
+    """
+    data = {}
+    for name in columns:
+        if name not in df.columns.get_level_values(0):
+            continue
+        values = df[name]
+        if isinstance(values, pd.DataFrame):
+            values = values.iloc[:, 0]
+        data[name] = values.to_numpy(dtype=np.float64)
+    return pd.DataFrame(data, index=df.index, copy=False)
+
+
+@timed('indicators')
+def add_technical_indicators(df: pd.DataFrame, copy=True, dtype=np.float64) -> pd.DataFrame:
+    """
+    Append the INDICATOR_COLUMNS to a price frame
+
+    Args:
+        df: Frame with a 'Close' column
+        copy: Work on a copy; with False the columns are added to df itself
+        dtype: Indicator dtype (LEAN_DTYPE halves their memory)
+    """
+    if copy:
+        df = df.copy()
 
-def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    
     # Ensure Close is 1D Series
     close = df['Close'].squeeze()
     if isinstance(close, pd.DataFrame):
         close = close.iloc[:, 0]
-    
-    # SMA
-    df['SMA_50'] = close.rolling(window=50, min_periods=1).mean()
-    df['SMA_200'] = close.rolling(window=200, min_periods=1).mean()
-
-    # RSI
-    try:
-        rsi = ta.momentum.RSIIndicator(close, window=14)
-        df['RSI_14'] = rsi.rsi()
-    except Exception as e:
-        # Fallback: compute RSI manually
-        df['RSI_14'] = _compute_rsi(close, window=14)
-
-    # MACD
-    try:
-        macd = ta.trend.MACD(close)
-        df['MACD'] = macd.macd()
-        df['MACD_Signal'] = macd.macd_signal()
-    except Exception as e:
-        df['MACD'] = np.nan
-        df['MACD_Signal'] = np.nan
-
-    # Bollinger Bands
-    try:
-        bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
-        df['BB_middle'] = bb.bollinger_mavg()
-        df['BB_upper'] = bb.bollinger_hband()
-        df['BB_lower'] = bb.bollinger_lband()
-    except Exception as e:
-        df['BB_middle'] = np.nan
-        df['BB_upper'] = np.nan
-        df['BB_lower'] = np.nan
-
-    return df
 
+    # SMA_50/200, RSI_14, MACD and Bollinger Bands from one fused pass
+    # (same conventions as the `ta` indicators used previously)
+    indicators = compute_indicators(close.to_numpy(dtype=np.float64), dtype=dtype)
+    for name in INDICATOR_COLUMNS:
+        # Fresh arrays, wrapped so the frame takes them without copying
+        df[name] = pd.Series(indicators[name], index=df.index, copy=False)
 
-def _compute_rsi(close: pd.Series, window: int = 14) -> pd.Series:
-    delta = close.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return df
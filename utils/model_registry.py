@@ -0,0 +1,186 @@
+"""
+On-disk registry of trained forecasting models
+
+Entries are keyed by (ticker, period, interval, model_type, nlags, data
+fingerprint), written atomically so concurrent Streamlit sessions never see
+a half-written file, loaded with memory-mapped arrays, and evicted
+least-recently-used first once the directory exceeds its size budget.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+import joblib
+import numpy as np
+
+from utils.profiling import count, timed
+
+MODEL_CACHE_DIR = os.getenv(
+    'MODEL_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'model_cache')
+)
+MODEL_CACHE_MAX_BYTES = int(float(os.getenv('MODEL_CACHE_MAX_MB', '512')) * 1024 * 1024)
+
+_SUFFIX = '.joblib'
+
+
+def data_fingerprint(values, *extra):
+    """
+    Hash of the training data, so a new bar produces a new key
+
+    Args:
+        values: Array-like of training prices
+        extra: Additional values mixed into the hash
+
+    Returns:
+        16-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.ascontiguousarray(np.asarray(values, dtype=np.float64)).tobytes())
+    for item in extra:
+        digest.update(repr(item).encode())
+    return digest.hexdigest()
+
+
+def model_key(ticker, period, interval, model_type, nlags, fingerprint, **params):
+    """
+    Build a registry key
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Download period (e.g. '1y')
+        interval: Bar interval (e.g. '1d')
+        model_type: Type of model
+        nlags: Number of lag features
+        fingerprint: data_fingerprint of the training prices
+        params: Any other settings the stored result depends on
+
+    Returns:
+        Filesystem-safe key string
+    """
+    parts = [ticker, period, interval, model_type, f"lag{nlags}"]
+    parts += [f"{name}{params[name]}" for name in sorted(params)]
+    readable = '_'.join(re.sub(r'[^A-Za-z0-9.=-]', '-', str(p)) for p in parts)
+    return f"{readable}_{fingerprint}"
+
+
+def _path(key, cache_dir):
+    return os.path.join(cache_dir or MODEL_CACHE_DIR, key + _SUFFIX)
+
+
+def load_model(key, cache_dir=None, mmap_mode='r'):
+    """
+    Load a registry entry
+
+    Args:
+        key: Key from model_key
+        cache_dir: Registry directory (defaults to MODEL_CACHE_DIR)
+        mmap_mode: joblib memory-map mode for stored arrays (None to read fully)
+
+    Returns:
+        Stored object, or None if missing or unreadable
+    """
+    path = _path(key, cache_dir)
+    if not os.path.exists(path):
+        count('model_registry.miss')
+        return None
+
+    try:
+        obj = joblib.load(path, mmap_mode=mmap_mode)
+    except Exception as e:
+        print(f"Error loading cached model {key}: {e}")
+        count('model_registry.miss')
+        return None
+
+    count('model_registry.hit')
+
+    # Mark as recently used for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return obj
+
+
+@timed('model_registry.save')
+def save_model(key, obj, cache_dir=None, max_bytes=None):
+    """
+    Atomically store a registry entry, then enforce the size budget
+
+    Args:
+        key: Key from model_key
+        obj: Picklable object (model, metrics, ...)
+        cache_dir: Registry directory (defaults to MODEL_CACHE_DIR)
+        max_bytes: Size budget (defaults to MODEL_CACHE_MAX_BYTES)
+
+    Returns:
+        True if the entry was written
+    """
+    cache_dir = cache_dir or MODEL_CACHE_DIR
+    path = _path(key, cache_dir)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        os.close(fd)
+        # Uncompressed so arrays can be memory-mapped on load
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except OSError as e:
+        # Another session may hold the same key open (e.g. mapped on Windows);
+        # its content is equivalent because the key includes the data hash.
+        print(f"Could not cache model {key}: {e}")
+        return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    evict(cache_dir, max_bytes)
+    return True
+
+
+def evict(cache_dir=None, max_bytes=None):
+    """
+    Remove least-recently-used entries until the registry fits its budget
+
+    Args:
+        cache_dir: Registry directory (defaults to MODEL_CACHE_DIR)
+        max_bytes: Size budget (defaults to MODEL_CACHE_MAX_BYTES)
+
+    Returns:
+        Number of entries removed
+    """
+    cache_dir = cache_dir or MODEL_CACHE_DIR
+    max_bytes = MODEL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    entries = []
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.endswith(_SUFFIX):
+            continue
+        try:
+            stat = os.stat(os.path.join(cache_dir, name))
+        except OSError:
+            continue  # Removed by a concurrent session
+        entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+        except OSError:
+            pass
+        total -= size
+    return removed
@@ -3,18 +3,57 @@ News fetching and sentiment analysis module
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import threading
+import time
+
+from utils.profiling import count, timed
 
 # NewsAPI key - using free tier
 NEWSAPI_KEY = os.getenv('NEWSAPI_KEY', 'demo')
 
+# Seconds a fetched window of articles stays fresh; failed requests are
+# remembered for a shorter time so a page view still makes one call at most
+NEWS_CACHE_TTL = float(os.getenv('NEWS_CACHE_TTL', '900'))
+NEWS_FAILURE_TTL = 60.0
+
+# Pooled keep-alive session shared by every request
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# ticker -> {'fetched_at', 'ttl', 'days', 'df'}; df is None when there are no articles
+_news_cache = {}
+_news_lock = threading.Lock()
+
+# Sentinel returned by _fetch_news for network/API failures
+_FETCH_FAILED = object()
+
+
+def _evict_expired(now):
+    expired = [t for t, entry in _news_cache.items() if now - entry['fetched_at'] > entry['ttl']]
+    for ticker in expired:
+        del _news_cache[ticker]
+
+
+def _window(df, days):
+    """Articles from the last `days` days of a cached (wider) window"""
+    if df is None:
+        return None
+    from_date = (datetime.now() - timedelta(days=days)).date()
+    subset = df[df['date'] >= from_date]
+    return subset.reset_index(drop=True) if not subset.empty else None
+
 
 def fetch_news_sentiment(ticker, days=7):
     """
     Fetch recent news articles for a stock ticker
     
+    A cached fetch covering at least `days` is reused, so narrower windows
+    (e.g. headlines after a 60-day sentiment fetch) cost no network call.
+    
     Args:
         ticker: Stock ticker symbol (e.g., 'AAPL')
         days: Number of days to look back
@@ -22,6 +61,35 @@ def fetch_news_sentiment(ticker, days=7):
     Returns:
         DataFrame with columns: title, description, url, source, date, sentiment
     """
+    with _news_lock:
+        _evict_expired(time.time())
+        entry = _news_cache.get(ticker)
+        if entry is not None and entry['days'] >= days:
+            count('news.cache_hit')
+            return _window(entry['df'], days)
+    
+    count('news.cache_miss')
+    df = _fetch_news(ticker, days)
+    failed = df is _FETCH_FAILED
+    if failed:
+        df = None
+    
+    with _news_lock:
+        entry = _news_cache.get(ticker)
+        # Keep the widest window if a concurrent fetch stored one
+        if entry is None or entry['days'] <= days:
+            _news_cache[ticker] = {
+                'fetched_at': time.time(),
+                'ttl': NEWS_FAILURE_TTL if failed else NEWS_CACHE_TTL,
+                'days': days,
+                'df': df,
+            }
+    return df.copy() if df is not None else None
+
+
+@timed('news.fetch')
+def _fetch_news(ticker, days):
+    """Single NewsAPI round-trip; None when there are no articles"""
     try:
         # Calculate date range
         from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
@@ -41,7 +109,7 @@ def fetch_news_sentiment(ticker, days=7):
             'apiKey': NEWSAPI_KEY
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -69,12 +137,14 @@ def fetch_news_sentiment(ticker, days=7):
                 df = pd.DataFrame(news_list)
                 df['date'] = pd.to_datetime(df['date']).dt.date
                 return df
+            
+            return None
         
-        return None
+        return _FETCH_FAILED
     
     except Exception as e:
         print(f"Error fetching news: {e}")
-        return None
+        return _FETCH_FAILED
 
 
 def analyze_sentiment(text):
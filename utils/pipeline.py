@@ -0,0 +1,146 @@
+"""
+Concurrent data fan-out for the app's page pipeline
+
+Price bars, news and the fundamentals snapshot are independent network
+waits, so they are issued together on a bounded thread pool. Each source
+has its own timeout; a source that fails or times out is reported in
+'errors' and replaced by the same empty fallback the app used before, so
+the page degrades instead of failing.
+
+Price bars are also memoized in memory for PRICE_CACHE_TTL (what the
+app's st.cache_data wrapper used to do), so widget reruns do not re-read
+the price store and re-run its staleness checks. At most
+PRICE_MEMORY_ENTRIES frames are kept, least recently used out first.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pandas as pd
+
+from utils.data import load_data
+from utils.fundamentals import get_fundamentals
+from utils.news import fetch_news_sentiment
+from utils.price_store import PRICE_CACHE_TTL
+from utils.profiling import count, propagate, timer
+
+# Seconds each source may take before the page moves on without it
+SOURCE_TIMEOUTS = {
+    'prices': 30.0,
+    'news': 12.0,
+    'fundamentals': 20.0,
+}
+
+# Shared across Streamlit sessions; bounds concurrent outbound requests
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='page-io')
+
+# Price frames kept in memory across sessions
+PRICE_MEMORY_ENTRIES = max(1, int(os.getenv('PRICE_MEMORY_ENTRIES', '64')))
+
+_bars = OrderedDict()  # (ticker, period, interval) -> (loaded_at, DataFrame), oldest use first
+_bars_guard = threading.Lock()
+
+
+def cached_prices(ticker, period, interval, ttl=None):
+    """
+    load_data behind an in-memory cache shared by all sessions
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Download period
+        interval: Bar interval
+        ttl: Seconds a result is reused (defaults to PRICE_CACHE_TTL)
+
+    Returns:
+        OHLCV DataFrame; empty results are not cached
+    """
+    ttl = PRICE_CACHE_TTL if ttl is None else ttl
+    key = (ticker, period, interval)
+    with _bars_guard:
+        cached = _bars.get(key)
+        if cached and time.time() - cached[0] <= ttl:
+            _bars.move_to_end(key)
+            count('page_data.prices_memory_hit')
+            return cached[1]
+
+    df = load_data(ticker, period, interval)
+    if df is not None and not df.empty:
+        now = time.time()
+        with _bars_guard:
+            # Drop expired frames, then the least recently used over the limit
+            for stale in [k for k, (loaded_at, _) in _bars.items() if now - loaded_at > ttl]:
+                del _bars[stale]
+            _bars[key] = (now, df)
+            _bars.move_to_end(key)
+            while len(_bars) > PRICE_MEMORY_ENTRIES:
+                _bars.popitem(last=False)
+    return df
+
+
+def fetch_page_data(ticker, period, interval, news_days=60, timeouts=None, loader=cached_prices):
+    """
+    Fetch prices, news and fundamentals for a page concurrently
+
+    The fundamentals snapshot is the same .info record the DCF valuation
+    reads later, so that lookup is covered here as well.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Download period
+        interval: Bar interval
+        news_days: News window to fetch (None to skip news)
+        timeouts: Per-source overrides for SOURCE_TIMEOUTS
+        loader: Callable (ticker, period, interval) -> OHLCV DataFrame
+
+    Returns:
+        Dictionary with 'prices' (DataFrame), 'news' (DataFrame or None),
+        'fundamentals' (dict), 'errors' (source -> message) and
+        'timings' (source -> seconds)
+    """
+    limits = dict(SOURCE_TIMEOUTS, **(timeouts or {}))
+    fallbacks = {'prices': pd.DataFrame(), 'news': None, 'fundamentals': {}}
+
+    start = time.perf_counter()
+    timings = {}
+
+    def _timed(name, fn, *args, **kwargs):
+        def run():
+            t0 = time.perf_counter()
+            try:
+                with timer(f'page_data.{name}'):
+                    return fn(*args, **kwargs)
+            finally:
+                timings[name] = time.perf_counter() - t0
+        # Workers record into the caller's trace, if one is active
+        return _IO_POOL.submit(propagate(run))
+
+    futures = {
+        'prices': _timed('prices', loader, ticker, period, interval),
+        'fundamentals': _timed('fundamentals', get_fundamentals, ticker),
+    }
+    if news_days:
+        futures['news'] = _timed('news', fetch_news_sentiment, ticker, days=news_days)
+
+    results = {'errors': {}, 'timings': timings}
+    for name, fallback in fallbacks.items():
+        future = futures.get(name)
+        if future is None:
+            results[name] = fallback
+            continue
+        # Deadlines run from the start, since all sources are in flight together
+        remaining = max(0.0, limits[name] - (time.perf_counter() - start))
+        try:
+            value = future.result(timeout=remaining)
+            results[name] = fallback if value is None else value
+        except FutureTimeout:
+            # Left running: the caches it fills help the next rerun
+            results[name] = fallback
+            results['errors'][name] = f"timed out after {limits[name]:.0f}s"
+        except Exception as e:
+            results[name] = fallback
+            results['errors'][name] = str(e)
+
+    return results
@@ -0,0 +1,344 @@
+"""
+Local price store with batched downloads and incremental refresh
+
+Bars are cached on disk per interval and ticker (Parquet when pyarrow is
+available, pickle otherwise). A refresh downloads every stale ticker in one
+batched provider call and only appends bars newer than the last cached
+timestamp. If the provider fails, cached bars are served as-is so the app
+keeps working offline.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.profiling import count, timer
+
+PRICE_CACHE_DIR = os.getenv(
+    'PRICE_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'price_cache')
+)
+# Seconds before cached bars are considered stale and refreshed
+PRICE_CACHE_TTL = float(os.getenv('PRICE_CACHE_TTL', '900'))
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+_FORMAT = 'parquet' if importlib.util.find_spec('pyarrow') else 'pickle'
+
+_PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183, '1y': 366,
+    '2y': 731, '5y': 1827, '10y': 3653,
+}
+
+_INTERVAL_FREQ = {
+    '1m': 'min', '5m': '5min', '15m': '15min', '30m': '30min', '1h': 'h', '60m': 'h',
+    '1d': 'B', '1wk': 'W-FRI', '1mo': 'MS',
+}
+
+
+def period_days(period):
+    """Length of a yfinance period string in days (None for 'max')"""
+    if period in _PERIOD_DAYS:
+        return _PERIOD_DAYS[period]
+    match = re.fullmatch(r'(\d+)(d|mo|y)', str(period))
+    if match:
+        n, unit = int(match.group(1)), match.group(2)
+        return n * {'d': 1, 'mo': 31, 'y': 366}[unit]
+    if period == 'ytd':
+        return pd.Timestamp.now().dayofyear
+    return None
+
+
+def normalize_bars(data, ticker=None):
+    """
+    Flatten a yfinance frame to plain OHLCV columns
+
+    Args:
+        data: DataFrame, possibly with (Price, Ticker) MultiIndex columns
+        ticker: Ticker to select when the columns hold several
+
+    Returns:
+        DataFrame with a sorted, de-duplicated DatetimeIndex
+    """
+    if data is None or data.empty:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    if isinstance(data.columns, pd.MultiIndex):
+        for level in range(data.columns.nlevels):
+            values = data.columns.get_level_values(level)
+            if ticker is not None and ticker in values:
+                data = data.xs(ticker, axis=1, level=level)
+                break
+        else:
+            data = data.copy()
+            data.columns = data.columns.get_level_values(0)
+
+    data = data[[c for c in PRICE_COLUMNS if c in data.columns]]
+    data.index = pd.to_datetime(data.index)
+    data = data[~data.index.duplicated(keep='last')].sort_index()
+    return data.dropna(how='all')
+
+
+class YFinanceProvider:
+    """Downloads bars for many tickers in one yfinance call"""
+
+    def fetch(self, tickers, interval, period=None, start=None):
+        """
+        Args:
+            tickers: List of ticker symbols
+            interval: Bar interval
+            period: yfinance period (used when start is None)
+            start: Earliest timestamp to download
+
+        Returns:
+            Dict of ticker -> DataFrame of bars
+        """
+        import yfinance as yf
+
+        kwargs = {'start': start} if start is not None else {'period': period}
+        data = yf.download(
+            list(tickers), interval=interval, group_by='ticker', progress=False,
+            threads=True, **kwargs
+        )
+        return {t: normalize_bars(data, t) for t in tickers}
+
+
+class FakeProvider:
+    """
+    Deterministic synthetic bars for tests and offline development
+
+    Each ticker gets a seeded random walk ending at `end`; advance() adds
+    new bars so incremental refreshes can be exercised without network.
+    """
+
+    def __init__(self, end='2024-12-31', periods=1500, seed=0):
+        self.end = pd.Timestamp(end)
+        self.periods = periods
+        self.seed = seed
+        self.calls = []
+
+    def advance(self, bars=1, interval='1d'):
+        freq = _INTERVAL_FREQ.get(interval, 'D')
+        self.end = pd.date_range(self.end, periods=bars + 1, freq=freq)[-1]
+
+    def _bars(self, ticker, interval):
+        freq = _INTERVAL_FREQ.get(interval, 'D')
+        rng = np.random.default_rng([self.seed, sum(map(ord, ticker))])
+        # Fixed origin so overlapping requests return identical bars
+        origin = pd.Timestamp('2000-01-03')
+        index = pd.date_range(origin, self.end, freq=freq)
+        # One row of draws per bar keeps earlier bars stable as `end` moves
+        draws = rng.standard_normal((len(index), 3))
+        close = 100 * np.exp(np.cumsum(0.01 * draws[:, 0]))
+        spread = np.abs(0.005 * draws[:, 1]) * close
+        return pd.DataFrame({
+            'Open': close - spread / 2,
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Adj Close': close,
+            'Volume': np.round(1e5 * (1 + np.abs(draws[:, 2]))),
+        }, index=index)
+
+    def fetch(self, tickers, interval, period=None, start=None):
+        self.calls.append({'tickers': list(tickers), 'interval': interval,
+                           'period': period, 'start': start})
+        out = {}
+        for ticker in tickers:
+            bars = self._bars(ticker, interval)
+            if start is not None:
+                bars = bars[bars.index >= pd.Timestamp(start)]
+            else:
+                days = period_days(period)
+                bars = bars.iloc[-self.periods:]
+                if days is not None:
+                    bars = bars[bars.index > self.end - pd.Timedelta(days=days)]
+            out[ticker] = bars
+        return out
+
+
+class PriceStore:
+    """
+    On-disk bar cache partitioned by interval and ticker
+
+    Args:
+        root: Cache directory (defaults to PRICE_CACHE_DIR)
+        provider: Object with fetch(tickers, interval, period=, start=)
+        ttl: Seconds before a cached ticker is refreshed
+    """
+
+    def __init__(self, root=None, provider=None, ttl=None):
+        self.root = root or PRICE_CACHE_DIR
+        self.provider = provider or YFinanceProvider()
+        self.ttl = PRICE_CACHE_TTL if ttl is None else ttl
+
+    def _paths(self, ticker, interval):
+        safe = re.sub(r'[^A-Za-z0-9.^=-]', '_', ticker)
+        folder = os.path.join(self.root, f"interval={interval}")
+        ext = 'parquet' if _FORMAT == 'parquet' else 'pkl'
+        return folder, os.path.join(folder, f"{safe}.{ext}"), os.path.join(folder, f"{safe}.json")
+
+    def read(self, ticker, interval):
+        """Cached bars and metadata for a ticker (None, {} if not cached)"""
+        _, data_path, meta_path = self._paths(ticker, interval)
+        try:
+            if _FORMAT == 'parquet':
+                bars = pd.read_parquet(data_path)
+            else:
+                bars = pd.read_pickle(data_path)
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None, {}
+        return bars, meta
+
+    def write(self, ticker, interval, bars, meta):
+        """Atomically replace the cached bars and metadata for a ticker"""
+        folder, data_path, meta_path = self._paths(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+        if bars is not None:
+            _atomic_write(folder, data_path, lambda p: (
+                bars.to_parquet(p) if _FORMAT == 'parquet' else bars.to_pickle(p)
+            ))
+        _atomic_write(folder, meta_path, lambda p: _write_json(p, meta))
+
+    def _needs_full_download(self, bars, meta, period):
+        if bars is None or bars.empty:
+            return True
+        wanted, have = period_days(period), period_days(meta.get('period'))
+        if have is None:
+            return False  # Cache already holds 'max'
+        return wanted is None or wanted > have
+
+    def refresh(self, tickers, interval, period):
+        """
+        Bring cached bars up to date, batching the provider calls
+
+        Args:
+            tickers: List of ticker symbols
+            interval: Bar interval
+            period: History the cache must cover
+
+        Returns:
+            Dict of ticker -> full cached bars (may be empty)
+        """
+        now = time.time()
+        cached, full, incremental = {}, [], []
+        for ticker in tickers:
+            bars, meta = self.read(ticker, interval)
+            cached[ticker] = (bars, meta)
+            if self._needs_full_download(bars, meta, period):
+                full.append(ticker)
+            elif now - meta.get('fetched_at', 0) > self.ttl:
+                incremental.append(ticker)
+        count('prices.cache_hit', len(tickers) - len(full) - len(incremental))
+        count('prices.full_download', len(full))
+        count('prices.incremental', len(incremental))
+
+        downloads = {}
+        try:
+            if full:
+                with timer('prices.download'):
+                    fetched = self.provider.fetch(full, interval, period=period)
+                downloads.update({t: (b, period) for t, b in fetched.items()})
+            if incremental:
+                start = min(cached[t][0].index[-1] for t in incremental)
+                with timer('prices.download'):
+                    fetched = self.provider.fetch(incremental, interval, start=start)
+                downloads.update({t: (b, cached[t][1].get('period', period)) for t, b in fetched.items()})
+        except Exception as e:
+            print(f"Price download failed, serving cached bars: {e}")
+
+        out = {}
+        for ticker in tickers:
+            bars, meta = cached[ticker]
+            if ticker in downloads:
+                new_bars, covered = downloads[ticker]
+                new_bars = normalize_bars(new_bars)
+                meta = {'period': covered, 'fetched_at': now}
+                if new_bars.empty:
+                    if bars is not None and not bars.empty:
+                        self.write(ticker, interval, None, meta)  # Nothing new yet
+                elif bars is not None and not bars.empty and ticker not in full:
+                    # Only bars newer than the last cached timestamp; the
+                    # last cached bar itself is replaced as it may have
+                    # been an in-progress bar.
+                    last = bars.index[-1]
+                    new_bars = new_bars[new_bars.index >= last]
+                    bars = pd.concat([bars[bars.index < last], new_bars])
+                    self.write(ticker, interval, bars, meta)
+                else:
+                    bars = new_bars
+                    self.write(ticker, interval, bars, meta)
+            out[ticker] = bars if bars is not None else pd.DataFrame(columns=PRICE_COLUMNS)
+        return out
+
+    def get_many(self, tickers, period, interval):
+        """
+        Bars for the requested period for many tickers
+
+        Args:
+            tickers: List of ticker symbols
+            period: Download period (e.g. '1y')
+            interval: Bar interval (e.g. '1d')
+
+        Returns:
+            Dict of ticker -> DataFrame
+        """
+        tickers = list(dict.fromkeys(tickers))
+        return {t: slice_period(b, period) for t, b in self.refresh(tickers, interval, period).items()}
+
+    def get(self, ticker, period, interval):
+        """Bars for one ticker (see get_many)"""
+        return self.get_many([ticker], period, interval)[ticker]
+
+
+def _write_json(path, obj):
+    with open(path, 'w') as fh:
+        json.dump(obj, fh)
+
+
+def _atomic_write(folder, path, writer):
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    os.close(fd)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def slice_period(bars, period):
+    """
+    Trailing window of bars matching a yfinance period
+
+    'Nd' periods keep the last N trading dates; longer ones keep bars
+    within the period of the last bar.
+    """
+    if bars is None or bars.empty:
+        return bars
+    days = period_days(period)
+    if days is None:
+        return bars
+    if re.fullmatch(r'\d+d', str(period)):
+        dates = bars.index.normalize()
+        keep = dates.unique()[-days:]
+        return bars[dates.isin(keep)]
+    return bars[bars.index > bars.index[-1] - pd.Timedelta(days=days)]
+
+
+_DEFAULT_STORE = None
+
+
+def get_store():
+    """Process-wide PriceStore using the yfinance provider"""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = PriceStore()
+    return _DEFAULT_STORE
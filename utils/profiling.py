@@ -0,0 +1,230 @@
+"""
+Lightweight stage timers and cache counters
+
+Timers (the `timer` context manager and `timed` decorator) and counters
+(`count`) record into the active request trace and into process-wide
+totals. Recording happens only while a trace is active or when the
+STOCK_PROFILE environment variable is set; otherwise each call is a single
+check and returns immediately, so instrumented code pays close to nothing.
+
+A trace is started per page run with `trace(...)` or begin_trace(). When
+it ends, its spans and counters are appended as one JSON line to
+PROFILE_LOG.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+PROFILING_ENABLED = os.getenv('STOCK_PROFILE', '').lower() in ('1', 'true', 'yes')
+# Finished traces are appended here as JSON lines ('' disables the log)
+PROFILE_LOG = os.getenv(
+    'PROFILE_LOG', os.path.join(os.path.dirname(__file__), 'profile_logs', 'traces.jsonl')
+)
+
+_current = contextvars.ContextVar('profile_trace', default=None)
+_depth = contextvars.ContextVar('profile_depth', default=0)
+_NOOP = nullcontext()
+
+_totals_lock = threading.Lock()
+_timer_totals = defaultdict(lambda: [0, 0.0])  # name -> [calls, seconds]
+_counter_totals = defaultdict(int)
+
+
+class Trace:
+    """Spans and counters recorded during one request"""
+
+    def __init__(self, label, **meta):
+        self.label = label
+        self.meta = meta
+        self.started = time.time()
+        self.finished = None
+        self.spans = []  # (name, start offset, seconds, depth)
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add_span(self, name, start, seconds, depth):
+        with self._lock:
+            self.spans.append((name, start - self.started, seconds, depth))
+
+    def add_count(self, name, n):
+        with self._lock:
+            self.counters[name] += n
+
+    def stage_totals(self):
+        """Seconds per span name, summed over repeated calls"""
+        totals = defaultdict(float)
+        for name, _, seconds, _ in self.spans:
+            totals[name] += seconds
+        return dict(totals)
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'wall_time': (self.finished or time.time()) - self.started,
+            'meta': self.meta,
+            'spans': [
+                {'name': name, 'offset': offset, 'seconds': seconds, 'depth': depth}
+                for name, offset, seconds, depth in self.spans
+            ],
+            'counters': dict(self.counters),
+        }
+
+
+def is_active():
+    """True when timers and counters are recording"""
+    return PROFILING_ENABLED or _current.get() is not None
+
+
+def current_trace():
+    """Trace active in this context, or None"""
+    return _current.get()
+
+
+@contextmanager
+def _timing(name, active):
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    wall_start = time.time()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _depth.reset(token)
+        if active is not None:
+            active.add_span(name, wall_start, seconds, depth)
+        with _totals_lock:
+            totals = _timer_totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+
+def timer(name):
+    """Context manager timing the enclosed block as stage `name`"""
+    active = _current.get()
+    if active is None and not PROFILING_ENABLED:
+        return _NOOP
+    return _timing(name, active)
+
+
+def timed(name=None):
+    """Decorator timing every call of the wrapped function"""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            active = _current.get()
+            if active is None and not PROFILING_ENABLED:
+                return fn(*args, **kwargs)
+            with _timing(label, active):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """Increment counter `name` (e.g. 'news.cache_hit')"""
+    active = _current.get()
+    if active is None and not PROFILING_ENABLED:
+        return
+    if active is not None:
+        active.add_count(name, n)
+    with _totals_lock:
+        _counter_totals[name] += n
+
+
+def begin_trace(label, **meta):
+    """
+    Start recording a trace in the current context
+
+    For scripts that cannot wrap their body in `trace()` (e.g. a Streamlit
+    page); a trace left open is replaced by the next begin_trace.
+    """
+    active = Trace(label, **meta)
+    _current.set(active)
+    return active
+
+
+def end_trace(active, log_path=None):
+    """
+    Stop recording and append the trace to log_path (or PROFILE_LOG)
+
+    Returns:
+        The finished Trace
+    """
+    if _current.get() is active:
+        _current.set(None)
+    active.finished = time.time()
+    path = log_path or PROFILE_LOG
+    if path:
+        write_trace(active, path)
+    return active
+
+
+@contextmanager
+def trace(label, log_path=None, **meta):
+    """
+    Record everything timed or counted in this context as one trace
+
+    Args:
+        label: Name of the request (e.g. 'page')
+        log_path: JSONL file to append the finished trace to
+            (defaults to PROFILE_LOG; nothing is written if neither is set)
+        meta: Extra fields stored with the trace (ticker, period, ...)
+
+    Yields:
+        The Trace being recorded
+    """
+    previous = _current.get()
+    active = begin_trace(label, **meta)
+    try:
+        yield active
+    finally:
+        end_trace(active, log_path)
+        _current.set(previous)
+
+
+def write_trace(active, path):
+    """Append a finished trace to a JSONL file"""
+    try:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        line = json.dumps(active.to_dict(), default=str)
+        with _totals_lock, open(path, 'a') as fh:
+            fh.write(line + '\n')
+    except OSError as e:
+        print(f"Could not write profile trace: {e}")
+
+
+def propagate(fn):
+    """Wrap fn so it runs in the caller's trace when submitted to a thread pool"""
+    if _current.get() is None:
+        return fn
+    context = contextvars.copy_context()
+    return functools.partial(context.run, fn)
+
+
+def totals():
+    """Process-wide timer ({name: {'calls', 'seconds'}}) and counter totals"""
+    with _totals_lock:
+        return {
+            'timers': {k: {'calls': c, 'seconds': s} for k, (c, s) in _timer_totals.items()},
+            'counters': dict(_counter_totals),
+        }
+
+
+def reset_totals():
+    """Clear the process-wide totals"""
+    with _totals_lock:
+        _timer_totals.clear()
+        _counter_totals.clear()
@@ -0,0 +1,238 @@
+"""
+Multi-ticker watchlist scanner
+
+Runs the same pipeline the app runs for one ticker (prices -> indicators
+-> signals -> forecast -> score) across a universe on a shared process
+pool, yielding each result as soon as its worker finishes.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.compute import configure
+from utils.data import load_data, load_many
+from utils.forecast_v2 import train_and_forecast
+from utils.fundamentals import get_fundamentals
+from utils.indicators import add_technical_indicators
+from utils.scoring import generate_complete_score
+from utils.shared_prices import SharedPrices
+from utils.signals import generate_signals, get_latest_signal
+
+STAGES = ('load', 'indicators', 'signals', 'forecast', 'fundamentals', 'score')
+
+_POOL = None
+_POOL_WORKERS = None
+
+
+def get_pool(workers=None):
+    """
+    Process-wide worker pool, created on first use and reused across scans
+
+    Args:
+        workers: Number of worker processes (defaults to all cores)
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    global _POOL, _POOL_WORKERS
+    workers = workers or os.cpu_count() or 1
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        # Workers already use one core each, so their fits stay single-threaded
+        _POOL = ProcessPoolExecutor(max_workers=workers, initializer=configure,
+                                    initargs=(1, 1))
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def shutdown_pool():
+    """Stop the worker pool; the next get_pool() starts fresh workers"""
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=True, cancel_futures=True)
+    _POOL = _POOL_WORKERS = None
+
+
+def analyze_ticker(ticker, period='1y', interval='1d', days=7, model_type='arima', nlags=10,
+                   test_size=0.2, with_fundamentals=False, loader=load_data):
+    """
+    Full single-ticker pipeline with per-stage timings
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Download period
+        interval: Bar interval
+        days: Forecast horizon
+        model_type: Forecast model type
+        nlags: Number of lag features
+        test_size: Backtest test set proportion
+        with_fundamentals: Fetch yfinance fundamentals for the score
+        loader: Callable (ticker, period, interval) -> OHLCV DataFrame
+
+    Returns:
+        Dictionary with score, recommendation, forecast summary, timings
+        and an 'error' entry (None on success)
+    """
+    timings = {}
+    result = {'ticker': ticker, 'score': None, 'recommendation': None, 'error': None,
+              'timings': timings}
+
+    def _stage(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    try:
+        df = _stage('load', loader, ticker, period, interval)
+        if df is None or df.empty:
+            result['error'] = 'no data'
+            return result
+
+        df_ind = _stage('indicators', add_technical_indicators, df)
+        df_ind = _stage('signals', generate_signals, df_ind)
+
+        close = df_ind['Close'].squeeze()
+        if hasattr(close, 'columns'):
+            close = close.iloc[:, 0]
+        close = close.ffill()
+        current_price = float(close.iloc[-1])
+
+        _, forecast, backtest_metrics = _stage(
+            'forecast', train_and_forecast, close, days=days, model_type=model_type,
+            nlags=nlags, test_size=test_size, ticker=ticker, period=period, interval=interval
+        )
+        backtest_metrics = {k: v for k, v in backtest_metrics.items() if k != 'model'}
+
+        fundamentals = _stage('fundamentals', get_fundamentals, ticker) if with_fundamentals else {}
+
+        score = _stage(
+            'score', generate_complete_score, ticker=ticker, indicators_df=df_ind,
+            current_price=current_price, fundamentals=fundamentals,
+            backtest_metrics=backtest_metrics, sentiment_data={}
+        )
+
+        result.update({
+            'price': current_price,
+            'signal': get_latest_signal(df_ind),
+            'forecast_return': (
+                float(forecast[-1] / current_price - 1)
+                if forecast is not None and len(forecast) > 0 else None
+            ),
+            'backtest': backtest_metrics,
+        })
+        if not score:
+            # Callers format the score of every error-free result
+            result['error'] = 'no score'
+            return result
+        result['score'] = float(score['overall_score'])
+        result['recommendation'] = score['summary']['recommendation']
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def _analyze_shared(prices, ticker, **options):
+    """Pool task: analyze a ticker whose bars are in a SharedPrices store"""
+    try:
+        return analyze_ticker(ticker, loader=prices.load, **options)
+    finally:
+        prices.close()
+
+
+def scan_tickers(tickers, workers=None, **options):
+    """
+    Analyze many tickers in parallel, yielding results as they complete
+
+    Args:
+        tickers: Iterable of ticker symbols
+        workers: Worker processes (None = all cores, 0 = run in this process)
+        options: Keyword arguments forwarded to analyze_ticker
+
+    Yields:
+        Result dictionaries from analyze_ticker, in completion order
+    """
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+
+    frames = {}
+    if options.get('loader', load_data) is load_data:
+        # One batched download fills the price store
+        try:
+            frames = load_many(tickers, options.get('period', '1y'), options.get('interval', '1d'))
+        except Exception as e:
+            print(f"Batch price prefetch failed: {e}")
+
+    if workers == 0:
+        for ticker in tickers:
+            yield analyze_ticker(ticker, **options)
+        return
+
+    # Workers attach to the downloaded bars in shared memory; tickers the
+    # batch missed still go through the loader
+    shared = SharedPrices.from_frames(frames) if frames else None
+    try:
+        pool = get_pool(workers)
+        futures = {}
+        for ticker in tickers:
+            if shared is not None and ticker in shared:
+                shared_options = {k: v for k, v in options.items() if k != 'loader'}
+                futures[pool.submit(_analyze_shared, shared, ticker, **shared_options)] = ticker
+            else:
+                futures[pool.submit(analyze_ticker, ticker, **options)] = ticker
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker crashed before it could report
+                yield {'ticker': futures[future], 'score': None, 'recommendation': None,
+                       'error': str(e), 'timings': {}}
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+def rank_results(results):
+    """
+    Order results best score first; failed tickers go last
+
+    Args:
+        results: Iterable of analyze_ticker results
+
+    Returns:
+        Sorted list of results
+    """
+    return sorted(results, key=lambda r: (r.get('score') is None, -(r.get('score') or 0.0)))
+
+
+def summarize_timings(results, wall_time):
+    """
+    Per-stage timing totals and overall throughput
+
+    Args:
+        results: List of analyze_ticker results
+        wall_time: Elapsed wall-clock seconds for the scan
+
+    Returns:
+        Dictionary with per-stage total/mean seconds, ticker counts and
+        tickers_per_second
+    """
+    stages = {}
+    for stage in STAGES:
+        values = [r['timings'][stage] for r in results if stage in r.get('timings', {})]
+        if values:
+            stages[stage] = {'total': float(np.sum(values)), 'mean': float(np.mean(values))}
+
+    return {
+        'tickers': len(results),
+        'failed': sum(1 for r in results if r.get('error')),
+        'wall_time': wall_time,
+        'tickers_per_second': len(results) / wall_time if wall_time > 0 else 0.0,
+        'stages': stages,
+    }
@@ -6,6 +6,8 @@ Combines technical, fundamental, forecast, and sentiment signals
 import numpy as np
 import pandas as pd
 
+from utils.profiling import timed
+
 
 def calculate_technical_score(indicators_df):
     """
@@ -310,9 +312,11 @@ def calculate_forecast_score(backtest_metrics):
     Calculate forecast confidence score (0-10)
     
     Components:
-    - Direction Accuracy (0.50 weight)
-    - Prediction Accuracy/MAE (0.35 weight)
-    - Sample Size (0.15 weight)
+    - Direction Accuracy (0.40 weight)
+    - Prediction Accuracy/MAE (0.30 weight)
+    - Sample Size (0.10 weight)
+    - Forecast Spread (0.20 weight): width of the forecast bands, as the
+      one-step relative volatility in 'forecast_spread'
     """
     try:
         if not backtest_metrics:
@@ -396,11 +400,33 @@ def calculate_forecast_score(backtest_metrics):
         else:
             components['Sample Size'] = {'score': 5.0, 'reason': 'Sample info not available'}
         
+        # Forecast Spread (narrower bands = more certain forecast)
+        spread = backtest_metrics.get('forecast_spread')
+        if spread is not None and not np.isnan(spread):
+            spread = float(spread)
+            if spread < 0.01:
+                spread_score = 8.0
+                spread_reason = f"Tight bands ({spread*100:.1f}% per step)"
+            elif spread < 0.02:
+                spread_score = 6.5
+                spread_reason = f"Moderate bands ({spread*100:.1f}% per step)"
+            elif spread < 0.035:
+                spread_score = 5.0
+                spread_reason = f"Wide bands ({spread*100:.1f}% per step)"
+            else:
+                spread_score = 3.0
+                spread_reason = f"Very wide bands ({spread*100:.1f}% per step)"
+            
+            components['Forecast Spread'] = {'score': spread_score, 'reason': spread_reason}
+        else:
+            components['Forecast Spread'] = {'score': 5.0, 'reason': 'Forecast bands not available'}
+        
         # Calculate weighted score
         weights = {
-            'Direction Accuracy': 0.50,
-            'Prediction Accuracy': 0.35,
-            'Sample Size': 0.15
+            'Direction Accuracy': 0.40,
+            'Prediction Accuracy': 0.30,
+            'Sample Size': 0.10,
+            'Forecast Spread': 0.20
         }
         
         total_score = 0
@@ -541,6 +567,7 @@ def calculate_sentiment_score(sentiment_data):
         }
 
 
+@timed('score')
 def generate_complete_score(ticker, indicators_df, current_price, fundamentals, 
                           backtest_metrics, sentiment_data):
     """
@@ -0,0 +1,254 @@
+"""
+Universe price matrix in shared memory
+
+SharedPrices holds aligned (fields x tickers x time) float64 bars plus the
+timestamp index in one multiprocessing.shared_memory segment. Pickling a
+SharedPrices only sends the segment name and the ticker/field labels, so a
+worker process that receives one attaches to the same pages instead of
+unpickling a copy of every DataFrame.
+
+Accessors return read-only views: values() is the (tickers x time) matrix
+of one field, prices() a ticker's 1-D series from its first bar, and
+frame() a ticker's OHLCV DataFrame backed by the shared block (only
+tickers with gaps inside the aligned index get a compacted copy). The
+indicator, signal, forecast and scoring functions take these as they take
+downloaded data.
+
+The process that creates the store owns the segment and unlinks it on
+exit from its `with` block; attached copies only close their mapping.
+"""
+
+import gc
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+SHARED_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _attach_segment(name):
+    """Open an existing segment without registering it with the resource tracker"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 every attach registers the segment, and a worker's own
+    # tracker would unlink it (with a leak warning) when the worker exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedPrices:
+    """Aligned bars of a ticker universe in one shared memory segment"""
+
+    def __init__(self, segment, tickers, fields, length, datetime_index=True, tz=None, unit='ns',
+                 owner=False):
+        self._segment = segment
+        self.tickers = list(tickers)
+        self.fields = list(fields)
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._columns = {field: i for i, field in enumerate(self.fields)}
+        self._datetime_index = datetime_index
+        self._tz = tz
+        self._unit = unit
+        self._owner = owner
+
+        # Layout: int64 timestamps (ns), then float64 data
+        stamps = np.ndarray((length,), dtype=np.int64, buffer=segment.buf)
+        data = np.ndarray((len(self.fields), len(self.tickers), length), dtype=np.float64,
+                          buffer=segment.buf, offset=stamps.nbytes)
+        stamps.flags.writeable = False
+        data.flags.writeable = False
+        self._stamps, self._data = stamps, data
+        self._index = None
+
+    @classmethod
+    def _create(cls, tickers, index, fields, fill):
+        """
+        New owned store and a writable view of its data
+
+        fill(data) writes the (fields x tickers x time) values straight
+        into the segment, so nothing is staged in a private array first.
+        """
+        datetime_index = isinstance(index, pd.DatetimeIndex)
+        tz = str(index.tz) if datetime_index and index.tz is not None else None
+        unit = index.unit if datetime_index else 'ns'
+        if datetime_index:
+            stamps = (index.tz_convert('UTC').tz_localize(None) if tz else index).as_unit('ns').asi8
+        else:
+            stamps = np.asarray(index, dtype=np.int64)
+
+        shape = (len(fields), len(tickers), len(index))
+        segment = shared_memory.SharedMemory(create=True, size=max(stamps.nbytes + 8 * int(np.prod(shape)), 1))
+        try:
+            np.ndarray(stamps.shape, dtype=np.int64, buffer=segment.buf)[:] = stamps
+            fill(np.ndarray(shape, dtype=np.float64, buffer=segment.buf, offset=stamps.nbytes))
+            return cls(segment, tickers, fields, len(index), datetime_index=datetime_index, tz=tz, unit=unit,
+                       owner=True)
+        except Exception:
+            segment.close()
+            segment.unlink()
+            raise
+
+    @classmethod
+    def from_arrays(cls, data, tickers, index, fields=SHARED_FIELDS):
+        """
+        Copy a (fields x tickers x time) array into a new segment
+
+        Args:
+            data: Array shaped (len(fields), len(tickers), len(index)), or
+                (len(tickers), len(index)) for a single field
+            tickers: Ticker labels
+            index: DatetimeIndex of the time axis (or None for a range)
+            fields: Field labels
+
+        Returns:
+            SharedPrices owning the segment
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 2:
+            data = data[None]
+        fields = list(fields)[:len(data)]
+        if index is None:
+            index = pd.RangeIndex(data.shape[-1])
+        if data.shape != (len(fields), len(tickers), len(index)):
+            raise ValueError(f"data shape {data.shape} does not match fields, tickers and index")
+
+        def fill(out):
+            out[:] = data
+        return cls._create(tickers, index, fields, fill)
+
+    @classmethod
+    def from_frames(cls, frames, fields=None):
+        """
+        Align OHLCV DataFrames on the union of their timestamps
+
+        Args:
+            frames: Dict of ticker -> DataFrame (empty or None entries are skipped)
+            fields: Columns to keep (defaults to the SHARED_FIELDS present in
+                any frame)
+
+        Returns:
+            SharedPrices owning the segment; bars a ticker lacks are NaN
+        """
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        if fields is None:
+            present = set().union(*(df.columns for df in frames.values())) if frames else set()
+            fields = [f for f in SHARED_FIELDS if f in present] or ['Close']
+        index = None
+        for df in frames.values():
+            if index is None:
+                index = df.index
+            elif not df.index.equals(index):
+                index = index.union(df.index)
+        index = pd.DatetimeIndex([]) if index is None else index
+
+        def fill(out):
+            for i, df in enumerate(frames.values()):
+                # One (time x fields) block per frame; missing columns come back NaN
+                values = df.reindex(columns=fields).to_numpy(dtype=np.float64).T
+                if df.index.equals(index):
+                    out[:, i] = values
+                else:
+                    out[:, i] = np.nan
+                    out[:, i, index.get_indexer(df.index)] = values
+        return cls._create(list(frames), index, fields, fill)
+
+    @classmethod
+    def _attach(cls, name, tickers, fields, length, datetime_index, tz, unit):
+        return cls(_attach_segment(name), tickers, fields, length, datetime_index=datetime_index, tz=tz,
+                   unit=unit)
+
+    def __reduce__(self):
+        return SharedPrices._attach, (self.name, self.tickers, self.fields, len(self._stamps),
+                                      self._datetime_index, self._tz, self._unit)
+
+    @property
+    def name(self):
+        return self._segment.name
+
+    @property
+    def nbytes(self):
+        return self._stamps.nbytes + self._data.nbytes
+
+    @property
+    def index(self):
+        """Time axis (rebuilt once per process from the shared timestamps)"""
+        if self._index is None:
+            if not self._datetime_index:
+                self._index = pd.Index(self._stamps.copy())
+            else:
+                self._index = pd.DatetimeIndex(self._stamps.view('M8[ns]')).as_unit(self._unit)
+                if self._tz:
+                    self._index = self._index.tz_localize('UTC').tz_convert(self._tz)
+        return self._index
+
+    def __contains__(self, ticker):
+        return ticker in self._rows
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def values(self, field='Close'):
+        """(tickers x time) read-only view of one field"""
+        return self._data[self._columns[field]]
+
+    def _first_bar(self, row):
+        valid = ~np.isnan(self._data[self._columns.get('Close', 0), row])
+        return int(valid.argmax()) if valid.any() else len(valid)
+
+    def prices(self, ticker, field='Close'):
+        """A ticker's read-only series from its first bar"""
+        row = self._rows[ticker]
+        return self._data[self._columns[field], row, self._first_bar(row):]
+
+    def frame(self, ticker):
+        """
+        A ticker's bars as a DataFrame over the shared block
+
+        Rows before the ticker's first bar are cut off. If it is missing
+        bars inside the aligned index (other tickers trade on days it does
+        not), those rows are dropped, which copies.
+        """
+        row = self._rows[ticker]
+        start = self._first_bar(row)
+        block = self._data[:, row, start:].T
+        frame = pd.DataFrame(block, index=self.index[start:], columns=self.fields, copy=False)
+        missing = np.isnan(block).all(axis=1)
+        return frame[~missing] if missing.any() else frame
+
+    def load(self, ticker, period=None, interval=None):
+        """Loader with load_data's signature; empty DataFrame for unknown tickers"""
+        if ticker not in self._rows:
+            return pd.DataFrame()
+        return self.frame(ticker)
+
+    def close(self):
+        """Drop this process's mapping; views handed out must be gone by now"""
+        if self._segment is None:
+            return
+        self._stamps = self._data = self._index = None
+        if self._owner:
+            # Attached workers keep their mappings; the name goes away now
+            self._segment.unlink()
+            self._owner = False
+        try:
+            self._segment.close()
+        except BufferError:
+            # A reference cycle may still hold a view; collect and retry once
+            gc.collect()
+            try:
+                self._segment.close()
+            except BufferError:
+                return
+        self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
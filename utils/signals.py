@@ -1,7 +1,94 @@
+import numpy as np
 import pandas as pd
 
+from utils.indicator_kernels import compute_indicators
+from utils.profiling import timed
 
-def generate_signals(df: pd.DataFrame) -> pd.DataFrame:
+# Compact signal codes (int8); SELL < HOLD < BUY so codes sort by conviction
+SELL, HOLD, BUY = -1, 0, 1
+SIGNAL_LABELS = np.array(['SELL', 'HOLD', 'BUY'], dtype=object)
+
+
+def signal_codes(close, rsi=None, sma50=None, sma200=None, rsi_buy=30, rsi_sell=70):
+    """
+    Vectorized signal rules on aligned arrays of any shape
+    
+    Inputs broadcast against each other, so the same call handles one
+    series, a (tickers x time) matrix or just the latest column. Missing
+    indicators (None) disable the rules that need them, and NaN values
+    never trigger a rule.
+    
+    Returns:
+        int8 array of BUY/SELL/HOLD codes shaped like close
+    """
+    close = np.asarray(close, dtype=float)
+    codes = np.zeros(close.shape, dtype=np.int8)
+    
+    if rsi is not None and sma50 is not None:
+        # Buy: oversold and price above 50-day MA
+        codes[(np.asarray(rsi) < rsi_buy) & (close > np.asarray(sma50))] = BUY
+    
+    # Sell (takes precedence): overbought or price below 200-day MA
+    sell = np.zeros(close.shape, dtype=bool)
+    if rsi is not None:
+        sell |= np.asarray(rsi) > rsi_sell
+    if sma200 is not None:
+        sell |= close < np.asarray(sma200)
+    codes[sell] = SELL
+    return codes
+
+
+def signal_labels(codes):
+    """Map int8 signal codes to 'BUY'/'SELL'/'HOLD' strings"""
+    return SIGNAL_LABELS[np.asarray(codes, dtype=np.intp) + 1]
+
+
+def signal_categorical(codes):
+    """int8 signal codes as a pandas Categorical (no string copies)"""
+    return pd.Categorical.from_codes(
+        np.asarray(codes, dtype=np.int8) + 1, categories=list(SIGNAL_LABELS)
+    )
+
+
+def universe_signals(close, indicators=None, latest_only=False, rsi_buy=30, rsi_sell=70):
+    """
+    Signals for a whole universe in one call
+    
+    Args:
+        close: (tickers x time) matrix of closes, aligned on a common index
+        indicators: Output of compute_indicators(close); computed if omitted
+        latest_only: Only evaluate the last bar of each ticker
+        rsi_buy: RSI level below which a BUY can trigger
+        rsi_sell: RSI level above which a SELL triggers
+    
+    Returns:
+        int8 codes, (tickers x time) or (tickers,) when latest_only
+    """
+    close = np.asarray(close, dtype=float)
+    if indicators is None:
+        indicators = compute_indicators(close)
+    
+    def col(values):
+        return values[..., -1] if latest_only else values
+    
+    return signal_codes(
+        col(close), col(indicators['RSI_14']), col(indicators['SMA_50']),
+        col(indicators['SMA_200']), rsi_buy=rsi_buy, rsi_sell=rsi_sell
+    )
+
+
+def _column(df, name):
+    if name not in df.columns:
+        return None
+    values = df[name].squeeze()
+    if isinstance(values, pd.DataFrame):
+        values = values.iloc[:, 0]
+    return np.asarray(values, dtype=float)
+
+
+@timed('signals')
+def generate_signals(df: pd.DataFrame, rsi_buy=30, rsi_sell=70, copy=True,
+                     categorical=False) -> pd.DataFrame:
     """
     Generate buy/sell signals based on technical indicators.
     
@@ -9,37 +96,20 @@ def generate_signals(df: pd.DataFrame) -> pd.DataFrame:
     - Buy signal: RSI < 30 (oversold) AND price above SMA 50
     - Sell signal: RSI > 70 (overbought) OR price below SMA 200
     - Hold/No Action: otherwise
+    
+    With copy=False the 'Signal' column is added to df itself; with
+    categorical=True it is stored as a Categorical (one byte per bar)
+    instead of Python strings.
     """
-    df = df.copy()
-    df['Signal'] = 'HOLD'
-    
-    # Ensure Close is a Series, not DataFrame
-    close = df['Close'].squeeze()
-    if isinstance(close, pd.DataFrame):
-        close = close.iloc[:, 0]
-    
-    # Ensure required columns exist
-    has_rsi = 'RSI_14' in df.columns
-    has_sma50 = 'SMA_50' in df.columns
-    has_sma200 = 'SMA_200' in df.columns
-    
-    if has_rsi and has_sma50:
-        # Buy: oversold (RSI < 30) and price above 50-day MA
-        rsi = df['RSI_14'].squeeze()
-        sma50 = df['SMA_50'].squeeze()
-        buy_condition = (rsi < 30) & (close > sma50)
-        df.loc[buy_condition, 'Signal'] = 'BUY'
-    
-    if has_rsi or has_sma200:
-        # Sell: overbought (RSI > 70) or price below 200-day MA
-        sell_condition = False
-        if has_rsi:
-            rsi = df['RSI_14'].squeeze()
-            sell_condition = (rsi > 70)
-        if has_sma200:
-            sma200 = df['SMA_200'].squeeze()
-            sell_condition = sell_condition | (close < sma200)
-        df.loc[sell_condition, 'Signal'] = 'SELL'
+    if copy:
+        df = df.copy()
+    
+    codes = signal_codes(
+        _column(df, 'Close'), _column(df, 'RSI_14'), _column(df, 'SMA_50'),
+        _column(df, 'SMA_200'), rsi_buy=rsi_buy, rsi_sell=rsi_sell
+    )
+    signals = signal_categorical(codes) if categorical else signal_labels(codes)
+    df['Signal'] = pd.Series(signals, index=df.index, copy=False)
     
     return df
 
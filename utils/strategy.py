@@ -0,0 +1,296 @@
+"""
+Vectorized backtester for the RSI/SMA signal rules
+
+Turns BUY/SELL/HOLD codes into positions (a BUY opens a position, a SELL
+closes it or goes short, HOLD keeps what is held), trades at the next
+bar's close, charges costs and slippage on every change of position, and
+reports equity curves and per-ticker statistics. Everything works on a
+(tickers x time) matrix at once, so a universe costs a few array passes.
+
+Parameter sweeps reuse one RSI computation and one SMA per distinct window
+across the whole grid, and run the grid on a thread pool sized from the
+shared compute budget (NumPy releases the GIL for the heavy passes).
+"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import compute
+from utils.compute import compute_slot
+from utils.indicator_kernels import _rsi, _sma_min1
+from utils.profiling import timed
+from utils.signals import BUY, HOLD, SELL, signal_codes
+
+# Bars per year used to annualise Sharpe and CAGR
+PERIODS_PER_YEAR = 252
+# Default round-trip frictions, in basis points of traded notional
+COST_BPS = 5.0
+SLIPPAGE_BPS = 5.0
+
+# Tickers per block in sweeps; small blocks keep each pass in cache
+BLOCK_TICKERS = 32
+
+METRIC_COLUMNS = ['total_return', 'cagr', 'sharpe', 'max_drawdown', 'hit_rate', 'trades', 'exposure']
+
+
+def _as_matrix(close):
+    """(tickers x time) float64 matrix plus ticker names and time index"""
+    if isinstance(close, pd.Series):
+        return close.to_numpy(dtype=np.float64)[None, :], [close.name or 0], close.index
+    if isinstance(close, pd.DataFrame):
+        return close.to_numpy(dtype=np.float64).T.copy(), list(close.columns), close.index
+    values = np.asarray(close, dtype=np.float64)
+    values = values[None, :] if values.ndim == 1 else values
+    return values, list(range(len(values))), None
+
+
+def _fill_leading(x):
+    """Back-fill leading NaNs with each row's first price (flat, no returns)"""
+    valid = ~np.isnan(x)
+    if valid.all():
+        return x, valid
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), 0)
+    start = x[np.arange(len(x)), first]
+    filled = np.where(np.arange(x.shape[1]) < first[:, None], start[:, None], x)
+    return filled, valid
+
+
+def positions_from_signals(codes, allow_short=False):
+    """
+    Position after each bar's signal
+
+    BUY sets the position to +1, SELL to 0 (or -1 with allow_short), and
+    HOLD carries the last position forward. Starts flat.
+
+    Args:
+        codes: int8 signal codes, 1-D or (tickers x time)
+        allow_short: Treat SELL as a short entry instead of an exit
+
+    Returns:
+        float64 positions shaped like codes
+    """
+    codes = np.asarray(codes)
+    # Bar index and signal packed into one int, so a running maximum carries
+    # the last non-HOLD signal forward; the low two bits are code + 1, and
+    # bars before the first signal keep -1, whose low bits are 3
+    # (arithmetic select: np.where is branchy on sparse random masks)
+    stamp = np.arange(codes.shape[-1], dtype=np.int32) * 4 + 2
+    last = np.maximum.accumulate((stamp + codes) * (codes != HOLD) - 1, axis=-1)
+    state = last & 3
+    positions = (state == BUY + 1).astype(np.float64)
+    if allow_short:
+        positions -= state == SELL + 1
+    return positions
+
+
+def _hit_rate(held, strat_log):
+    """Share of completed or open trades with a positive total return, per row"""
+    rows, T = held.shape
+    in_trade = held != 0
+    previous = np.zeros_like(held)
+    previous[:, 1:] = held[:, :-1]
+    entries = in_trade & (held != previous)
+    trade_id = np.cumsum(entries, axis=1)
+    trades = trade_id[:, -1]
+
+    keys = (np.arange(rows)[:, None] * (T + 1) + trade_id)[in_trade]
+    pnl = np.bincount(keys, weights=strat_log[in_trade], minlength=rows * (T + 1))
+    wins = (pnl > 0).reshape(rows, T + 1)[:, 1:].sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(trades > 0, wins / trades, np.nan), trades
+
+
+def _returns(x):
+    """Simple bar returns (0 on the first bar)"""
+    returns = np.zeros_like(x)
+    np.divide(x[:, 1:], x[:, :-1], out=returns[:, 1:])
+    returns[:, 1:] -= 1.0
+    return returns
+
+
+def _run(returns, valid, codes, cost, allow_short, periods_per_year, curves=False):
+    """
+    Core backtest on precomputed (tickers x time) bar returns
+
+    Returns:
+        Dict of per-ticker statistics, plus (equity, strategy returns,
+        positions) when curves is True
+    """
+    positions = positions_from_signals(codes, allow_short=allow_short)
+    positions[~valid] = 0.0
+
+    # Signal on bar t's close is traded at bar t+1's close
+    held = np.zeros_like(positions)
+    held[:, 1:] = positions[:, :-1]
+    strat = held * returns
+    strat -= cost * np.abs(np.diff(held, axis=1, prepend=0.0))
+
+    # Equity and drawdown in log space: one cumsum instead of cumprod + divide
+    log_strat = np.log1p(np.maximum(strat, -0.999999))
+    log_equity = np.cumsum(log_strat, axis=1)
+    drawdown = (log_equity - np.maximum.accumulate(log_equity, axis=1)).min(axis=1)
+
+    # Sharpe, CAGR and exposure count bars from each row's first price on;
+    # the flat, back-filled bars before a late listing are not trading periods
+    listed = np.logical_or.accumulate(valid, axis=1)
+    bars = np.maximum(listed.sum(axis=1), 1)
+    mean = strat.sum(axis=1) / bars  # strat is 0 before the listing
+    std = np.sqrt((np.where(listed, strat - mean[:, None], 0.0) ** 2).sum(axis=1) / bars)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+    hit_rate, trades = _hit_rate(held, log_strat)
+
+    stats = {
+        'total_return': np.expm1(log_equity[:, -1]),
+        'cagr': np.expm1(log_equity[:, -1] * periods_per_year / np.maximum(bars - 1, 1)),
+        'sharpe': sharpe,
+        'max_drawdown': np.expm1(drawdown),
+        'hit_rate': hit_rate,
+        'trades': trades,
+        'exposure': (held != 0).sum(axis=1) / bars,
+    }
+    if curves:
+        return stats, (np.exp(log_equity), strat, positions)
+    return stats
+
+
+@timed('strategy.backtest')
+def backtest_signals(close, codes, cost_bps=COST_BPS, slippage_bps=SLIPPAGE_BPS, allow_short=False,
+                     periods_per_year=PERIODS_PER_YEAR):
+    """
+    Backtest precomputed signal codes
+
+    Args:
+        close: Series (one ticker), DataFrame (time x tickers) or
+            ndarray (1-D, or tickers x time) of closes; leading NaNs for
+            late listings are allowed, inner gaps should be forward-filled
+        codes: Signal codes aligned with close (tickers x time for
+            DataFrame input; see utils.signals)
+        cost_bps: Commission per unit of turnover, in basis points
+        slippage_bps: Slippage per unit of turnover, in basis points
+        allow_short: SELL opens a short instead of going flat
+        periods_per_year: Bars per year for Sharpe and CAGR
+
+    Returns:
+        Dictionary with 'equity', 'returns' and 'positions' (tickers x time
+        arrays) and 'metrics' (DataFrame of METRIC_COLUMNS per ticker)
+    """
+    x, names, _ = _as_matrix(close)
+    x, valid = _fill_leading(x)
+    codes = np.asarray(codes).reshape(x.shape)
+    cost = (cost_bps + slippage_bps) / 1e4
+    stats, (equity, strat, positions) = _run(_returns(x), valid, codes, cost, allow_short,
+                                             periods_per_year, curves=True)
+    return {
+        'equity': equity,
+        'returns': strat,
+        'positions': positions,
+        'metrics': pd.DataFrame(stats, index=pd.Index(names, name='ticker'))[METRIC_COLUMNS],
+    }
+
+
+def _sma(x, window):
+    """Trailing mean with min_periods=1, as in the indicator kernels"""
+    return _sma_min1(x - x[:, :1], window) + x[:, :1]
+
+
+def backtest_strategy(close, rsi_buy=30, rsi_sell=70, sma_fast=50, sma_slow=200, **options):
+    """
+    Backtest the generate_signals rules with the given parameters
+
+    Args:
+        close: Closes as accepted by backtest_signals
+        rsi_buy: RSI below which a BUY can trigger
+        rsi_sell: RSI above which a SELL triggers
+        sma_fast: Window of the trend filter for BUYs (SMA_50 in the app)
+        sma_slow: Window of the SELL trend rule (SMA_200 in the app)
+        options: Cost, slippage and shorting options for backtest_signals
+
+    Returns:
+        backtest_signals output
+    """
+    x, _, _ = _as_matrix(close)
+    x, _ = _fill_leading(x)
+    rsi = _rsi(x)[0]
+    codes = signal_codes(x, rsi, _sma(x, sma_fast), _sma(x, sma_slow),
+                         rsi_buy=rsi_buy, rsi_sell=rsi_sell)
+    return backtest_signals(close, codes, **options)
+
+
+@timed('strategy.sweep')
+def sweep(close, rsi_buy=(30, 40, 45, 50), rsi_sell=(60, 70, 80), sma_fast=(20, 50),
+          sma_slow=(100, 200), cost_bps=COST_BPS, slippage_bps=SLIPPAGE_BPS, allow_short=False,
+          periods_per_year=PERIODS_PER_YEAR, workers=None):
+    """
+    Backtest every parameter combination on every ticker
+
+    RSI is computed once and each SMA window once; each combination then
+    only re-derives the codes and runs the vectorized backtest, in blocks
+    of BLOCK_TICKERS tickers. Combinations run on a thread pool that
+    borrows its cores from utils.compute.
+
+    Args:
+        close: Closes as accepted by backtest_signals
+        rsi_buy, rsi_sell, sma_fast, sma_slow: Values to combine
+        workers: Threads wanted (defaults to every core of the budget,
+            TRAINING_CORES); never more than there are combinations, and
+            fewer while other fits hold cores
+
+    Returns:
+        Long DataFrame: one row per (combination, ticker) with the
+        parameters and METRIC_COLUMNS
+    """
+    x, names, _ = _as_matrix(close)
+    x, valid = _fill_leading(x)
+    cost = (cost_bps + slippage_bps) / 1e4
+    returns = _returns(x)
+    rsi = _rsi(x)[0]
+    smas = {w: _sma(x, w) for w in sorted(set(sma_fast) | set(sma_slow))}
+    grid = [combo for combo in itertools.product(rsi_buy, rsi_sell, sma_fast, sma_slow)
+            if combo[0] < combo[1] and combo[2] < combo[3]]
+
+    blocks = [slice(i, i + BLOCK_TICKERS) for i in range(0, len(x), BLOCK_TICKERS)]
+
+    def run_combo(combo):
+        buy, sell, fast, slow = combo
+        parts = []
+        for rows in blocks:
+            codes = signal_codes(x[rows], rsi[rows], smas[fast][rows], smas[slow][rows],
+                                 rsi_buy=buy, rsi_sell=sell)
+            parts.append(_run(returns[rows], valid[rows], codes, cost, allow_short,
+                              periods_per_year))
+        frame = pd.DataFrame({k: np.concatenate([p[k] for p in parts]) for k in METRIC_COLUMNS})
+        frame.insert(0, 'ticker', names)
+        for i, name in enumerate(('rsi_buy', 'rsi_sell', 'sma_fast', 'sma_slow')):
+            frame.insert(i, name, combo[i])
+        return frame
+
+    # Not SESSION_CORES: that is sized for one model fit, and at its
+    # default of 1 the grid would run serially. Only the threads the grid
+    # can use are borrowed, leaving the rest to concurrent fits.
+    with compute_slot(min(workers or compute.TRAINING_CORES, max(len(grid), 1))) as granted:
+        if granted == 1:
+            frames = [run_combo(combo) for combo in grid]
+        else:
+            with ThreadPoolExecutor(max_workers=granted) as pool:
+                frames = list(pool.map(run_combo, grid))
+    if not frames:
+        return pd.DataFrame(columns=['rsi_buy', 'rsi_sell', 'sma_fast', 'sma_slow', 'ticker']
+                            + METRIC_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_sweep(results, by='sharpe'):
+    """
+    Mean and median of each metric per parameter combination, best first
+
+    Args:
+        results: sweep() output
+        by: Metric whose median ranks the combinations
+    """
+    params = ['rsi_buy', 'rsi_sell', 'sma_fast', 'sma_slow']
+    summary = results.groupby(params)[METRIC_COLUMNS].agg(['mean', 'median'])
+    return summary.sort_values((by, 'median'), ascending=False)
@@ -0,0 +1,220 @@
+"""
+NumPy temporal-convolution forecaster (CPU only)
+
+A small causal TCN over the lag windows from create_lag_features. Each
+window is turned into log prices relative to its last value plus log
+returns. A stack of dilated two-tap convolutions with ReLU reads the
+window, and a linear head on the last time step adds to a linear
+autoregressive skip path. Training uses shuffled mini-batches with Adam
+and stops early on a chronological validation split, keeping the best
+weights. Inference is one batched forward pass over all rows, with no
+Python loop per row.
+
+Weights are plain NumPy arrays, so fitted models go through the joblib
+model registry like the sklearn ones.
+"""
+
+import numpy as np
+
+_EPS = 1e-12
+
+
+def _features(X):
+    """(n, T) price windows -> (n, T, 2) relative log price and log return"""
+    logp = np.log(np.maximum(np.asarray(X, dtype=np.float64), _EPS))
+    rel = logp - logp[:, -1:]
+    ret = np.zeros_like(logp)
+    ret[:, 1:] = np.diff(logp, axis=1)
+    return np.stack([rel, ret], axis=-1)
+
+
+class TCNRegressor:
+    """
+    Dilated causal convolution regressor on lag windows
+
+    Args:
+        channels: Hidden channels per conv layer
+        dilations: Dilation of each two-tap layer (trimmed to fit nlags)
+        epochs: Maximum training epochs
+        batch_size: Mini-batch size
+        learning_rate: Adam step size
+        patience: Epochs without validation improvement before stopping
+        validation_fraction: Trailing share of rows used for early stopping
+        weight_decay: L2 penalty on the weights
+        random_state: Seed for initialisation and shuffling
+    """
+
+    def __init__(self, channels=16, dilations=(1, 2, 4), epochs=200, batch_size=64,
+                 learning_rate=3e-3, patience=12, validation_fraction=0.15, weight_decay=1e-5,
+                 random_state=42):
+        self.channels = channels
+        self.dilations = dilations
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.patience = patience
+        self.validation_fraction = validation_fraction
+        self.weight_decay = weight_decay
+        self.random_state = random_state
+
+    # ------------------------------------------------------------------
+    # Network
+
+    def _init_params(self, nlags, n_out, rng):
+        dilations, span = [], nlags
+        for d in self.dilations:
+            if span - d < 1:
+                break
+            dilations.append(d)
+            span -= d
+        self.dilations_ = tuple(dilations)
+
+        params = {}
+        c_in = 2
+        for i, _ in enumerate(self.dilations_):
+            scale = np.sqrt(2.0 / (2 * c_in))
+            params[f'w{i}_now'] = rng.normal(0, scale, (c_in, self.channels))
+            params[f'w{i}_past'] = rng.normal(0, scale, (c_in, self.channels))
+            params[f'b{i}'] = np.zeros(self.channels)
+            c_in = self.channels
+        params['w_out'] = rng.normal(0, np.sqrt(1.0 / c_in), (c_in, n_out)) * 0.1
+        params['b_out'] = np.zeros(n_out)
+        params['w_ar'] = np.zeros((nlags * 2, n_out))
+        return params
+
+    def _forward(self, F, params, cache=False):
+        h = F
+        saved = []
+        for i, d in enumerate(self.dilations_):
+            now, past = h[:, d:, :], h[:, :-d, :]
+            z = now @ params[f'w{i}_now'] + past @ params[f'w{i}_past'] + params[f'b{i}']
+            if cache:
+                saved.append((now, past, z))
+            h = np.maximum(z, 0.0)
+        last = h[:, -1, :]
+        flat = F.reshape(len(F), -1)
+        out = last @ params['w_out'] + params['b_out'] + flat @ params['w_ar']
+        return (out, (saved, h, last, flat)) if cache else out
+
+    def _backward(self, params, cache, grad_out):
+        saved, h, last, flat = cache
+        grads = {
+            'w_out': last.T @ grad_out,
+            'b_out': grad_out.sum(axis=0),
+            'w_ar': flat.T @ grad_out,
+        }
+        dh = np.zeros_like(h)
+        dh[:, -1, :] = grad_out @ params['w_out'].T
+        for i in reversed(range(len(self.dilations_))):
+            d = self.dilations_[i]
+            now, past, z = saved[i]
+            dz = dh * (z > 0)
+            grads[f'w{i}_now'] = np.einsum('btc,btk->ck', now, dz)
+            grads[f'w{i}_past'] = np.einsum('btc,btk->ck', past, dz)
+            grads[f'b{i}'] = dz.sum(axis=(0, 1))
+            if i:
+                dh = np.zeros((len(now), now.shape[1] + d, now.shape[2]))
+                dh[:, d:, :] += dz @ params[f'w{i}_now'].T
+                dh[:, :-d, :] += dz @ params[f'w{i}_past'].T
+        for name in grads:
+            if name.startswith('w'):
+                grads[name] += self.weight_decay * params[name]
+        return grads
+
+    # ------------------------------------------------------------------
+    # Training
+
+    def _targets(self, X, y):
+        y = np.asarray(y, dtype=np.float64)
+        last = np.asarray(X, dtype=np.float64)[:, -1:]
+        if y.ndim == 1:
+            y = y[:, None]
+        return np.log(np.maximum(y, _EPS) / np.maximum(last, _EPS))
+
+    def _train(self, F, T, params, epochs, rng):
+        n = len(F)
+        n_val = int(n * self.validation_fraction) if n >= 50 else 0
+        F_train, T_train = F[:n - n_val], T[:n - n_val]
+        F_val, T_val = F[n - n_val:], T[n - n_val:]
+
+        # Adam state persists across calls so continued training resumes smoothly
+        if not hasattr(self, 'adam_'):
+            self.adam_ = {'m': {k: np.zeros_like(v) for k, v in params.items()},
+                          'v': {k: np.zeros_like(v) for k, v in params.items()}, 't': 0}
+        m, v = self.adam_['m'], self.adam_['v']
+        beta1, beta2 = 0.9, 0.999
+
+        best_loss, best_params, stale = np.inf, None, 0
+        for epoch in range(epochs):
+            order = rng.permutation(len(F_train))
+            for start in range(0, len(order), self.batch_size):
+                idx = order[start:start + self.batch_size]
+                out, cache = self._forward(F_train[idx], params, cache=True)
+                grad_out = 2.0 * (out - T_train[idx]) / len(idx)
+                grads = self._backward(params, cache, grad_out)
+
+                self.adam_['t'] += 1
+                t = self.adam_['t']
+                for name, g in grads.items():
+                    m[name] = beta1 * m[name] + (1 - beta1) * g
+                    v[name] = beta2 * v[name] + (1 - beta2) * g * g
+                    m_hat = m[name] / (1 - beta1 ** t)
+                    v_hat = v[name] / (1 - beta2 ** t)
+                    params[name] -= self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+            check_F, check_T = (F_val, T_val) if n_val else (F_train, T_train)
+            loss = float(np.mean((self._forward(check_F, params) - check_T) ** 2))
+            if loss < best_loss - 1e-12:
+                best_loss, stale = loss, 0
+                best_params = {k: p.copy() for k, p in params.items()}
+            else:
+                stale += 1
+                if stale >= self.patience:
+                    break
+
+        self.epochs_run_ = getattr(self, 'epochs_run_', 0) + epoch + 1
+        self.val_loss_ = best_loss
+        return best_params if best_params is not None else params
+
+    def fit(self, X, y):
+        """
+        Train on lag windows
+
+        Args:
+            X: (n_rows, nlags) price windows
+            y: (n_rows,) targets or (n_rows, H) multi-horizon targets
+        """
+        X = np.asarray(X, dtype=np.float64)
+        rng = np.random.default_rng(self.random_state)
+        T = self._targets(X, y)
+        self.n_outputs_ = T.shape[1]
+        self.single_output_ = np.ndim(y) == 1
+        if hasattr(self, 'adam_'):
+            del self.adam_
+        self.epochs_run_ = 0
+        params = self._init_params(X.shape[1], self.n_outputs_, rng)
+        self.params_ = self._train(_features(X), T, params, self.epochs, rng)
+        return self
+
+    def continue_fit(self, X, y, fraction=0.5):
+        """
+        Keep the current weights and train further on (X, y)
+
+        Used by the walk-forward 'warm' policy; runs up to fraction *
+        epochs more epochs with the same early stopping.
+        """
+        rng = np.random.default_rng(self.random_state + 1)
+        epochs = max(1, int(round(self.epochs * fraction)))
+        params = {k: p.copy() for k, p in self.params_.items()}
+        self.params_ = self._train(_features(X), self._targets(X, y), params, epochs, rng)
+        return self
+
+    # ------------------------------------------------------------------
+    # Inference
+
+    def predict(self, X):
+        """Predicted prices for each window (one batched forward pass)"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        out = self._forward(_features(X), self.params_)
+        prices = X[:, -1:] * np.exp(out)
+        return prices[:, 0] if self.single_output_ else prices
@@ -0,0 +1,250 @@
+"""
+Grid / random search over the forecast settings
+
+Evaluates (model_type, nlags, test_size) configurations per ticker with
+forecast_v2.backtest_model, the same backtest the app reports. For each
+ticker the lag matrix is built once at the largest nlags and narrower
+configurations use its trailing columns, so every configuration is scored
+on the same rows and targets (the first max_nlags - nlags rows a
+standalone create_lag_features would add are not used).
+
+Configurations are spread over the scanner's process pool in small
+chunks; each finished result is cached as JSON per (ticker, config, data
+fingerprint), so re-running a search only fits what is new. Results come
+back as a DataFrame that leaderboard() ranks and best_configs() turns into
+per-ticker defaults.
+"""
+
+import itertools
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from utils.forecast_v2 import backtest_model, create_lag_features
+from utils.model_registry import data_fingerprint, model_key
+from utils.profiling import count, timed
+from utils.scanner import get_pool
+
+TUNING_CACHE_DIR = os.getenv(
+    'TUNING_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'tuning_cache')
+)
+
+CONFIG_KEYS = ('model_type', 'nlags', 'test_size')
+METRIC_KEYS = ('rmse', 'mae', 'direction_accuracy', 'test_periods', 'train_size')
+# Leaderboard sort direction per metric
+HIGHER_IS_BETTER = {'direction_accuracy': True, 'rmse': False, 'mae': False}
+
+# Configurations per pool task; small chunks balance uneven fit times
+CHUNK_SIZE = 4
+
+
+def config_grid(model_type=('rf', 'hgb', 'arima'), nlags=(5, 10, 20, 30), test_size=(0.1, 0.2, 0.3)):
+    """Every combination of the given values, as a list of config dicts"""
+    return [dict(zip(CONFIG_KEYS, values)) for values in itertools.product(model_type, nlags, test_size)]
+
+
+def random_configs(n, model_type=('rf', 'hgb', 'arima'), nlags=(5, 30), test_size=(0.05, 0.5), seed=0):
+    """
+    n distinct random configurations
+
+    Args:
+        n: Number of configurations
+        model_type: Model types to draw from
+        nlags: Inclusive (low, high) range of lag counts
+        test_size: (low, high) range of test fractions, rounded to 0.05
+        seed: Random seed
+
+    Returns:
+        List of config dicts (fewer than n if the space is smaller)
+    """
+    rng = np.random.default_rng(seed)
+    steps = np.round(np.arange(test_size[0], test_size[1] + 1e-9, 0.05), 2)
+    space = len(model_type) * (nlags[1] - nlags[0] + 1) * len(steps)
+    seen, configs = set(), []
+    while len(configs) < min(n, space):
+        config = (str(rng.choice(model_type)), int(rng.integers(nlags[0], nlags[1] + 1)),
+                  float(rng.choice(steps)))
+        if config not in seen:
+            seen.add(config)
+            configs.append(dict(zip(CONFIG_KEYS, config)))
+    return configs
+
+
+def _cache_key(ticker, config, fingerprint, max_nlags, period, interval):
+    return model_key(ticker, period, interval, config['model_type'], config['nlags'], fingerprint,
+                     test=config['test_size'], maxlag=max_nlags)
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir or TUNING_CACHE_DIR, key + '.json')
+
+
+def _read_cached(key, cache_dir):
+    try:
+        with open(_cache_path(key, cache_dir)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached(key, result, cache_dir):
+    folder = cache_dir or TUNING_CACHE_DIR
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(result, fh)
+        os.replace(tmp_path, _cache_path(key, cache_dir))
+    except OSError as e:
+        print(f"Could not cache tuning result {key}: {e}")
+
+
+def evaluate_configs(ticker, prices, configs, max_nlags=None):
+    """
+    Backtest configurations of one ticker on a shared lag matrix
+
+    Runs in pool workers, so it only takes and returns plain data.
+
+    Args:
+        ticker: Ticker symbol (copied into the results)
+        prices: Close prices
+        configs: Config dicts
+        max_nlags: Width of the shared lag matrix (defaults to the widest
+            config); pass the search-wide maximum so every chunk of a
+            ticker uses the same rows
+
+    Returns:
+        List of result dicts (config, metrics, seconds, error)
+    """
+    prices = np.ascontiguousarray(np.asarray(prices, dtype=np.float64).reshape(-1))
+    max_nlags = max_nlags or max(config['nlags'] for config in configs)
+    X_max, y = create_lag_features(prices, nlags=max_nlags)
+
+    results = []
+    for config in configs:
+        result = {'ticker': ticker, **config, 'error': None}
+        start = time.perf_counter()
+        try:
+            if len(X_max) < 20:
+                raise ValueError(f"only {len(X_max)} rows at nlags={max_nlags}")
+            X = X_max[:, max_nlags - config['nlags']:]
+            metrics = backtest_model(X, y, nlags=config['nlags'], test_size=config['test_size'],
+                                     model_type=config['model_type'])
+            result.update({k: metrics[k] for k in METRIC_KEYS})
+        except Exception as e:
+            result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+@timed('tuning.search')
+def tune(prices_by_ticker, configs, workers=None, period=None, interval=None, cache_dir=None,
+         refresh=False, chunk_size=CHUNK_SIZE):
+    """
+    Evaluate every configuration on every ticker
+
+    Args:
+        prices_by_ticker: Dict of ticker -> close prices (array or Series)
+        configs: Config dicts from config_grid / random_configs
+        workers: Worker processes (None = all cores, 0 = run in this process)
+        period: Download period, part of the cache key
+        interval: Bar interval, part of the cache key
+        cache_dir: Result cache directory (defaults to TUNING_CACHE_DIR)
+        refresh: Ignore cached results
+        chunk_size: Configurations per pool task
+
+    Returns:
+        DataFrame with one row per (ticker, config): CONFIG_KEYS,
+        METRIC_KEYS, seconds, error and cached
+    """
+    configs = [dict(zip(CONFIG_KEYS, (c['model_type'], int(c['nlags']), float(c['test_size']))))
+               for c in configs]
+    if not configs:
+        return pd.DataFrame(columns=['ticker', *CONFIG_KEYS, *METRIC_KEYS, 'seconds', 'error', 'cached'])
+    max_nlags = max(c['nlags'] for c in configs)
+
+    rows, tasks = [], []
+    for ticker, prices in prices_by_ticker.items():
+        prices = np.asarray(prices, dtype=np.float64).reshape(-1)
+        fingerprint = data_fingerprint(prices)
+        pending = []
+        for config in configs:
+            key = _cache_key(ticker, config, fingerprint, max_nlags, period, interval)
+            cached = None if refresh else _read_cached(key, cache_dir)
+            if cached is not None:
+                count('tuning.cache_hit')
+                rows.append(dict(cached, cached=True))
+            else:
+                count('tuning.cache_miss')
+                pending.append((key, config))
+        for i in range(0, len(pending), chunk_size):
+            chunk = pending[i:i + chunk_size]
+            tasks.append((ticker, prices, [key for key, _ in chunk], [c for _, c in chunk]))
+
+    def collect(keys, results):
+        for key, result in zip(keys, results):
+            if result['error'] is None:
+                _write_cached(key, result, cache_dir)
+            rows.append(dict(result, cached=False))
+
+    if workers == 0:
+        for ticker, prices, keys, chunk in tasks:
+            collect(keys, evaluate_configs(ticker, prices, chunk, max_nlags))
+    elif tasks:
+        pool = get_pool(workers)
+        futures = {
+            pool.submit(evaluate_configs, ticker, prices, chunk, max_nlags): keys
+            for ticker, prices, keys, chunk in tasks
+        }
+        for future in as_completed(futures):
+            collect(futures[future], future.result())
+
+    frame = pd.DataFrame(rows)
+    for column in METRIC_KEYS + ('error',):
+        if column not in frame.columns:
+            frame[column] = None
+    return frame
+
+
+def leaderboard(results, metric='rmse'):
+    """
+    Successful results ranked per ticker, best first
+
+    Note that test_size changes the test window, so metrics of different
+    test sizes are measured on different (overlapping) periods.
+
+    Returns:
+        DataFrame sorted by ticker and rank, with a 'rank' column (1 = best)
+    """
+    ok = results[results['error'].isna()].copy()
+    ascending = not HIGHER_IS_BETTER.get(metric, False)
+    ok[metric] = ok[metric].astype(float)
+    ok['rank'] = ok.groupby('ticker')[metric].rank(ascending=ascending, method='first').astype(int)
+    return ok.sort_values(['ticker', 'rank']).reset_index(drop=True)
+
+
+def best_configs(results, metric='rmse'):
+    """Per-ticker defaults: {ticker: {'model_type', 'nlags', 'test_size', metric}}"""
+    board = leaderboard(results, metric)
+    best = board[board['rank'] == 1]
+    return {
+        row['ticker']: {'model_type': row['model_type'], 'nlags': int(row['nlags']),
+                        'test_size': float(row['test_size']), metric: float(row[metric])}
+        for _, row in best.iterrows()
+    }
+
+
+def write_leaderboard(results, path, metric='rmse'):
+    """Write the leaderboard CSV and a <path>.best.json of per-ticker defaults"""
+    board = leaderboard(results, metric)
+    columns = ['ticker', 'rank', *CONFIG_KEYS, *METRIC_KEYS, 'seconds', 'cached']
+    board[[c for c in columns if c in board.columns]].to_csv(path, index=False)
+    with open(os.path.splitext(path)[0] + '.best.json', 'w') as fh:
+        json.dump(best_configs(results, metric), fh, indent=2)
+    return board
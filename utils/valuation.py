@@ -1,5 +1,6 @@
 import numpy as np
-import yfinance as yf
+
+from utils.fundamentals import get_info
 
 
 def estimate_fair_price(fundamentals: dict, df: object, ticker: str = None) -> dict:
@@ -94,8 +95,8 @@ def _simple_dcf_valuation(ticker: str, current_price: float) -> float:
     Forecast 5 years of cash flows, discount to present.
     """
     try:
-        t = yf.Ticker(ticker)
-        info = t.info if hasattr(t, 'info') else {}
+        # Same cached snapshot get_fundamentals used, no second .info call
+        info = get_info(ticker)
         
         # Get trailing twelve months free cash flow
         fcf = info.get('freeCashflow')